@@ -5,14 +5,30 @@ from datetime import datetime, timedelta
 from flask import Flask, request, jsonify, redirect, session, url_for
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# The shared scoring engine lives with the deployed app
+from physical_design_system.scoring_engine import ScoringStrategy, engine
+from physical_design_system.storage import open_storage
+from physical_design_system.templating import InlineTemplates
+from physical_design_system.static_assets import StaticAssets
+from physical_design_system.http_cache import HTTPCache, StorageVersions
+from physical_design_system.fragment_cache import fragment_cache
+from physical_design_system import evaluator  # registers the 'technical' rubric
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'pd-secret-2024')
+app.config['SCORING_RUBRIC'] = os.environ.get('SCORING_RUBRIC', 'keyword_count')
+inline_templates = InlineTemplates(app)
+static_assets = StaticAssets(app)
+http_cache = HTTPCache(app)
 
-# In-memory storage
-users = {}
-assignments = {}
-notifications = {}
-assignment_counter = 0
+# Storage backend named by STORAGE_URL (per-process dicts by default).
+# Stored values may be copies, so write them back after changing them.
+storage = open_storage()
+users = storage.collection('users')
+assignments = storage.collection('assignments', indexed=('engineer_id', 'status'))
+notifications = storage.collection('notifications')
+# Bumped on every write, so dashboard ETags change exactly when their data does
+data_versions = StorageVersions(storage)
 
 # Initialize default users
 def init_users():
@@ -84,33 +100,50 @@ SCORING_RUBRIC = {
     0: "No answer or completely incorrect"
 }
 
+class KeywordCountRubric(ScoringStrategy):
+    """Per-question keyword count; cheap enough that it is never cached"""
+    
+    name = 'keyword_count'
+    
+    def phrases(self, topic, question_index):
+        if topic in ANSWER_KEYWORDS and question_index < len(ANSWER_KEYWORDS[topic]):
+            return ANSWER_KEYWORDS[topic][question_index]
+        return []
+    
+    def score_answer(self, analyzed, hits, topic, question_index):
+        if not analyzed.text:
+            return 0
+        
+        keywords_found = 0
+        
+        if topic in ANSWER_KEYWORDS and question_index < len(ANSWER_KEYWORDS[topic]):
+            keywords = ANSWER_KEYWORDS[topic][question_index]
+            for keyword in keywords:
+                if keyword in hits:
+                    keywords_found += 1
+        
+        # 2 points per keyword, max 10 points
+        return min(keywords_found * 2, 10)
+
+engine.register(KeywordCountRubric.name, KeywordCountRubric)
+
 # Helper functions
 def calculate_auto_score(answer, topic, question_index):
     """Calculate auto-score based on keywords"""
-    if not answer:
-        return 0
-    
-    answer_lower = answer.lower()
-    keywords_found = 0
+    rubric = app.config['SCORING_RUBRIC']
+    score = engine.score_answer(answer, topic, question_index, rubric)
+    if rubric == KeywordCountRubric.name:
+        return score
     
-    if topic in ANSWER_KEYWORDS and question_index < len(ANSWER_KEYWORDS[topic]):
-        keywords = ANSWER_KEYWORDS[topic][question_index]
-        for keyword in keywords:
-            if keyword.lower() in answer_lower:
-                keywords_found += 1
-    
-    # 2 points per keyword, max 10 points
-    return min(keywords_found * 2, 10)
+    # Percentage rubrics are mapped onto the 0-10 question scale
+    return min(10, round(score['overall_score'] / 10))
 
 def create_assignment(engineer_id, topic):
-    global assignment_counter
-    
     user = users.get(engineer_id)
     if not user or topic not in QUESTIONS:
         return None
     
-    assignment_counter += 1
-    assignment_id = f"PD_{topic.upper()}_{engineer_id}_{assignment_counter}"
+    assignment_id = f"PD_{topic.upper()}_{engineer_id}_{storage.next_id('assignment')}"
     
     assignment = {
         'id': assignment_id,
@@ -132,90 +165,30 @@ def create_assignment(engineer_id, topic):
     assignments[assignment_id] = assignment
     
     # Create notification
-    if engineer_id not in notifications:
-        notifications[engineer_id] = []
-    
-    notifications[engineer_id].append({
+    notifications[engineer_id] = notifications.get(engineer_id, []) + [{
         'title': f'New {topic} Assignment',
         'message': f'3 questions for 3+ years experience, due in 3 days',
         'created_at': datetime.now().isoformat()
-    })
+    }]
+    data_versions.bump(engineer_id)
     
     return assignment
 
-# HTML Templates
-def get_base_html():
-    return '''
+# HTML Templates, compiled once by Jinja and cached (see templating.py)
+BASE_TEMPLATE = '''
     <!DOCTYPE html>
     <html>
     <head>
         <title>PD Interview System</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 0; background: #f5f5f5; }
-            .header { background: #4CAF50; color: white; padding: 20px; }
-            .container { max-width: 1200px; margin: 20px auto; padding: 0 20px; }
-            .card { background: white; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .form-group { margin: 15px 0; }
-            label { display: block; margin-bottom: 5px; font-weight: bold; }
-            input, select, textarea { width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; }
-            textarea { min-height: 100px; resize: vertical; }
-            button { background: #4CAF50; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; }
-            button:hover { background: #45a049; }
-            table { width: 100%; border-collapse: collapse; }
-            th, td { padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }
-            th { background: #f5f5f5; }
-            .question { background: #f9f9f9; padding: 15px; margin: 10px 0; border-left: 4px solid #4CAF50; }
-            .answer-box { margin-top: 10px; background: white; padding: 10px; border: 1px solid #ddd; }
-            .badge { display: inline-block; padding: 4px 8px; border-radius: 4px; font-size: 12px; }
-            .badge-pending { background: #FFC107; color: #333; }
-            .badge-submitted { background: #2196F3; color: white; }
-            .badge-under_review { background: #FF5722; color: white; }
-            .badge-published { background: #4CAF50; color: white; }
-            .stats { display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; }
-            .stat { text-align: center; }
-            .stat h2 { margin: 0; color: #4CAF50; }
-            .error { color: red; }
-            .success { color: green; }
-            .score-box { display: flex; align-items: center; gap: 20px; margin: 10px 0; }
-            .auto-score { background: #e3f2fd; padding: 5px 10px; border-radius: 4px; }
-            .rubric { background: #f5f5f5; padding: 10px; margin: 10px 0; border-radius: 4px; font-size: 12px; }
-        </style>
+        <link rel="stylesheet" href="{{ asset_url('interview.css') }}">
     </head>
     <body>
-    '''
-
-# Routes
-@app.route('/')
-def home():
-    if 'user_id' in session:
-        if session.get('is_admin'):
-            return redirect('/admin')
-        else:
-            return redirect('/student')
-    return redirect('/login')
+    {% block body %}{% endblock %}
+    </body>
+    </html>
+'''
 
-@app.route('/login', methods=['GET', 'POST'])
-def login():
-    error = None
-    
-    if request.method == 'POST':
-        username = request.form.get('username')
-        password = request.form.get('password')
-        
-        user = users.get(username)
-        if user and check_password_hash(user['password'], password):
-            session['user_id'] = user['id']
-            session['username'] = user['username']
-            session['is_admin'] = user.get('is_admin', False)
-            
-            if user.get('is_admin'):
-                return redirect('/admin')
-            else:
-                return redirect('/student')
-        else:
-            error = 'Invalid credentials'
-    
-    html = get_base_html() + f'''
+LOGIN_TEMPLATE = '''{% extends "base.html" %}{% block body %}
         <div style="max-width: 400px; margin: 100px auto;">
             <div class="card">
                 <h1 style="text-align: center;">Physical Design Interview System</h1>
@@ -225,7 +198,7 @@ def login():
                     Admin: admin / admin123<br>
                     Student: eng001 / password123
                 </p>
-                {f'<p class="error">{error}</p>' if error else ''}
+                {% if error %}<p class="error">{{ error }}</p>{% endif %}
                 <form method="POST">
                     <div class="form-group">
                         <label>Username</label>
@@ -239,50 +212,29 @@ def login():
                 </form>
             </div>
         </div>
-    </body>
-    </html>
-    '''
-    return html
-
-@app.route('/logout')
-def logout():
-    session.clear()
-    return redirect('/login')
+{% endblock %}'''
 
-@app.route('/admin')
-def admin_dashboard():
-    if 'user_id' not in session or not session.get('is_admin'):
-        return redirect('/login')
-    
-    engineers = [u for u in users.values() if not u.get('is_admin')]
-    all_assignments = list(assignments.values())
-    
-    # Count assignments by status
-    submitted = [a for a in all_assignments if a['status'] == 'submitted']
-    under_review = [a for a in all_assignments if a['status'] == 'under_review']
-    published = [a for a in all_assignments if a['status'] == 'published']
-    
-    html = get_base_html() + f'''
+ADMIN_DASHBOARD_TEMPLATE = '''{% extends "base.html" %}{% block body %}
         <div class="header">
-            <h1>Admin Dashboard - {session["username"]} <a href="/logout" style="float: right; color: white;">Logout</a></h1>
+            <h1>Admin Dashboard - {{ session["username"] }} <a href="/logout" style="float: right; color: white;">Logout</a></h1>
         </div>
         
         <div class="container">
             <div class="stats">
                 <div class="stat card">
-                    <h2>{len(engineers)}</h2>
+                    <h2>{{ engineers|length }}</h2>
                     <p>Engineers</p>
                 </div>
                 <div class="stat card">
-                    <h2>{len(submitted)}</h2>
+                    <h2>{{ submitted|length }}</h2>
                     <p>Submitted</p>
                 </div>
                 <div class="stat card">
-                    <h2>{len(under_review)}</h2>
+                    <h2>{{ under_review|length }}</h2>
                     <p>Under Review</p>
                 </div>
                 <div class="stat card">
-                    <h2>{len(published)}</h2>
+                    <h2>{{ published|length }}</h2>
                     <p>Published</p>
                 </div>
             </div>
@@ -294,12 +246,7 @@ def admin_dashboard():
                         <label>Engineer</label>
                         <select name="engineer_id" required>
                             <option value="">Select...</option>
-    '''
-    
-    for eng in engineers:
-        html += f'<option value="{eng["id"]}">{eng["username"]}</option>'
-    
-    html += '''
+                            {% for eng in engineers %}<option value="{{ eng["id"] }}">{{ eng["username"] }}</option>{% endfor %}
                         </select>
                     </div>
                     <div class="form-group">
@@ -317,21 +264,15 @@ def admin_dashboard():
             
             <div class="card">
                 <h2>Submitted Assignments (Ready for Review)</h2>
-    '''
-    
-    if submitted:
-        for a in submitted:
-            html += f'''
+                {% for a in submitted %}
                 <div style="border: 1px solid #ddd; padding: 10px; margin: 10px 0;">
-                    <h4>{a["id"]} - {a["engineer_id"]} - {a["topic"].title()}</h4>
+                    <h4>{{ a["id"] }} - {{ a["engineer_id"] }} - {{ a["topic"].title() }}</h4>
                     <p>Submitted: All 3 answers | Auto-score calculated</p>
-                    <a href="/admin/review/{a["id"]}"><button>Review & Score</button></a>
+                    <a href="/admin/review/{{ a["id"] }}"><button>Review & Score</button></a>
                 </div>
-            '''
-    else:
-        html += '<p>No assignments ready for review</p>'
-    
-    html += '''
+                {% else %}
+                <p>No assignments ready for review</p>
+                {% endfor %}
             </div>
             
             <div class="card">
@@ -345,34 +286,198 @@ def admin_dashboard():
                         <th>Score</th>
                         <th>Action</th>
                     </tr>
-    '''
-    
-    for a in all_assignments[-10:]:  # Last 10
-        action = ""
-        if a['status'] == 'under_review':
-            action = f'<a href="/admin/publish/{a["id"]}"><button>Publish</button></a>'
-        elif a['status'] == 'published':
-            action = "Published ✓"
-            
-        html += f'''
-            <tr>
-                <td>{a["id"]}</td>
-                <td>{a["engineer_id"]}</td>
-                <td>{a["topic"]}</td>
-                <td><span class="badge badge-{a["status"]}">{a["status"]}</span></td>
-                <td>{a.get("total_score", "-")}/30</td>
-                <td>{action}</td>
-            </tr>
-        '''
-    
-    html += '''
+                    {% for a in recent %}
+                    <tr>
+                        <td>{{ a["id"] }}</td>
+                        <td>{{ a["engineer_id"] }}</td>
+                        <td>{{ a["topic"] }}</td>
+                        <td><span class="badge badge-{{ a["status"] }}">{{ a["status"] }}</span></td>
+                        <td>{{ a.get("total_score", "-") }}/30</td>
+                        <td>
+                            {%- if a['status'] == 'under_review' %}<a href="/admin/publish/{{ a["id"] }}"><button>Publish</button></a>
+                            {%- elif a['status'] == 'published' %}Published ✓{% endif -%}
+                        </td>
+                    </tr>
+                    {% endfor %}
                 </table>
             </div>
         </div>
-    </body>
-    </html>
-    '''
-    return html
+{% endblock %}'''
+
+ADMIN_REVIEW_TEMPLATE = '''{% extends "base.html" %}{% block body %}
+        <div class="header">
+            <h1>Review Assignment - {{ assignment_id }}</h1>
+        </div>
+        
+        <div class="container">
+            <div class="card">
+                <h3>Engineer: {{ assignment["engineer_id"] }} | Topic: {{ assignment["topic"].title() }}</h3>
+                
+                <div class="rubric">
+                    <strong>Scoring Rubric:</strong><br>
+                    {% for score, desc in rubric.items() %}{{ score }}: {{ desc }}<br>{% endfor %}
+                </div>
+                
+                <form method="POST">
+                    {% for question in assignment['questions'] %}
+                    {% set i = loop.index0 %}
+                    {% set auto_score = assignment.get('auto_scores', {}).get(i|string, 0) %}
+                    <div class="question">
+                        <strong>Q{{ loop.index }}:</strong> {{ question }}
+                        <div class="answer-box">
+                            <strong>Student's Answer:</strong><br>
+                            {{ assignment.get('answers', {}).get(i|string, 'No answer provided') }}
+                        </div>
+                        <div class="score-box">
+                            <div class="auto-score">
+                                Auto-score (Keywords): {{ auto_score }}/10
+                            </div>
+                            <div>
+                                <label>Final Score (0-10):</label>
+                                <input type="number" name="score_{{ i }}" min="0" max="10" value="{{ auto_score }}" style="width: 60px;">
+                            </div>
+                        </div>
+                    </div>
+                    {% endfor %}
+                    <button type="submit" style="margin-top: 20px;">Save Scores (Next: Publish)</button>
+                    <a href="/admin"><button type="button">Cancel</button></a>
+                </form>
+            </div>
+        </div>
+{% endblock %}'''
+
+STUDENT_DASHBOARD_TEMPLATE = '''{% extends "base.html" %}{% block body %}
+        <div class="header">
+            <h1>Student Dashboard - {{ session["username"] }} <a href="/logout" style="float: right; color: white;">Logout</a></h1>
+        </div>
+        
+        <div class="container">
+            {{ assignments_html }}
+        </div>
+{% endblock %}'''
+
+# Cached per student and data version (fragment_cache.py)
+STUDENT_ASSIGNMENTS_FRAGMENT = '''
+            {% if my_notifications %}
+            <div class="card"><h2>Notifications</h2>
+                {% for n in my_notifications %}<p><strong>{{ n["title"] }}</strong><br>{{ n["message"] }}<br><small>{{ n["created_at"][:16] }}</small></p>{% endfor %}
+            </div>
+            {% endif %}
+            <h2>My Assignments</h2>
+            {% for a in my_assignments %}
+            <div class="card">
+                <h3>{{ a["topic"].title() }} Assignment 
+                    <span class="badge badge-{{ a["status"] }}">{{ a["status"] }}</span>
+                </h3>
+                <p>Due: {{ a["due_date"][:10] }}</p>
+                {% if a['status'] == 'published' %}
+                <p><strong>Score: {{ a["total_score"] }}/30</strong> (Scored by: {{ a.get("scored_by", "Admin") }})</p>
+                <a href="/student/assignment/{{ a["id"] }}"><button>View Results</button></a>
+                {% elif a['status'] in ['submitted', 'under_review'] %}
+                <p>Your submission is being reviewed...</p>
+                {% else %}
+                <a href="/student/assignment/{{ a["id"] }}"><button>Answer Questions</button></a>
+                {% endif %}
+            </div>
+            {% else %}
+            <div class="card"><p>No assignments yet.</p></div>
+            {% endfor %}
+'''
+
+STUDENT_ASSIGNMENT_TEMPLATE = '''{% extends "base.html" %}{% block body %}
+        <div class="header">
+            <h1>{{ assignment["topic"].title() }} Assignment</h1>
+        </div>
+        
+        <div class="container">
+            <div class="card">
+                <p>Status: <span class="badge badge-{{ assignment["status"] }}">{{ assignment["status"] }}</span> | Due: {{ assignment["due_date"][:10] }}</p>
+                {% set status = assignment['status'] %}
+                {% if status == 'published' %}<p><strong>Total Score: {{ assignment["total_score"] }}/30</strong></p>{% endif %}
+                {% if status == 'pending' %}<form method="POST">{% endif %}
+                {% for question in assignment['questions'] %}
+                {% set i = loop.index0 %}
+                <div class="question">
+                    <strong>Q{{ loop.index }}:</strong> {{ question }}
+                    {% if status == 'pending' %}
+                    <div class="answer-box">
+                        <textarea name="answer_{{ i }}" placeholder="Type your answer here..." required></textarea>
+                    </div>
+                    {% elif status in ['submitted', 'under_review', 'published'] %}
+                    <div class="answer-box">
+                        <strong>Your Answer:</strong><br>
+                        {{ assignment.get('answers', {}).get(i|string, '') }}
+                    </div>
+                    {% if status == 'published' %}<p><strong>Score: {{ assignment.get('final_scores', {}).get(i|string, 0) }}/10</strong></p>{% endif %}
+                    {% endif %}
+                </div>
+                {% endfor %}
+                {% if status == 'pending' %}
+                <button type="submit" style="margin-top: 20px;">Submit All Answers</button>
+                </form>
+                {% endif %}
+                <a href="/student"><button type="button">Back to Dashboard</button></a>
+            </div>
+        </div>
+{% endblock %}'''
+
+inline_templates.register('base.html', BASE_TEMPLATE)
+
+# Routes
+@app.route('/')
+def home():
+    if 'user_id' in session:
+        if session.get('is_admin'):
+            return redirect('/admin')
+        else:
+            return redirect('/student')
+    return redirect('/login')
+
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    error = None
+    
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        
+        user = users.get(username)
+        if user and check_password_hash(user['password'], password):
+            session['user_id'] = user['id']
+            session['username'] = user['username']
+            session['is_admin'] = user.get('is_admin', False)
+            
+            if user.get('is_admin'):
+                return redirect('/admin')
+            else:
+                return redirect('/student')
+        else:
+            error = 'Invalid credentials'
+    
+    return inline_templates.render('login.html', LOGIN_TEMPLATE, error=error)
+
+@app.route('/logout')
+def logout():
+    session.clear()
+    return redirect('/login')
+
+@app.route('/admin')
+@http_cache.conditional(lambda: data_versions.key(session.get('user_id'), everything=True) if session.get('is_admin') else None)
+def admin_dashboard():
+    if 'user_id' not in session or not session.get('is_admin'):
+        return redirect('/login')
+    
+    engineers = [u for u in users.values() if not u.get('is_admin')]
+    all_assignments = list(assignments.values())
+    
+    # Count assignments by status
+    submitted = assignments.find(status='submitted')
+    under_review = assignments.find(status='under_review')
+    published = assignments.find(status='published')
+    
+    return inline_templates.render('admin_dashboard.html', ADMIN_DASHBOARD_TEMPLATE,
+                                   engineers=engineers, submitted=submitted, under_review=under_review,
+                                   published=published, recent=all_assignments[-10:])  # Last 10
 
 @app.route('/admin/create', methods=['POST'])
 def admin_create():
@@ -412,6 +517,8 @@ def admin_review(assignment_id):
         assignment['scored_by'] = session['username']
         assignment['scored_date'] = datetime.now().isoformat()
         assignment['status'] = 'under_review'
+        assignments[assignment_id] = assignment
+        data_versions.bump(assignment['engineer_id'])
         
         return redirect('/admin')
     
@@ -420,63 +527,11 @@ def admin_review(assignment_id):
         for i, question in enumerate(assignment['questions']):
             answer = assignment.get('answers', {}).get(str(i), '')
             assignment['auto_scores'][str(i)] = calculate_auto_score(answer, assignment['topic'], i)
+        assignments[assignment_id] = assignment
     
     # Show review form
-    html = get_base_html() + f'''
-        <div class="header">
-            <h1>Review Assignment - {assignment_id}</h1>
-        </div>
-        
-        <div class="container">
-            <div class="card">
-                <h3>Engineer: {assignment["engineer_id"]} | Topic: {assignment["topic"].title()}</h3>
-                
-                <div class="rubric">
-                    <strong>Scoring Rubric:</strong><br>
-    '''
-    
-    for score, desc in SCORING_RUBRIC.items():
-        html += f'{score}: {desc}<br>'
-    
-    html += '''
-                </div>
-                
-                <form method="POST">
-    '''
-    
-    for i, question in enumerate(assignment['questions']):
-        answer = assignment.get('answers', {}).get(str(i), 'No answer provided')
-        auto_score = assignment.get('auto_scores', {}).get(str(i), 0)
-        
-        html += f'''
-            <div class="question">
-                <strong>Q{i+1}:</strong> {question}
-                <div class="answer-box">
-                    <strong>Student's Answer:</strong><br>
-                    {answer}
-                </div>
-                <div class="score-box">
-                    <div class="auto-score">
-                        Auto-score (Keywords): {auto_score}/10
-                    </div>
-                    <div>
-                        <label>Final Score (0-10):</label>
-                        <input type="number" name="score_{i}" min="0" max="10" value="{auto_score}" style="width: 60px;">
-                    </div>
-                </div>
-            </div>
-        '''
-    
-    html += '''
-                    <button type="submit" style="margin-top: 20px;">Save Scores (Next: Publish)</button>
-                    <a href="/admin"><button type="button">Cancel</button></a>
-                </form>
-            </div>
-        </div>
-    </body>
-    </html>
-    '''
-    return html
+    return inline_templates.render('admin_review.html', ADMIN_REVIEW_TEMPLATE,
+                                   assignment_id=assignment_id, assignment=assignment, rubric=SCORING_RUBRIC)
 
 @app.route('/admin/publish/<assignment_id>')
 def admin_publish(assignment_id):
@@ -490,73 +545,34 @@ def admin_publish(assignment_id):
     # Publish the assignment
     assignment['status'] = 'published'
     assignment['published_date'] = datetime.now().isoformat()
+    assignments[assignment_id] = assignment
     
     # Notify student
     engineer_id = assignment['engineer_id']
-    if engineer_id not in notifications:
-        notifications[engineer_id] = []
-    
-    notifications[engineer_id].append({
+    notifications[engineer_id] = notifications.get(engineer_id, []) + [{
         'title': f'{assignment["topic"].title()} Assignment Scored',
         'message': f'Your assignment has been evaluated. Score: {assignment["total_score"]}/30',
         'created_at': datetime.now().isoformat()
-    })
+    }]
+    data_versions.bump(engineer_id)
     
     return redirect('/admin')
 
 @app.route('/student')
+@http_cache.conditional(lambda: data_versions.key(session.get('user_id')))
 def student_dashboard():
     if 'user_id' not in session:
         return redirect('/login')
     
     user_id = session['user_id']
-    my_assignments = [a for a in assignments.values() if a['engineer_id'] == user_id]
-    my_notifications = notifications.get(user_id, [])[-5:]
-    
-    html = get_base_html() + f'''
-        <div class="header">
-            <h1>Student Dashboard - {session["username"]} <a href="/logout" style="float: right; color: white;">Logout</a></h1>
-        </div>
-        
-        <div class="container">
-    '''
-    
-    if my_notifications:
-        html += '<div class="card"><h2>Notifications</h2>'
-        for n in my_notifications:
-            html += f'<p><strong>{n["title"]}</strong><br>{n["message"]}<br><small>{n["created_at"][:16]}</small></p>'
-        html += '</div>'
-    
-    html += '<h2>My Assignments</h2>'
-    
-    if my_assignments:
-        for a in my_assignments:
-            html += f'''
-                <div class="card">
-                    <h3>{a["topic"].title()} Assignment 
-                        <span class="badge badge-{a["status"]}">{a["status"]}</span>
-                    </h3>
-                    <p>Due: {a["due_date"][:10]}</p>
-            '''
-            
-            if a['status'] == 'published':
-                html += f'<p><strong>Score: {a["total_score"]}/30</strong> (Scored by: {a.get("scored_by", "Admin")})</p>'
-                html += f'<a href="/student/assignment/{a["id"]}"><button>View Results</button></a>'
-            elif a['status'] in ['submitted', 'under_review']:
-                html += '<p>Your submission is being reviewed...</p>'
-            else:
-                html += f'<a href="/student/assignment/{a["id"]}"><button>Answer Questions</button></a>'
-            
-            html += '</div>'
-    else:
-        html += '<div class="card"><p>No assignments yet.</p></div>'
-    
-    html += '''
-        </div>
-    </body>
-    </html>
-    '''
-    return html
+    assignments_html = fragment_cache.render(
+        'student_assignments', user_id, data_versions.key(user_id),
+        lambda: inline_templates.render('student_assignments.html', STUDENT_ASSIGNMENTS_FRAGMENT,
+                                        my_assignments=assignments.find(engineer_id=user_id),
+                                        my_notifications=notifications.get(user_id, [])[-5:])
+    )
+    
+    return inline_templates.render('student_dashboard.html', STUDENT_DASHBOARD_TEMPLATE, assignments_html=assignments_html)
 
 @app.route('/student/assignment/<assignment_id>', methods=['GET', 'POST'])
 def student_assignment(assignment_id):
@@ -583,71 +599,18 @@ def student_assignment(assignment_id):
             for i in range(3):
                 answer = answers.get(str(i), '')
                 assignment['auto_scores'][str(i)] = calculate_auto_score(answer, assignment['topic'], i)
+            assignments[assignment_id] = assignment
+            data_versions.bump(session['user_id'])
         
         return redirect('/student')
     
     # Show assignment
-    html = get_base_html() + f'''
-        <div class="header">
-            <h1>{assignment["topic"].title()} Assignment</h1>
-        </div>
-        
-        <div class="container">
-            <div class="card">
-                <p>Status: <span class="badge badge-{assignment["status"]}">{assignment["status"]}</span> | Due: {assignment["due_date"][:10]}</p>
-    '''
-    
-    if assignment['status'] == 'published':
-        html += f'<p><strong>Total Score: {assignment["total_score"]}/30</strong></p>'
-    
-    if assignment['status'] == 'pending':
-        html += '<form method="POST">'
-    
-    for i, question in enumerate(assignment['questions']):
-        html += f'''
-            <div class="question">
-                <strong>Q{i+1}:</strong> {question}
-        '''
-        
-        if assignment['status'] == 'pending':
-            html += f'''
-                <div class="answer-box">
-                    <textarea name="answer_{i}" placeholder="Type your answer here..." required></textarea>
-                </div>
-            '''
-        elif assignment['status'] in ['submitted', 'under_review', 'published']:
-            answer = assignment.get('answers', {}).get(str(i), '')
-            html += f'''
-                <div class="answer-box">
-                    <strong>Your Answer:</strong><br>
-                    {answer}
-                </div>
-            '''
-            
-            if assignment['status'] == 'published':
-                final_score = assignment.get('final_scores', {}).get(str(i), 0)
-                html += f'<p><strong>Score: {final_score}/10</strong></p>'
-        
-        html += '</div>'
-    
-    if assignment['status'] == 'pending':
-        html += '''
-            <button type="submit" style="margin-top: 20px;">Submit All Answers</button>
-            </form>
-        '''
-    
-    html += '''
-                <a href="/student"><button type="button">Back to Dashboard</button></a>
-            </div>
-        </div>
-    </body>
-    </html>
-    '''
-    return html
+    return inline_templates.render('student_assignment.html', STUDENT_ASSIGNMENT_TEMPLATE, assignment=assignment)
 
 @app.route('/api/health')
 def health():
-    return jsonify({'status': 'ok', 'users': len(users), 'assignments': len(assignments)})
+    return jsonify({'status': 'ok', 'users': len(users), 'assignments': len(assignments),
+                    'fragment_cache': fragment_cache.stats()})
 
 # Initialize
 init_users()
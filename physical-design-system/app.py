@@ -2,15 +2,28 @@
 import os
 import hashlib
 from datetime import datetime, timedelta
-from flask import Flask, request, redirect, session
+from flask import Flask, request, redirect, session, jsonify
+from evaluation_cache import evaluation_cache, lexicon_version
+from storage import open_storage
+from templating import InlineTemplates
+from http_cache import HTTPCache, StorageVersions
+from fragment_cache import fragment_cache
+from scoring_engine import ScoringStrategy, engine
+import evaluator  # registers the 'technical' rubric
 
 app = Flask(__name__)
 app.secret_key = 'pd-secret-key'
+app.config['SCORING_RUBRIC'] = os.environ.get('SCORING_RUBRIC', 'answer_quality')
+inline_templates = InlineTemplates(app)
+http_cache = HTTPCache(app)
 
-# Global data
-users = {}
-assignments = {}
-counter = 0
+# Global data, in the backend named by STORAGE_URL (per-process dicts by default).
+# Stored values may be copies, so write them back after changing them.
+storage = open_storage()
+users = storage.collection('users')
+assignments = storage.collection('assignments', indexed=('engineer_id', 'status'))
+# Bumped on every write, so dashboard ETags change exactly when their data does
+data_versions = StorageVersions(storage)
 
 # Questions - 15 per topic, 3+ experience level (NEW QUESTIONS - 3 SETS OF 5 EACH)
 QUESTIONS = {
@@ -89,7 +102,6 @@ def check_pass(hashed, pwd):
     return hashed == hashlib.sha256(pwd.encode()).hexdigest()
 
 def init_data():
-    global users
     users['admin'] = {
         'id': 'admin',
         'username': 'admin',
@@ -121,93 +133,111 @@ def init_data():
             'exp': 3 + (int(uid[-1]) % 3)
         }
 
+# Define key technical terms and concepts for each topic
+SCORING_CRITERIA = {
+    'floorplanning': {
+        'excellent_terms': ['voltage domain', 'level shifter', 'power delivery', 'thermal', 'isolation', 'macro placement', 'utilization', 'congestion', 'timing closure', 'ir drop', 'power grid', 'mixed-signal'],
+        'good_terms': ['placement', 'routing', 'timing', 'power', 'area', 'floorplan', 'design', 'optimization', 'constraint', 'metal layer'],
+        'methodology_terms': ['systematic', 'approach', 'strategy', 'methodology', 'analysis', 'verification', 'optimization', 'iteration']
+    },
+    'placement': {
+        'excellent_terms': ['timing violation', 'setup time', 'hold time', 'slack', 'congestion', 'utilization', 'fanout', 'clock domain', 'power optimization', 'multi-vt', 'threshold voltage'],
+        'good_terms': ['placement', 'timing', 'routing', 'optimization', 'constraint', 'critical path', 'delay', 'buffer', 'clock', 'power'],
+        'methodology_terms': ['global placement', 'detailed placement', 'incremental', 'systematic', 'iterative', 'optimization', 'analysis']
+    },
+    'routing': {
+        'excellent_terms': ['drc violation', 'crosstalk', 'coupling', 'skew', 'impedance', 'differential pair', 'electromigration', 'current density', 'metal density', 'antenna effect'],
+        'good_terms': ['routing', 'via', 'spacing', 'width', 'layer', 'signal integrity', 'timing', 'power', 'ground', 'clock'],
+        'methodology_terms': ['global routing', 'detailed routing', 'systematic', 'layer assignment', 'optimization', 'verification', 'debugging']
+    }
+}
+
+class AnswerQualityRubric(ScoringStrategy):
+    """0-10 suggested score used on the admin review page"""
+    
+    name = 'answer_quality'
+    lexicon_version = lexicon_version('analyze_answer_quality', SCORING_CRITERIA)
+    
+    def phrases(self, topic, question_index):
+        criteria = SCORING_CRITERIA.get(topic, SCORING_CRITERIA['floorplanning'])
+        return criteria['excellent_terms'] + criteria['good_terms'] + criteria['methodology_terms']
+    
+    def score_answer(self, analyzed, hits, topic, question_index):
+        """Score one answer against the topic's scoring criteria"""
+        if analyzed.stripped_length < 20:
+            return 0, "Answer too short or empty"
+        
+        criteria = SCORING_CRITERIA.get(topic, SCORING_CRITERIA['floorplanning'])
+        
+        # Count relevant technical terms
+        excellent_count = sum(1 for term in criteria['excellent_terms'] if term in hits)
+        good_count = sum(1 for term in criteria['good_terms'] if term in hits)
+        methodology_count = sum(1 for term in criteria['methodology_terms'] if term in hits)
+        
+        # Calculate base score based on technical content
+        base_score = 0
+        
+        # Length and structure analysis
+        word_count = analyzed.word_count
+        has_structure = analyzed.has_structure
+        has_examples = analyzed.has_examples
+        
+        # Scoring logic
+        if excellent_count >= 3 and word_count >= 100:
+            base_score = 8
+            reasoning = f"Strong technical content ({excellent_count} advanced terms)"
+        elif excellent_count >= 2 and word_count >= 60:
+            base_score = 7
+            reasoning = f"Good technical knowledge ({excellent_count} advanced terms)"
+        elif excellent_count >= 1 or good_count >= 3:
+            base_score = 6
+            reasoning = f"Adequate technical understanding"
+        elif good_count >= 2 and word_count >= 40:
+            base_score = 5
+            reasoning = f"Basic technical knowledge"
+        elif word_count >= 30:
+            base_score = 4
+            reasoning = "Limited technical content"
+        else:
+            base_score = 3
+            reasoning = "Insufficient technical detail"
+        
+        # Bonus points for methodology and structure
+        if methodology_count >= 2:
+            base_score += 1
+            reasoning += " + systematic approach"
+        if has_structure:
+            base_score += 0.5
+            reasoning += " + well-structured"
+        if has_examples and word_count >= 80:
+            base_score += 0.5
+            reasoning += " + practical examples"
+        
+        # Cap at 10 and round
+        final_score = min(10, round(base_score))
+        
+        # Add word count info
+        reasoning += f" ({word_count} words)"
+        
+        return final_score, reasoning
+
+engine.register(AnswerQualityRubric.name, AnswerQualityRubric)
+
 def analyze_answer_quality(question, answer, topic):
     """
     Analyzes answer quality and suggests a score based on technical content
     Returns: (suggested_score, reasoning)
     """
-    if not answer or len(answer.strip()) < 20:
-        return 0, "Answer too short or empty"
-    
-    answer_lower = answer.lower()
-    
-    # Define key technical terms and concepts for each topic
-    scoring_criteria = {
-        'floorplanning': {
-            'excellent_terms': ['voltage domain', 'level shifter', 'power delivery', 'thermal', 'isolation', 'macro placement', 'utilization', 'congestion', 'timing closure', 'ir drop', 'power grid', 'mixed-signal'],
-            'good_terms': ['placement', 'routing', 'timing', 'power', 'area', 'floorplan', 'design', 'optimization', 'constraint', 'metal layer'],
-            'methodology_terms': ['systematic', 'approach', 'strategy', 'methodology', 'analysis', 'verification', 'optimization', 'iteration']
-        },
-        'placement': {
-            'excellent_terms': ['timing violation', 'setup time', 'hold time', 'slack', 'congestion', 'utilization', 'fanout', 'clock domain', 'power optimization', 'multi-vt', 'threshold voltage'],
-            'good_terms': ['placement', 'timing', 'routing', 'optimization', 'constraint', 'critical path', 'delay', 'buffer', 'clock', 'power'],
-            'methodology_terms': ['global placement', 'detailed placement', 'incremental', 'systematic', 'iterative', 'optimization', 'analysis']
-        },
-        'routing': {
-            'excellent_terms': ['drc violation', 'crosstalk', 'coupling', 'skew', 'impedance', 'differential pair', 'electromigration', 'current density', 'metal density', 'antenna effect'],
-            'good_terms': ['routing', 'via', 'spacing', 'width', 'layer', 'signal integrity', 'timing', 'power', 'ground', 'clock'],
-            'methodology_terms': ['global routing', 'detailed routing', 'systematic', 'layer assignment', 'optimization', 'verification', 'debugging']
-        }
-    }
-    
-    criteria = scoring_criteria.get(topic, scoring_criteria['floorplanning'])
-    
-    # Count relevant technical terms
-    excellent_count = sum(1 for term in criteria['excellent_terms'] if term in answer_lower)
-    good_count = sum(1 for term in criteria['good_terms'] if term in answer_lower)
-    methodology_count = sum(1 for term in criteria['methodology_terms'] if term in answer_lower)
-    
-    # Calculate base score based on technical content
-    base_score = 0
-    
-    # Length and structure analysis
-    word_count = len(answer.split())
-    has_structure = any(marker in answer_lower for marker in ['1.', '2.', 'first', 'second', 'step', 'approach', 'strategy'])
-    has_examples = any(marker in answer_lower for marker in ['example', 'for instance', 'such as', 'e.g.', 'like'])
+    rubric = app.config['SCORING_RUBRIC']
+    result = engine.score_answer(answer, topic, None, rubric)
+    if rubric == AnswerQualityRubric.name:
+        return tuple(result)
     
-    # Scoring logic
-    if excellent_count >= 3 and word_count >= 100:
-        base_score = 8
-        reasoning = f"Strong technical content ({excellent_count} advanced terms)"
-    elif excellent_count >= 2 and word_count >= 60:
-        base_score = 7
-        reasoning = f"Good technical knowledge ({excellent_count} advanced terms)"
-    elif excellent_count >= 1 or good_count >= 3:
-        base_score = 6
-        reasoning = f"Adequate technical understanding"
-    elif good_count >= 2 and word_count >= 40:
-        base_score = 5
-        reasoning = f"Basic technical knowledge"
-    elif word_count >= 30:
-        base_score = 4
-        reasoning = "Limited technical content"
-    else:
-        base_score = 3
-        reasoning = "Insufficient technical detail"
-    
-    # Bonus points for methodology and structure
-    if methodology_count >= 2:
-        base_score += 1
-        reasoning += " + systematic approach"
-    if has_structure:
-        base_score += 0.5
-        reasoning += " + well-structured"
-    if has_examples and word_count >= 80:
-        base_score += 0.5
-        reasoning += " + practical examples"
-    
-    # Cap at 10 and round
-    final_score = min(10, round(base_score))
-    
-    # Add word count info
-    reasoning += f" ({word_count} words)"
-    
-    return final_score, reasoning
+    # Percentage rubrics are mapped onto the 0-10 review scale
+    return min(10, round(result['overall_score'] / 10)), result.get('detailed_feedback', '')
 
 def create_test(eng_id, topic):
-    global counter
-    counter += 1
-    test_id = f"PD_{topic}_{eng_id}_{counter}"
+    test_id = f"PD_{topic}_{eng_id}_{storage.next_id('test')}"
     
     # Each engineer gets all 15 questions from their topic
     all_questions = QUESTIONS[topic]
@@ -227,6 +257,7 @@ def create_test(eng_id, topic):
     }
     
     assignments[test_id] = test
+    data_versions.bump(eng_id)
     return test
 
 @app.route('/')
@@ -237,9 +268,25 @@ def home():
         return redirect('/student')
     return redirect('/login')
 
+@app.route('/livez')
+def livez():
+    """Liveness: the process is serving requests; touches nothing else"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: shared storage (SQLite/Redis) answers a read; memory storage is always ready"""
+    if storage.shared:
+        try:
+            storage.current_id('assignments')
+        except Exception as e:
+            return jsonify({'status': 'unavailable', 'error': str(e)}), 503
+    return jsonify({'status': 'ready'})
+
 @app.route('/health')
 def health():
-    return 'OK'
+    return jsonify({'status': 'ok', 'evaluation_cache': evaluation_cache.stats(),
+                    'fragment_cache': fragment_cache.stats()})
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -486,52 +533,36 @@ def logout():
     return redirect('/login')
 
 @app.route('/admin')
+@http_cache.conditional(lambda: data_versions.key(session.get('user_id'), everything=True) if session.get('is_admin') else None)
 def admin():
     if not session.get('is_admin'):
         return redirect('/login')
     
     engineers = [u for u in users.values() if not u.get('is_admin')]
     all_tests = list(assignments.values())
-    pending = [a for a in all_tests if a['status'] == 'submitted']
-    
-    eng_options = ''
-    for eng in engineers:
-        display_name = eng.get('display_name', eng['username'])
-        eng_options += f'<option value="{eng["id"]}">{display_name} (3+ Experience)</option>'
-    
-    pending_html = ''
-    for p in pending:
-        pending_html += f'''
-        <div class="pending-item">
-            <div class="pending-title">{p["topic"].title()} Assessment - {users.get(p["engineer_id"], {}).get('display_name', p["engineer_id"])}</div>
-            <div class="pending-meta">📝 15 Questions | 🎯 Max: 150 points | ⏰ Submitted for review</div>
-            <a href="/admin/review/{p["id"]}" class="review-btn">Review Assessment</a>
-        </div>'''
+    pending = assignments.find(status='submitted')
     
-    if not pending_html:
-        pending_html = '<div class="no-pending"><h3>📭 No Pending Reviews</h3><p>All assessments have been reviewed and completed.</p></div>'
-    
-    return f'''
+    admin_html = '''
 <!DOCTYPE html>
 <html>
 <head>
     <title>Vibhuayu Technologies - Admin Dashboard</title>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ 
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { 
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
             background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); 
             min-height: 100vh;
             color: #334155;
-        }}
-        .header {{ 
+        }
+        .header { 
             background: linear-gradient(135deg, #1e40af, #3b82f6); 
             padding: 20px 0; 
             box-shadow: 0 4px 20px rgba(0, 0, 0, 0.1);
             position: relative;
             overflow: hidden;
-        }}
-        .header::before {{
+        }
+        .header::before {
             content: '';
             position: absolute;
             top: 0;
@@ -541,13 +572,13 @@ def admin():
             background: linear-gradient(45deg, transparent 30%, rgba(255,255,255,0.1) 50%, transparent 70%);
             transform: translateX(-100%);
             animation: headerShine 4s infinite;
-        }}
-        @keyframes headerShine {{
-            0% {{ transform: translateX(-100%); }}
-            50% {{ transform: translateX(100%); }}
-            100% {{ transform: translateX(100%); }}
-        }}
-        .header-content {{
+        }
+        @keyframes headerShine {
+            0% { transform: translateX(-100%); }
+            50% { transform: translateX(100%); }
+            100% { transform: translateX(100%); }
+        }
+        .header-content {
             max-width: 1200px; 
             margin: 0 auto; 
             padding: 0 20px;
@@ -556,13 +587,13 @@ def admin():
             justify-content: space-between;
             position: relative;
             z-index: 2;
-        }}
-        .header-title {{
+        }
+        .header-title {
             display: flex;
             align-items: center;
             gap: 15px;
-        }}
-        .header-logo {{
+        }
+        .header-logo {
             width: 50px;
             height: 50px;
             background: rgba(255, 255, 255, 0.15);
@@ -574,14 +605,14 @@ def admin():
             color: white;
             font-size: 20px;
             backdrop-filter: blur(10px);
-        }}
-        .header h1 {{ 
+        }
+        .header h1 { 
             color: white; 
             font-size: 28px; 
             font-weight: 700;
             text-shadow: 0 2px 10px rgba(0,0,0,0.3);
-        }}
-        .logout {{ 
+        }
+        .logout { 
             background: rgba(255, 255, 255, 0.15); 
             color: white; 
             padding: 12px 20px; 
@@ -590,23 +621,23 @@ def admin():
             backdrop-filter: blur(10px);
             transition: all 0.3s ease;
             font-weight: 600;
-        }}
-        .logout:hover {{
+        }
+        .logout:hover {
             background: rgba(255, 255, 255, 0.25);
             transform: translateY(-2px);
-        }}
-        .container {{ 
+        }
+        .container { 
             max-width: 1200px; 
             margin: 30px auto; 
             padding: 0 20px; 
-        }}
-        .stats {{ 
+        }
+        .stats { 
             display: grid; 
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); 
             gap: 25px; 
             margin-bottom: 40px; 
-        }}
-        .stat {{ 
+        }
+        .stat { 
             background: linear-gradient(135deg, #ffffff 0%, #f8fafc 100%); 
             padding: 30px; 
             border-radius: 16px; 
@@ -614,70 +645,70 @@ def admin():
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
             border: 1px solid rgba(255, 255, 255, 0.2);
             transition: transform 0.3s ease;
-        }}
-        .stat:hover {{
+        }
+        .stat:hover {
             transform: translateY(-5px);
-        }}
-        .stat-num {{ 
+        }
+        .stat-num { 
             font-size: 36px; 
             font-weight: 800; 
             background: linear-gradient(135deg, #3b82f6, #1d4ed8);
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             margin-bottom: 8px;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             color: #64748b;
             font-weight: 600;
             font-size: 14px;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
-        .card {{ 
+        }
+        .card { 
             background: linear-gradient(135deg, #ffffff 0%, #f8fafc 100%); 
             border-radius: 20px; 
             padding: 30px; 
             margin: 25px 0; 
             box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
             border: 1px solid rgba(255, 255, 255, 0.2);
-        }}
-        .card h2 {{
+        }
+        .card h2 {
             color: #1e293b;
             margin-bottom: 25px;
             font-size: 24px;
             font-weight: 700;
-        }}
-        .form-row {{
+        }
+        .form-row {
             display: flex;
             gap: 15px;
             align-items: end;
-        }}
-        select, button {{ 
+        }
+        select, button { 
             padding: 14px 18px; 
             border: 2px solid #e2e8f0; 
             border-radius: 10px; 
             font-size: 16px;
             transition: all 0.3s ease;
             background: white;
-        }}
-        select:focus {{
+        }
+        select:focus {
             outline: none;
             border-color: #3b82f6;
             box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1);
-        }}
-        .btn-primary {{ 
+        }
+        .btn-primary { 
             background: linear-gradient(135deg, #3b82f6, #1d4ed8); 
             color: white; 
             border: none; 
             cursor: pointer; 
             font-weight: 600;
             min-width: 120px;
-        }}
-        .btn-primary:hover {{
+        }
+        .btn-primary:hover {
             transform: translateY(-2px);
             box-shadow: 0 10px 25px rgba(59, 130, 246, 0.4);
-        }}
-        .pending-item {{
+        }
+        .pending-item {
             background: linear-gradient(135deg, #f8fafc, #f1f5f9); 
             padding: 20px; 
             margin: 15px 0; 
@@ -685,22 +716,22 @@ def admin():
             border-left: 4px solid #10b981;
             box-shadow: 0 4px 15px rgba(0, 0, 0, 0.05);
             transition: transform 0.3s ease;
-        }}
-        .pending-item:hover {{
+        }
+        .pending-item:hover {
             transform: translateX(5px);
-        }}
-        .pending-title {{
+        }
+        .pending-title {
             font-weight: 700;
             color: #1e293b;
             margin-bottom: 8px;
             font-size: 16px;
-        }}
-        .pending-meta {{
+        }
+        .pending-meta {
             color: #64748b;
             font-size: 14px;
             margin-bottom: 15px;
-        }}
-        .review-btn {{
+        }
+        .review-btn {
             background: linear-gradient(135deg, #10b981, #059669); 
             color: white; 
             padding: 10px 20px; 
@@ -709,19 +740,19 @@ def admin():
             display: inline-block;
             font-weight: 600;
             transition: all 0.3s ease;
-        }}
-        .review-btn:hover {{
+        }
+        .review-btn:hover {
             transform: translateY(-2px);
             box-shadow: 0 8px 20px rgba(16, 185, 129, 0.4);
-        }}
-        .no-pending {{
+        }
+        .no-pending {
             text-align: center; 
             color: #64748b; 
             padding: 60px 20px;
             background: linear-gradient(135deg, #f8fafc, #f1f5f9);
             border-radius: 12px;
             border: 2px dashed #cbd5e1;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -738,15 +769,15 @@ def admin():
     <div class="container">
         <div class="stats">
             <div class="stat">
-                <div class="stat-num">{len(engineers)}</div>
+                <div class="stat-num">{{ engineers|length }}</div>
                 <div class="stat-label">Engineers</div>
             </div>
             <div class="stat">
-                <div class="stat-num">{len(all_tests)}</div>
+                <div class="stat-num">{{ all_tests|length }}</div>
                 <div class="stat-label">Total Tests</div>
             </div>
             <div class="stat">
-                <div class="stat-num">{len(pending)}</div>
+                <div class="stat-num">{{ pending|length }}</div>
                 <div class="stat-label">Pending Reviews</div>
             </div>
             <div class="stat">
@@ -761,7 +792,9 @@ def admin():
                 <div class="form-row">
                     <select name="engineer_id" required>
                         <option value="">Select Engineer...</option>
-                        {eng_options}
+                        {% for eng in engineers %}
+                        <option value="{{ eng["id"] }}">{{ eng.get('display_name', eng['username']) }} (3+ Experience)</option>
+                        {% endfor %}
                     </select>
                     <select name="topic" required>
                         <option value="">Select Topic...</option>
@@ -776,11 +809,21 @@ def admin():
         
         <div class="card">
             <h2>📋 Pending Reviews</h2>
-            {pending_html}
+            {% for p in pending %}
+            <div class="pending-item">
+                <div class="pending-title">{{ p["topic"].title() }} Assessment - {{ users.get(p["engineer_id"], {}).get('display_name', p["engineer_id"]) }}</div>
+                <div class="pending-meta">📝 15 Questions | 🎯 Max: 150 points | ⏰ Submitted for review</div>
+                <a href="/admin/review/{{ p["id"] }}" class="review-btn">Review Assessment</a>
+            </div>
+            {% else %}
+            <div class="no-pending"><h3>📭 No Pending Reviews</h3><p>All assessments have been reviewed and completed.</p></div>
+            {% endfor %}
         </div>
     </div>
 </body>
 </html>'''
+    return inline_templates.render('admin.html', admin_html,
+                                   engineers=engineers, all_tests=all_tests, pending=pending, users=users)
 
 @app.route('/admin/create', methods=['POST'])
 def admin_create():
@@ -795,6 +838,32 @@ def admin_create():
     
     return redirect('/admin')
 
+def review_rows(test):
+    """One row per question: the answer with its AI score suggestion"""
+    questions = []
+    for i, q in enumerate(test['questions']):
+        # Get AI suggestion
+        auto_score_data = test.get('auto_scores', {}).get(str(i), {'score': 0, 'reasoning': 'No analysis available'})
+        suggested_score = auto_score_data['score']
+        
+        # Color coding for AI suggestion
+        if suggested_score >= 8:
+            suggestion_color = "#10b981"  # Green
+        elif suggested_score >= 6:
+            suggestion_color = "#f59e0b"  # Yellow
+        else:
+            suggestion_color = "#ef4444"  # Red
+        
+        questions.append({
+            'question': q,
+            'answer': test.get('answers', {}).get(str(i), 'No answer'),
+            'suggested_score': suggested_score,
+            'reasoning': auto_score_data['reasoning'],
+            'color': suggestion_color
+        })
+    
+    return questions
+
 @app.route('/admin/review/<test_id>', methods=['GET', 'POST'])
 def admin_review(test_id):
     if not session.get('is_admin'):
@@ -816,6 +885,7 @@ def admin_review(test_id):
                     'score': suggested_score,
                     'reasoning': reasoning
                 }
+        assignments[test_id] = test
     
     if request.method == 'POST':
         total = 0
@@ -828,77 +898,69 @@ def admin_review(test_id):
         
         test['score'] = total
         test['status'] = 'completed'
+        assignments[test_id] = test
+        data_versions.bump(test['engineer_id'])
         return redirect('/admin')
     
-    questions_html = ''
-    for i, q in enumerate(test['questions']):
-        answer = test.get('answers', {}).get(str(i), 'No answer')
-        
-        # Get AI suggestion
-        auto_score_data = test.get('auto_scores', {}).get(str(i), {'score': 0, 'reasoning': 'No analysis available'})
-        suggested_score = auto_score_data['score']
-        reasoning = auto_score_data['reasoning']
-        
-        # Color coding for AI suggestion
-        if suggested_score >= 8:
-            suggestion_color = "#10b981"  # Green
-        elif suggested_score >= 6:
-            suggestion_color = "#f59e0b"  # Yellow
-        else:
-            suggestion_color = "#ef4444"  # Red
-        
-        questions_html += f'''
-        <div style="background: white; border-radius: 8px; padding: 20px; margin: 15px 0; border-left: 4px solid {suggestion_color};">
-            <h4>Question {i+1}</h4>
-            <div style="background: #f1f5f9; padding: 15px; border-radius: 6px; margin: 10px 0;">
-                {q}
-            </div>
-            <h5>Answer:</h5>
-            <div style="background: #fefefe; border: 1px solid #e2e8f0; padding: 15px; border-radius: 6px; font-family: monospace; white-space: pre-wrap;">
-                {answer}
-            </div>
-            <div style="background: #f8fafc; border-radius: 6px; padding: 12px; margin: 10px 0; border: 1px solid #e2e8f0;">
-                <div style="display: flex; align-items: center; gap: 10px;">
-                    <span style="background: {suggestion_color}; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold;">
-                        AI Suggests: {suggested_score}/10
-                    </span>
-                    <span style="color: #64748b; font-size: 14px;">{reasoning}</span>
+    questions_fragment = '''
+            {% for row in questions %}
+            <div style="background: white; border-radius: 8px; padding: 20px; margin: 15px 0; border-left: 4px solid {{ row.color }};">
+                <h4>Question {{ loop.index }}</h4>
+                <div style="background: #f1f5f9; padding: 15px; border-radius: 6px; margin: 10px 0;">
+                    {{ row.question }}
+                </div>
+                <h5>Answer:</h5>
+                <div style="background: #fefefe; border: 1px solid #e2e8f0; padding: 15px; border-radius: 6px; font-family: monospace; white-space: pre-wrap;">
+                    {{ row.answer }}
+                </div>
+                <div style="background: #f8fafc; border-radius: 6px; padding: 12px; margin: 10px 0; border: 1px solid #e2e8f0;">
+                    <div style="display: flex; align-items: center; gap: 10px;">
+                        <span style="background: {{ row.color }}; color: white; padding: 4px 12px; border-radius: 20px; font-weight: bold;">
+                            AI Suggests: {{ row.suggested_score }}/10
+                        </span>
+                        <span style="color: #64748b; font-size: 14px;">{{ row.reasoning }}</span>
+                    </div>
+                </div>
+                <div style="margin: 15px 0;">
+                    <label><strong>Your Score:</strong></label>
+                    <input type="number" name="score_{{ loop.index0 }}" min="0" max="10" value="{{ row.suggested_score }}" style="width: 60px; padding: 5px; border: 2px solid {{ row.color }};">
+                    <span>/10</span>
+                    <button type="button" onclick="this.previousElementSibling.previousElementSibling.value={{ row.suggested_score }}" style="margin-left: 10px; padding: 4px 8px; background: {{ row.color }}; color: white; border: none; border-radius: 4px; cursor: pointer; font-size: 12px;">
+                        Use AI Score
+                    </button>
                 </div>
             </div>
-            <div style="margin: 15px 0;">
-                <label><strong>Your Score:</strong></label>
-                <input type="number" name="score_{i}" min="0" max="10" value="{suggested_score}" style="width: 60px; padding: 5px; border: 2px solid {suggestion_color};">
-                <span>/10</span>
-                <button type="button" onclick="this.previousElementSibling.previousElementSibling.value={suggested_score}" style="margin-left: 10px; padding: 4px 8px; background: {suggestion_color}; color: white; border: none; border-radius: 4px; cursor: pointer; font-size: 12px;">
-                    Use AI Score
-                </button>
-            </div>
-        </div>'''
+            {% endfor %}
+'''
+    questions_html = fragment_cache.render(
+        'review_questions', test_id, data_versions.key(test['engineer_id']),
+        lambda: inline_templates.render('review_questions.html', questions_fragment, questions=review_rows(test))
+    )
     
-    return f'''
+    review_html = '''
 <!DOCTYPE html>
 <html>
 <head>
     <title>Review Test</title>
     <style>
-        body {{ font-family: Arial; background: #f8fafc; margin: 0; }}
-        .header {{ background: linear-gradient(135deg, #1e40af, #3b82f6); color: white; padding: 20px 0; }}
-        .container {{ max-width: 1000px; margin: 20px auto; padding: 0 20px; }}
-        button {{ background: #3b82f6; color: white; padding: 12px 24px; border: none; border-radius: 6px; cursor: pointer; margin: 10px 5px; }}
-        .btn-sec {{ background: #6b7280; }}
-        input {{ padding: 5px; border: 1px solid #ddd; border-radius: 4px; }}
+        body { font-family: Arial; background: #f8fafc; margin: 0; }
+        .header { background: linear-gradient(135deg, #1e40af, #3b82f6); color: white; padding: 20px 0; }
+        .container { max-width: 1000px; margin: 20px auto; padding: 0 20px; }
+        button { background: #3b82f6; color: white; padding: 12px 24px; border: none; border-radius: 6px; cursor: pointer; margin: 10px 5px; }
+        .btn-sec { background: #6b7280; }
+        input { padding: 5px; border: 1px solid #ddd; border-radius: 4px; }
     </style>
 </head>
 <body>
     <div class="header">
         <div style="max-width: 1000px; margin: 0 auto; padding: 0 20px;">
-            <h1>Review: {test_id}</h1>
+            <h1>Review: {{ test_id }}</h1>
         </div>
     </div>
     
     <div class="container">
         <form method="POST">
-            {questions_html}
+            {{ questions_html }}
             <div style="text-align: center; padding: 20px;">
                 <button type="submit">Publish Scores</button>
                 <a href="/admin"><button type="button" class="btn-sec">Back</button></a>
@@ -907,58 +969,33 @@ def admin_review(test_id):
     </div>
 </body>
 </html>'''
+    return inline_templates.render('admin_review.html', review_html, test_id=test_id, questions_html=questions_html)
 
 @app.route('/student')
+@http_cache.conditional(lambda: data_versions.key(session.get('user_id')) if not session.get('is_admin') else None)
 def student():
     if not session.get('user_id') or session.get('is_admin'):
         return redirect('/login')
     
     user_id = session['user_id']
     user = users.get(user_id, {})
-    my_tests = [a for a in assignments.values() if a['engineer_id'] == user_id]
+    my_tests = assignments.find(engineer_id=user_id)
     
-    tests_html = ''
-    for t in my_tests:
-        status = t['status']
-        if status == 'completed':
-            tests_html += f'''
-            <div style="background: white; border-radius: 12px; padding: 20px; margin: 15px 0;">
-                <h3>{t["topic"].title()} Test</h3>
-                <div style="background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 12px; border-radius: 8px; text-align: center;">
-                    <strong>Score: {t["score"]}/150</strong>
-                </div>
-            </div>'''
-        elif status == 'submitted':
-            tests_html += f'''
-            <div style="background: white; border-radius: 12px; padding: 20px; margin: 15px 0;">
-                <h3>{t["topic"].title()} Test</h3>
-                <p style="color: #3b82f6; text-align: center;">Under Review</p>
-            </div>'''
-        else:
-            tests_html += f'''
-            <div style="background: white; border-radius: 12px; padding: 20px; margin: 15px 0;">
-                <h3>{t["topic"].title()} Test</h3>
-                <a href="/student/test/{t["id"]}" style="background: linear-gradient(135deg, #667eea, #764ba2); color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px; display: block; text-align: center;">
-                    Start Test
-                </a>
-            </div>'''
-    
-    if not tests_html:
-        tests_html = '<div style="text-align: center; padding: 40px; color: #64748b;"><h3>No tests assigned</h3></div>'
+    completed = len([t for t in my_tests if t['status'] == 'completed'])
     
-    return f'''
+    student_html = '''
 <!DOCTYPE html>
 <html>
 <head>
     <title>Student Dashboard</title>
     <style>
-        body {{ font-family: Arial; margin: 0; background: linear-gradient(135deg, #667eea, #764ba2); min-height: 100vh; }}
-        .header {{ background: rgba(255,255,255,0.95); padding: 20px 0; }}
-        .container {{ max-width: 1000px; margin: 20px auto; padding: 0 20px; }}
-        .stats {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; margin-bottom: 30px; }}
-        .stat {{ background: rgba(255,255,255,0.95); padding: 20px; border-radius: 16px; text-align: center; }}
-        .section {{ background: rgba(255,255,255,0.95); border-radius: 16px; padding: 24px; }}
-        .logout {{ background: rgba(239,68,68,0.1); color: #dc2626; padding: 8px 16px; text-decoration: none; border-radius: 6px; float: right; }}
+        body { font-family: Arial; margin: 0; background: linear-gradient(135deg, #667eea, #764ba2); min-height: 100vh; }
+        .header { background: rgba(255,255,255,0.95); padding: 20px 0; }
+        .container { max-width: 1000px; margin: 20px auto; padding: 0 20px; }
+        .stats { display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; margin-bottom: 30px; }
+        .stat { background: rgba(255,255,255,0.95); padding: 20px; border-radius: 16px; text-align: center; }
+        .section { background: rgba(255,255,255,0.95); border-radius: 16px; padding: 24px; }
+        .logout { background: rgba(239,68,68,0.1); color: #dc2626; padding: 8px 16px; text-decoration: none; border-radius: 6px; float: right; }
     </style>
 </head>
 <body>
@@ -973,19 +1010,43 @@ def student():
     
     <div class="container">
         <div class="stats">
-            <div class="stat"><div style="font-size: 20px; font-weight: bold;">{len(my_tests)}</div><div>Tests</div></div>
-            <div class="stat"><div style="font-size: 20px; font-weight: bold;">{len([t for t in my_tests if t['status'] == 'completed'])}</div><div>Done</div></div>
-            <div class="stat"><div style="font-size: 20px; font-weight: bold;">{user.get('exp', 0)}y</div><div>Experience</div></div>
+            <div class="stat"><div style="font-size: 20px; font-weight: bold;">{{ my_tests|length }}</div><div>Tests</div></div>
+            <div class="stat"><div style="font-size: 20px; font-weight: bold;">{{ completed }}</div><div>Done</div></div>
+            <div class="stat"><div style="font-size: 20px; font-weight: bold;">{{ user.get('exp', 0) }}y</div><div>Experience</div></div>
             <div class="stat"><div style="font-size: 20px; font-weight: bold;">15</div><div>Questions</div></div>
         </div>
         
         <div class="section">
             <h2>My Tests</h2>
-            {tests_html}
+            {% for t in my_tests %}
+            {% if t['status'] == 'completed' %}
+            <div style="background: white; border-radius: 12px; padding: 20px; margin: 15px 0;">
+                <h3>{{ t["topic"].title() }} Test</h3>
+                <div style="background: linear-gradient(135deg, #10b981, #059669); color: white; padding: 12px; border-radius: 8px; text-align: center;">
+                    <strong>Score: {{ t["score"] }}/150</strong>
+                </div>
+            </div>
+            {% elif t['status'] == 'submitted' %}
+            <div style="background: white; border-radius: 12px; padding: 20px; margin: 15px 0;">
+                <h3>{{ t["topic"].title() }} Test</h3>
+                <p style="color: #3b82f6; text-align: center;">Under Review</p>
+            </div>
+            {% else %}
+            <div style="background: white; border-radius: 12px; padding: 20px; margin: 15px 0;">
+                <h3>{{ t["topic"].title() }} Test</h3>
+                <a href="/student/test/{{ t["id"] }}" style="background: linear-gradient(135deg, #667eea, #764ba2); color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px; display: block; text-align: center;">
+                    Start Test
+                </a>
+            </div>
+            {% endif %}
+            {% else %}
+            <div style="text-align: center; padding: 40px; color: #64748b;"><h3>No tests assigned</h3></div>
+            {% endfor %}
         </div>
     </div>
 </body>
 </html>'''
+    return inline_templates.render('student.html', student_html, user=user, my_tests=my_tests, completed=completed)
 
 @app.route('/student/test/<test_id>', methods=['GET', 'POST'])
 def student_test(test_id):
@@ -1006,50 +1067,49 @@ def student_test(test_id):
         if len(answers) == 15:  # All 15 must be answered
             test['answers'] = answers
             test['status'] = 'submitted'
+            assignments[test_id] = test
+            data_versions.bump(session['user_id'])
         
         return redirect('/student')
     
-    questions_html = ''
-    for i, q in enumerate(test['questions']):
-        questions_html += f'''
-        <div style="background: rgba(255,255,255,0.95); border-radius: 16px; padding: 24px; margin: 20px 0;">
-            <div style="background: linear-gradient(135deg, #667eea, #764ba2); color: white; padding: 8px 16px; border-radius: 20px; display: inline-block; margin-bottom: 16px;">
-                Question {i+1} of 15
-            </div>
-            <div style="background: linear-gradient(135deg, #f8fafc, #f1f5f9); padding: 16px; border-radius: 12px; margin-bottom: 20px; border-left: 4px solid #667eea;">
-                {q}
-            </div>
-            <label style="font-weight: 600; margin-bottom: 8px; display: block;">Your Answer:</label>
-            <textarea name="answer_{i}" style="width: 100%; min-height: 120px; padding: 16px; border: 2px solid #e5e7eb; border-radius: 12px; font-size: 14px;" placeholder="Provide detailed technical answer..." required></textarea>
-        </div>'''
-    
-    return f'''
+    test_html = '''
 <!DOCTYPE html>
 <html>
 <head>
-    <title>{test["topic"].title()} Test</title>
+    <title>{{ test["topic"].title() }} Test</title>
     <style>
-        body {{ font-family: Arial; margin: 0; background: linear-gradient(135deg, #667eea, #764ba2); min-height: 100vh; }}
-        .header {{ background: rgba(255,255,255,0.95); padding: 20px 0; position: sticky; top: 0; }}
-        .container {{ max-width: 1000px; margin: 20px auto; padding: 0 20px; }}
-        button {{ padding: 14px 28px; border: none; border-radius: 10px; font-weight: 600; cursor: pointer; margin: 8px; }}
-        .btn-primary {{ background: linear-gradient(135deg, #667eea, #764ba2); color: white; }}
-        .btn-secondary {{ background: rgba(107,114,128,0.1); color: #374151; }}
-        textarea:focus {{ outline: none; border-color: #667eea; }}
+        body { font-family: Arial; margin: 0; background: linear-gradient(135deg, #667eea, #764ba2); min-height: 100vh; }
+        .header { background: rgba(255,255,255,0.95); padding: 20px 0; position: sticky; top: 0; }
+        .container { max-width: 1000px; margin: 20px auto; padding: 0 20px; }
+        button { padding: 14px 28px; border: none; border-radius: 10px; font-weight: 600; cursor: pointer; margin: 8px; }
+        .btn-primary { background: linear-gradient(135deg, #667eea, #764ba2); color: white; }
+        .btn-secondary { background: rgba(107,114,128,0.1); color: #374151; }
+        textarea:focus { outline: none; border-color: #667eea; }
     </style>
 </head>
 <body>
     <div class="header">
         <div style="max-width: 1000px; margin: 0 auto; padding: 0 20px; text-align: center;">
             <h1 style="background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">
-                {test["topic"].title()} Test
+                {{ test["topic"].title() }} Test
             </h1>
         </div>
     </div>
     
     <div class="container">
         <form method="POST">
-            {questions_html}
+            {% for q in test['questions'] %}
+            <div style="background: rgba(255,255,255,0.95); border-radius: 16px; padding: 24px; margin: 20px 0;">
+                <div style="background: linear-gradient(135deg, #667eea, #764ba2); color: white; padding: 8px 16px; border-radius: 20px; display: inline-block; margin-bottom: 16px;">
+                    Question {{ loop.index }} of 15
+                </div>
+                <div style="background: linear-gradient(135deg, #f8fafc, #f1f5f9); padding: 16px; border-radius: 12px; margin-bottom: 20px; border-left: 4px solid #667eea;">
+                    {{ q }}
+                </div>
+                <label style="font-weight: 600; margin-bottom: 8px; display: block;">Your Answer:</label>
+                <textarea name="answer_{{ loop.index0 }}" style="width: 100%; min-height: 120px; padding: 16px; border: 2px solid #e5e7eb; border-radius: 12px; font-size: 14px;" placeholder="Provide detailed technical answer..." required></textarea>
+            </div>
+            {% endfor %}
             <div style="background: rgba(255,255,255,0.95); border-radius: 16px; padding: 24px; text-align: center; margin-top: 20px;">
                 <div style="background: #fef3c7; border: 1px solid #f59e0b; padding: 16px; border-radius: 12px; margin-bottom: 20px; color: #92400e;">
                     ⚠️ Review all answers before submitting. Cannot edit after submission.
@@ -1061,6 +1121,7 @@ def student_test(test_id):
     </div>
 </body>
 </html>'''
+    return inline_templates.render('student_test.html', test_html, test=test)
 
 # Initialize
 init_data()
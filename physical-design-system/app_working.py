@@ -6,21 +6,42 @@ import datetime
 import json
 import re
 import math
-from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify
+from flask import Flask, request, redirect, url_for, flash, jsonify
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import defer, joinedload
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
+from keyset import filter_submissions, keyset_page, parse_bool, parse_limit
+from bulk_assignments import BulkAssignments
+from dashboard_counters import DashboardCounters
+from draft_scoring import DraftOutOfSync, DraftRegistry, DraftStore
+from evaluation_queue import EvaluationQueue
+from health_checks import CachedValue, DatabaseProbe
+from http_cache import HTTPCache, SessionVersions
+from evaluation_cache import evaluation_cache, lexicon_version
+from scoring_engine import ScoringStrategy, engine
+from templating import InlineTemplates
+from static_assets import StaticAssets
+import evaluator  # registers the 'technical' rubric
 
 # Create Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'railway-secret-key-12345')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///physical_design.db'
+# DATABASE_URL points at Postgres for load tests and Railway; SQLite otherwise
+database_url = os.environ.get('DATABASE_URL', 'sqlite:///physical_design.db')
+if database_url.startswith('postgres://'):
+    database_url = 'postgresql://' + database_url[len('postgres://'):]
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SCORING_RUBRIC'] = os.environ.get('SCORING_RUBRIC', 'depth')
 
 # Initialize extensions
 db = SQLAlchemy()
 db.init_app(app)
+inline_templates = InlineTemplates(app)
+static_assets = StaticAssets(app)
+http_cache = HTTPCache(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
@@ -55,12 +76,17 @@ class Assignment(db.Model):
     due_date = db.Column(db.Date, nullable=False)
     points = db.Column(db.Integer, default=100)
     
+    __table_args__ = (
+        db.Index('ix_assignment_engineer_created', 'engineer_id', 'created_date'),
+    )
+    
 class Submission(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     assignment_id = db.Column(db.String(100), nullable=False)
     engineer_id = db.Column(db.Integer, nullable=False)
     answers = db.Column(db.Text, nullable=False)
     submitted_date = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    status = db.Column(db.String(20), default='submitted')
     
     # Technical Evaluation Results
     overall_score = db.Column(db.Float)
@@ -73,6 +99,30 @@ class Submission(db.Model):
     graded_by_admin = db.Column(db.Integer)
     graded_date = db.Column(db.DateTime)
     is_grade_released = db.Column(db.Boolean, default=False)
+    
+    # Indexes match the dashboard query shapes; see migrate_indexes.py
+    __table_args__ = (
+        db.Index('ix_submission_submitted_id', 'submitted_date', 'id'),
+        db.Index('ix_submission_engineer_released', 'engineer_id', 'is_grade_released'),
+        db.Index('ix_submission_assignment_engineer', 'assignment_id', 'engineer_id'),
+        db.Index('ix_submission_ungraded', 'submitted_date',
+                 sqlite_where=db.text('admin_grade IS NULL'),
+                 postgresql_where=db.text('admin_grade IS NULL')),
+    )
+    
+    # The columns carry no foreign keys, so the joins are spelled out for eager loading
+    engineer = db.relationship('User', primaryjoin='foreign(Submission.engineer_id) == User.id', viewonly=True)
+    assignment = db.relationship('Assignment', primaryjoin='foreign(Submission.assignment_id) == Assignment.id', viewonly=True)
+    
+    @property
+    def evaluation(self):
+        """evaluation_results parsed from JSON, or {} if missing or invalid"""
+        if not self.evaluation_results:
+            return {}
+        try:
+            return json.loads(self.evaluation_results)
+        except ValueError:
+            return {}
 
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -81,6 +131,54 @@ class Notification(db.Model):
     message = db.Column(db.Text, nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     created_date = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_notification_user_read_created', 'user_id', 'is_read', 'created_date'),
+    )
+
+def recent_submissions_query():
+    """Newest submissions first, with engineer and assignment joined in one query.
+    
+    The answers column is deferred since listings never show it.
+    """
+    return Submission.query.options(
+        joinedload(Submission.engineer),
+        joinedload(Submission.assignment),
+        defer(Submission.answers)
+    ).order_by(Submission.submitted_date.desc(), Submission.id.desc())
+
+def users_shown(obj):
+    """Users whose own pages display obj"""
+    if isinstance(obj, User):
+        return [obj.id]
+    return [getattr(obj, 'engineer_id', None) or getattr(obj, 'user_id', None)]
+
+# Per-user data versions behind the dashboards' ETags
+data_versions = SessionVersions(app, db, users_shown)
+
+# Dashboard and health counts, kept current by session events instead of COUNT(*) per request;
+# other workers' writes show up within DASHBOARD_RECONCILE_SECONDS
+dashboard_counters = DashboardCounters(app, db)
+dashboard_counters.define('users', User)
+dashboard_counters.define('engineers', User, lambda u: not u.is_admin, User.is_admin.isnot(True))
+dashboard_counters.define('assignments', Assignment)
+dashboard_counters.define('submissions', Submission)
+dashboard_counters.define('pending_grading', Submission,
+                          lambda s: s.admin_grade is None, Submission.admin_grade.is_(None))
+dashboard_counters.define('graded_released', Submission,
+                          lambda s: s.admin_grade is not None and s.is_grade_released is True,
+                          db.and_(Submission.admin_grade.isnot(None), Submission.is_grade_released.is_(True)))
+
+def new_assignment_notification(row):
+    return {
+        'user_id': row['engineer_id'],
+        'title': 'New Assignment',
+        'message': f"{row['title']} is due on {row['due_date'].strftime('%Y-%m-%d')}",
+        'is_read': False,
+        'created_date': row['created_date']
+    }
+
+bulk_assignments = BulkAssignments(Assignment, Notification, new_assignment_notification)
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -206,7 +304,12 @@ PHYSICAL_DESIGN_TOPICS = {
 }
 
 # Technical Evaluation Engine
-class TechnicalEvaluator:
+DEPTH_KEYWORDS = ('analyze', 'optimize', 'implement', 'calculate', 'design', 'evaluate')
+QUANTITY_PATTERN = re.compile(r'\d+(?:\.\d+)?\s*(?:nm|μm|mm|ps|ns|μs|mA|mW|GHz|MHz|Ω|%)')
+
+class TechnicalEvaluator(ScoringStrategy):
+    name = 'depth'
+    
     def __init__(self):
         self.technical_terms = {
             'floorplanning': {
@@ -242,26 +345,33 @@ class TechnicalEvaluator:
             'placement': ['timing optimization', 'congestion management', 'power optimization', 'signal integrity'],
             'routing': ['DRC resolution', 'signal integrity', 'power delivery', 'manufacturability']
         }
+        
+        self.lexicon_version = lexicon_version('app_working', self.technical_terms, self.concept_coverage)
+    
+    def phrases(self, topic, question_index):
+        terms = list(self.technical_terms.get(topic, {}))
+        return terms + list(DEPTH_KEYWORDS)
     
     def evaluate_submission(self, answers, topic):
         """Comprehensive technical evaluation"""
-        if not answers or len(answers) == 0:
+        return engine.evaluate_submission(answers or [], topic, self.name)
+    
+    def summarize(self, question_scores, analyzed_answers, topic):
+        """Roll per-answer scores up into the full evaluation report"""
+        if not question_scores:
             return self._create_empty_evaluation()
         
-        question_scores = []
         all_tech_terms = []
         total_word_count = 0
         
-        for i, answer in enumerate(answers):
-            score_data = self._evaluate_single_answer(answer, topic, i)
-            question_scores.append(score_data)
+        for score_data in question_scores:
             all_tech_terms.extend(score_data['tech_terms_found'])
             total_word_count += score_data['word_count']
         
         # Calculate overall metrics
         avg_score = sum(q['overall_score'] for q in question_scores) / len(question_scores)
         unique_terms = len(set(all_tech_terms))
-        avg_words = total_word_count / len(answers)
+        avg_words = total_word_count / len(analyzed_answers)
         
         # Grade calculation
         grade_letter = self._calculate_grade(avg_score)
@@ -288,8 +398,12 @@ class TechnicalEvaluator:
         }
     
     def _evaluate_single_answer(self, answer, topic, question_index):
-        """Evaluate individual answer"""
-        if not answer or len(answer.strip()) < 20:
+        """Evaluate individual answer, reusing cached results for identical text"""
+        return engine.score_answer(answer, topic, question_index, self.name)
+    
+    def score_answer(self, analyzed, hits, topic, question_index):
+        """Score individual answer"""
+        if analyzed.stripped_length < 20:
             return {
                 'question': question_index + 1,
                 'overall_score': 0,
@@ -298,8 +412,7 @@ class TechnicalEvaluator:
                 'feedback': 'Answer too short or empty'
             }
         
-        answer_lower = answer.lower()
-        word_count = len(answer.split())
+        word_count = analyzed.word_count
         
         # Technical terms scoring (40%)
         terms = self.technical_terms.get(topic, {})
@@ -307,7 +420,7 @@ class TechnicalEvaluator:
         term_score = 0
         
         for term, weight in terms.items():
-            if term.lower() in answer_lower:
+            if term in hits:
                 found_terms.append(term)
                 term_score += weight
         
@@ -315,11 +428,10 @@ class TechnicalEvaluator:
         tech_score = min(100, (term_score / max_possible_terms * 3) * 100)
         
         # Content depth scoring (30%)
-        depth_keywords = ['analyze', 'optimize', 'implement', 'calculate', 'design', 'evaluate']
-        depth_score = min(100, sum(1 for kw in depth_keywords if kw in answer_lower) * 20)
+        depth_score = min(100, sum(1 for kw in DEPTH_KEYWORDS if kw in hits) * 20)
         
         # Quantitative analysis (20%)
-        numbers = len(re.findall(r'\d+(?:\.\d+)?\s*(?:nm|μm|mm|ps|ns|μs|mA|mW|GHz|MHz|Ω|%)', answer))
+        numbers = analyzed.numeric_count(QUANTITY_PATTERN)
         quant_score = min(100, numbers * 25)
         
         # Length and structure (10%)
@@ -368,7 +480,7 @@ class TechnicalEvaluator:
             strengths.append("Comprehensive and detailed explanations")
         if avg_score >= 85:
             strengths.append("Strong understanding of fundamental concepts")
-        if any(q['scores']['quantitative'] >= 80 for q in question_scores):
+        if any(q.get('scores', {}).get('quantitative', 0) >= 80 for q in question_scores):
             strengths.append("Good use of quantitative analysis and specifications")
         
         return strengths[:4]  # Return top 4 strengths
@@ -381,11 +493,11 @@ class TechnicalEvaluator:
         if len(low_scoring_questions) > len(question_scores) * 0.4:
             weaknesses.append("Several answers need more technical depth")
         
-        avg_tech_score = sum(q['scores']['technical_terms'] for q in question_scores) / len(question_scores)
+        avg_tech_score = sum(q.get('scores', {}).get('technical_terms', 0) for q in question_scores) / len(question_scores)
         if avg_tech_score < 60:
             weaknesses.append(f"Limited use of {topic}-specific terminology")
         
-        avg_quant_score = sum(q['scores']['quantitative'] for q in question_scores) / len(question_scores)
+        avg_quant_score = sum(q.get('scores', {}).get('quantitative', 0) for q in question_scores) / len(question_scores)
         if avg_quant_score < 40:
             weaknesses.append("Needs more quantitative analysis and specific examples")
         
@@ -468,6 +580,9 @@ class TechnicalEvaluator:
             'detailed_feedback': 'No submission received. Please complete all questions with detailed technical responses.'
         }
 
+# Rubrics selectable through SCORING_RUBRIC
+engine.register(TechnicalEvaluator.name, TechnicalEvaluator)
+
 # Routes
 @app.route('/')
 def home():
@@ -546,7 +661,7 @@ def login():
     </script>
     </body></html>'''
     
-    return render_template_string(login_html)
+    return inline_templates.render('login.html', login_html)
 
 @app.route('/logout')
 @login_required
@@ -558,24 +673,23 @@ def logout():
 @app.route('/admin')
 @login_required
 @admin_required
+@http_cache.conditional(lambda: data_versions.key(current_user.id, everything=True))
 def admin_dashboard():
     # Calculate comprehensive statistics
-    total_engineers = User.query.filter_by(is_admin=False).count()
-    total_assignments = Assignment.query.count()
-    total_submissions = Submission.query.count()
-    pending_grading = Submission.query.filter(Submission.admin_grade.is_(None)).count()
-    graded_released = Submission.query.filter(
-        Submission.admin_grade.isnot(None),
-        Submission.is_grade_released == True
-    ).count()
+    counts = dashboard_counters.snapshot()
+    total_engineers = counts['engineers']
+    total_assignments = counts['assignments']
+    total_submissions = counts['submissions']
+    pending_grading = counts['pending_grading']
+    graded_released = counts['graded_released']
     
     # Recent activity
-    recent_submissions = Submission.query.order_by(Submission.submitted_date.desc()).limit(5).all()
+    recent_submissions = recent_submissions_query().limit(5).all()
     recent_activities = []
     
     for sub in recent_submissions:
-        user = User.query.get(sub.engineer_id)
-        assignment = Assignment.query.get(sub.assignment_id)
+        user = sub.engineer
+        assignment = sub.assignment
         recent_activities.append({
             'title': 'New Submission',
             'description': f'{user.username if user else "Unknown"} submitted {assignment.title if assignment else "assignment"}',
@@ -585,57 +699,7 @@ def admin_dashboard():
     
     admin_html = '''<!DOCTYPE html>
     <html><head><title>Admin Dashboard - Physical Design System</title>
-    <style>
-    * { margin: 0; padding: 0; box-sizing: border-box; }
-    body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #f8f9fa; }
-    .header { background: linear-gradient(135deg, #2c3e50, #34495e); color: white; padding: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-    .header-content { max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; }
-    .header h1 { font-size: 24px; font-weight: 600; }
-    .user-info { display: flex; align-items: center; gap: 15px; }
-    .user-info span { background: rgba(255,255,255,0.1); padding: 8px 15px; border-radius: 20px; font-size: 14px; }
-    .logout-btn { background: #e74c3c; padding: 8px 16px; border-radius: 6px; text-decoration: none; color: white; font-size: 14px; transition: background 0.3s; }
-    .logout-btn:hover { background: #c0392b; }
-    
-    .container { max-width: 1200px; margin: 0 auto; padding: 30px 20px; }
-    .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(240px, 1fr)); gap: 20px; margin-bottom: 30px; }
-    .stat-card { background: white; padding: 25px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); border-left: 4px solid #3498db; transition: transform 0.2s; }
-    .stat-card:hover { transform: translateY(-2px); }
-    .stat-card.pending { border-left-color: #f39c12; }
-    .stat-card.completed { border-left-color: #27ae60; }
-    .stat-card.engineers { border-left-color: #9b59b6; }
-    .stat-number { font-size: 2.5em; font-weight: 700; color: #2c3e50; margin: 10px 0; }
-    .stat-label { color: #7f8c8d; font-size: 14px; font-weight: 500; }
-    .stat-trend { font-size: 12px; color: #27ae60; margin-top: 5px; }
-    
-    .action-section { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); margin-bottom: 30px; }
-    .section-title { font-size: 20px; font-weight: 600; color: #2c3e50; margin-bottom: 20px; display: flex; align-items: center; }
-    .action-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
-    .action-btn { padding: 15px 20px; border: none; border-radius: 8px; cursor: pointer; text-decoration: none; display: flex; align-items: center; justify-content: center; font-size: 14px; font-weight: 600; transition: all 0.3s; text-align: center; }
-    .btn-primary { background: linear-gradient(135deg, #3498db, #2980b9); color: white; }
-    .btn-primary:hover { transform: translateY(-2px); box-shadow: 0 6px 20px rgba(52, 152, 219, 0.3); }
-    .btn-success { background: linear-gradient(135deg, #27ae60, #229954); color: white; }
-    .btn-success:hover { transform: translateY(-2px); box-shadow: 0 6px 20px rgba(39, 174, 96, 0.3); }
-    .btn-info { background: linear-gradient(135deg, #17a2b8, #138496); color: white; }
-    .btn-info:hover { transform: translateY(-2px); box-shadow: 0 6px 20px rgba(23, 162, 184, 0.3); }
-    
-    .activity-section { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); }
-    .activity-item { padding: 15px; border-left: 3px solid #3498db; margin: 12px 0; background: #f8f9fa; border-radius: 0 8px 8px 0; transition: background 0.3s; }
-    .activity-item:hover { background: #e9ecef; }
-    .activity-title { font-weight: 600; color: #2c3e50; margin-bottom: 4px; }
-    .activity-desc { color: #5a6c7d; font-size: 14px; margin-bottom: 4px; }
-    .activity-time { font-size: 12px; color: #95a5a6; }
-    
-    .quick-stats { display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px; margin: 20px 0; }
-    .quick-stat { text-align: center; padding: 15px; background: #f8f9fa; border-radius: 8px; }
-    .quick-stat-number { font-size: 1.5em; font-weight: 600; color: #3498db; }
-    .quick-stat-label { font-size: 12px; color: #7f8c8d; margin-top: 5px; }
-    
-    @media (max-width: 768px) {
-        .header-content { flex-direction: column; gap: 15px; text-align: center; }
-        .stats-grid, .action-grid { grid-template-columns: 1fr; }
-        .container { padding: 20px 15px; }
-    }
-    </style></head><body>
+    <link rel="stylesheet" href="{{ asset_url('admin_dashboard.css') }}"></head><body>
     
     <div class="header">
     <div class="header-content">
@@ -730,50 +794,10 @@ def admin_dashboard():
     </div>
     </div>
     
-    <script>
-    function createFullAssignments() {
-        if (confirm('🚀 Create comprehensive Physical Design assignments?\\n\\n✅ 15 detailed questions per topic\\n✅ Advanced technical evaluation\\n✅ Professional grading system\\n\\nThis will create the complete assignment system for all engineers.')) {
-            const btn = event.target;
-            btn.disabled = true;
-            btn.textContent = '⏳ Creating...';
-            
-            fetch('/api/create-full-system', {method: 'POST'})
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    alert('✅ ' + data.message);
-                    location.reload();
-                } else {
-                    alert('❌ Error: ' + data.error);
-                    btn.disabled = false;
-                    btn.textContent = '➕ Create Complete Assignment System';
-                }
-            })
-            .catch(error => {
-                alert('❌ Error: ' + error.message);
-                btn.disabled = false;
-                btn.textContent = '➕ Create Complete Assignment System';
-            });
-        }
-    }
-    
-    function viewAnalytics() {
-        window.open('/api/analytics', '_blank');
-    }
-    
-    function generateReport() {
-        if (confirm('Generate comprehensive system report?')) {
-            window.open('/api/report', '_blank');
-        }
-    }
-    
-    function systemHealth() {
-        window.open('/health', '_blank');
-    }
-    </script>
+    <script src="{{ asset_url('admin_dashboard.js') }}"></script>
     </body></html>'''
     
-    return render_template_string(admin_html, 
+    return inline_templates.render('admin_dashboard.html', admin_html, 
                                 total_engineers=total_engineers,
                                 total_assignments=total_assignments,
                                 total_submissions=total_submissions,
@@ -783,6 +807,7 @@ def admin_dashboard():
 
 @app.route('/engineer')
 @login_required
+@http_cache.conditional(lambda: data_versions.key(current_user.id))
 def engineer_dashboard():
     # Get engineer's assignments and submissions
     assignments = Assignment.query.filter_by(engineer_id=current_user.id).all()
@@ -804,63 +829,7 @@ def engineer_dashboard():
     
     engineer_html = '''<!DOCTYPE html>
     <html><head><title>Engineer Dashboard - Physical Design System</title>
-    <style>
-    * { margin: 0; padding: 0; box-sizing: border-box; }
-    body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #f8f9fa; }
-    .header { background: linear-gradient(135deg, #27ae60, #2ecc71); color: white; padding: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-    .header-content { max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; }
-    .user-info { display: flex; align-items: center; gap: 15px; }
-    .user-info span { background: rgba(255,255,255,0.1); padding: 8px 15px; border-radius: 20px; font-size: 14px; }
-    .logout-btn { background: #e74c3c; padding: 8px 16px; border-radius: 6px; text-decoration: none; color: white; font-size: 14px; }
-    
-    .container { max-width: 1200px; margin: 0 auto; padding: 30px 20px; }
-    .progress-section { background: white; padding: 25px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); margin-bottom: 30px; }
-    .progress-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 20px; margin-top: 20px; }
-    .progress-card { text-align: center; padding: 20px; background: #f8f9fa; border-radius: 8px; border-left: 4px solid #27ae60; }
-    .progress-number { font-size: 2em; font-weight: 700; color: #2c3e50; }
-    .progress-label { color: #7f8c8d; font-size: 14px; margin-top: 5px; }
-    
-    .assignments-section { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); }
-    .assignment-card { border-left: 4px solid #3498db; padding: 25px; margin: 20px 0; background: #f8f9fa; border-radius: 8px; transition: all 0.3s; }
-    .assignment-card:hover { box-shadow: 0 4px 15px rgba(0,0,0,0.1); transform: translateY(-2px); }
-    .assignment-card.completed { border-left-color: #27ae60; background: #d4edda; }
-    .assignment-card.graded { border-left-color: #f39c12; background: #fff3cd; }
-    
-    .assignment-header { display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 15px; }
-    .assignment-title { font-size: 18px; font-weight: 600; color: #2c3e50; margin-bottom: 5px; }
-    .assignment-meta { font-size: 14px; color: #5a6c7d; }
-    .assignment-status { padding: 6px 12px; border-radius: 15px; font-size: 12px; font-weight: 600; }
-    .status-pending { background: #3498db; color: white; }
-    .status-submitted { background: #27ae60; color: white; }
-    .status-graded { background: #f39c12; color: white; }
-    .status-released { background: #9b59b6; color: white; }
-    
-    .questions-preview { margin: 15px 0; padding: 15px; background: white; border-radius: 6px; border: 1px solid #e9ecef; }
-    .question-item { margin: 8px 0; padding: 10px; background: #f8f9fa; border-radius: 4px; font-size: 14px; border-left: 3px solid #3498db; }
-    
-    .assignment-actions { margin-top: 15px; display: flex; gap: 10px; flex-wrap: wrap; }
-    .btn { padding: 10px 20px; border: none; border-radius: 6px; cursor: pointer; text-decoration: none; font-size: 14px; font-weight: 600; transition: all 0.3s; display: inline-flex; align-items: center; gap: 8px; }
-    .btn-primary { background: linear-gradient(135deg, #3498db, #2980b9); color: white; }
-    .btn-success { background: linear-gradient(135deg, #27ae60, #229954); color: white; }
-    .btn-info { background: linear-gradient(135deg, #17a2b8, #138496); color: white; }
-    .btn:hover { transform: translateY(-2px); box-shadow: 0 4px 15px rgba(0,0,0,0.2); }
-    
-    .grade-display { margin-top: 15px; padding: 15px; background: white; border-radius: 6px; border-left: 4px solid #9b59b6; }
-    .grade-score { font-size: 24px; font-weight: 700; color: #9b59b6; }
-    .grade-feedback { margin-top: 10px; color: #5a6c7d; font-style: italic; }
-    
-    .no-assignments { text-align: center; padding: 60px 20px; color: #7f8c8d; }
-    .no-assignments h3 { font-size: 24px; margin-bottom: 15px; }
-    
-    .notifications { background: white; padding: 20px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); margin-bottom: 30px; }
-    .notification-item { padding: 12px; margin: 8px 0; background: #e3f2fd; border-left: 4px solid #2196f3; border-radius: 4px; }
-    
-    @media (max-width: 768px) {
-        .header-content { flex-direction: column; gap: 15px; }
-        .assignment-header { flex-direction: column; gap: 10px; }
-        .assignment-actions { justify-content: center; }
-    }
-    </style></head><body>
+    <link rel="stylesheet" href="{{ asset_url('engineer_dashboard.css') }}"></head><body>
     
     <div class="header">
     <div class="header-content">
@@ -1018,22 +987,10 @@ def engineer_dashboard():
     </div>
     </div>
     
-    <script>
-    function viewSubmission(assignmentId) {
-        alert('📝 Submission Viewer\\n\\nThis will show your submitted answers for review.\\n\\nAssignment: ' + assignmentId);
-    }
-    
-    function viewFeedback(assignmentId) {
-        alert('📊 Detailed Feedback\\n\\nThis will show comprehensive technical evaluation including:\\n\\n✅ Technical term analysis\\n✅ Concept coverage assessment\\n✅ Quantitative scoring\\n✅ Study recommendations\\n\\nAssignment: ' + assignmentId);
-    }
-    
-    function previewAssignment(assignmentId) {
-        alert('👁️ Assignment Preview\\n\\nThis will show all questions for review before starting.\\n\\nAssignment: ' + assignmentId);
-    }
-    </script>
+    <script src="{{ asset_url('engineer_dashboard.js') }}"></script>
     </body></html>'''
     
-    return render_template_string(engineer_html, assignments=assignments, notifications=notifications)
+    return inline_templates.render('engineer_dashboard.html', engineer_html, assignments=assignments, notifications=notifications)
 
 # Assignment Interface Route
 @app.route('/assignment/<assignment_id>')
@@ -1058,52 +1015,7 @@ def assignment_interface(assignment_id):
     
     interface_html = '''<!DOCTYPE html>
     <html><head><title>{{ assignment.title }} - Assignment Interface</title>
-    <style>
-    * { margin: 0; padding: 0; box-sizing: border-box; }
-    body { font-family: -apple-system, BlinkMacSystemFont, sans-serif; background: #f8f9fa; line-height: 1.6; }
-    .header { background: linear-gradient(135deg, #3498db, #2980b9); color: white; padding: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-    .header-content { max-width: 1000px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; }
-    .back-btn { background: rgba(255,255,255,0.2); padding: 8px 16px; border-radius: 6px; text-decoration: none; color: white; font-size: 14px; }
-    
-    .container { max-width: 1000px; margin: 0 auto; padding: 30px 20px; }
-    .assignment-info { background: white; padding: 25px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); margin-bottom: 30px; }
-    .info-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-top: 15px; }
-    .info-item { text-align: center; padding: 15px; background: #f8f9fa; border-radius: 8px; }
-    .info-value { font-size: 1.2em; font-weight: 600; color: #2c3e50; }
-    .info-label { font-size: 14px; color: #7f8c8d; margin-top: 5px; }
-    
-    .question-form { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); }
-    .question-block { margin-bottom: 40px; padding: 25px; border: 2px solid #e9ecef; border-radius: 10px; transition: border-color 0.3s; }
-    .question-block:focus-within { border-color: #3498db; }
-    .question-number { background: #3498db; color: white; padding: 8px 15px; border-radius: 20px; font-weight: 600; font-size: 14px; display: inline-block; margin-bottom: 15px; }
-    .question-text { font-size: 16px; color: #2c3e50; margin-bottom: 20px; line-height: 1.8; }
-    .answer-textarea { width: 100%; min-height: 150px; padding: 15px; border: 2px solid #e9ecef; border-radius: 8px; font-size: 14px; line-height: 1.6; resize: vertical; font-family: inherit; }
-    .answer-textarea:focus { border-color: #3498db; outline: none; }
-    .answer-meta { display: flex; justify-content: between; align-items: center; margin-top: 10px; font-size: 12px; color: #7f8c8d; }
-    .word-counter { margin-left: auto; }
-    .word-counter.good { color: #27ae60; }
-    .word-counter.warning { color: #f39c12; }
-    
-    .progress-section { background: white; padding: 20px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); margin-bottom: 30px; position: sticky; top: 20px; z-index: 100; }
-    .progress-bar { background: #e9ecef; height: 8px; border-radius: 4px; overflow: hidden; margin: 10px 0; }
-    .progress-fill { background: linear-gradient(90deg, #3498db, #2980b9); height: 100%; transition: width 0.3s; }
-    .progress-text { text-align: center; font-size: 14px; color: #5a6c7d; }
-    
-    .submit-section { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.07); text-align: center; margin-top: 30px; }
-    .submit-btn { background: linear-gradient(135deg, #27ae60, #229954); color: white; padding: 15px 40px; border: none; border-radius: 8px; font-size: 16px; font-weight: 600; cursor: pointer; transition: all 0.3s; }
-    .submit-btn:hover { transform: translateY(-2px); box-shadow: 0 6px 20px rgba(39, 174, 96, 0.3); }
-    .submit-btn:disabled { background: #95a5a6; cursor: not-allowed; transform: none; box-shadow: none; }
-    
-    .requirements { background: #e8f4fd; padding: 20px; border-radius: 8px; margin-bottom: 20px; border-left: 4px solid #3498db; }
-    .requirement-item { margin: 5px 0; font-size: 14px; color: #2c3e50; }
-    
-    @media (max-width: 768px) {
-        .header-content { flex-direction: column; gap: 15px; }
-        .container { padding: 20px 15px; }
-        .question-block { padding: 20px; }
-        .progress-section { position: relative; }
-    }
-    </style></head><body>
+    <link rel="stylesheet" href="{{ asset_url('assignment_interface.css') }}"></head><body>
     
     <div class="header">
     <div class="header-content">
@@ -1164,12 +1076,13 @@ def assignment_interface(assignment_id):
         class="answer-textarea" 
         placeholder="Enter your detailed technical response here... Include specific examples, calculations, and methodologies."
         data-question="{{ loop.index0 }}"
-        oninput="updateProgress(); updateWordCount(this, {{ loop.index0 }})"
+        oninput="updateProgress(); updateWordCount(this, {{ loop.index0 }}); scheduleDraftSync(this, {{ loop.index0 }})"
         required>
     </textarea>
     
     <div class="answer-meta">
     <span>💡 Include technical terms, quantitative analysis, and specific examples</span>
+    <span class="live-score" id="live-score-{{ loop.index0 }}"></span>
     <span class="word-counter" id="counter-{{ loop.index0 }}">0 words</span>
     </div>
     </div>
@@ -1189,142 +1102,41 @@ def assignment_interface(assignment_id):
     </form>
     </div>
     
-    <script>
-    let completedQuestions = 0;
-    const totalQuestions = {{ questions|length }};
-    
-    function updateWordCount(textarea, questionIndex) {
-        const words = textarea.value.trim().split(/\s+/).filter(word => word.length > 0);
-        const wordCount = words.length;
-        const counter = document.getElementById('counter-' + questionIndex);
-        
-        counter.textContent = wordCount + ' words';
-        
-        if (wordCount >= 50) {
-            counter.className = 'word-counter good';
-        } else if (wordCount >= 25) {
-            counter.className = 'word-counter warning';
-        } else {
-            counter.className = 'word-counter';
-        }
-    }
+    <script>const ASSIGNMENT = {id: {{ assignment.id|tojson }}, totalQuestions: {{ questions|length }}};</script>
+    <script src="{{ asset_url('assignment_interface.js') }}"></script>
+    </body></html>'''
     
-    function updateProgress() {
-        completedQuestions = 0;
-        const textareas = document.querySelectorAll('.answer-textarea');
-        
-        textareas.forEach(textarea => {
-            const words = textarea.value.trim().split(/\s+/).filter(word => word.length > 0);
-            if (words.length >= 25) {
-                completedQuestions++;
-            }
-        });
-        
-        const percentage = (completedQuestions / totalQuestions) * 100;
-        document.getElementById('progress-fill').style.width = percentage + '%';
-        document.getElementById('progress-count').textContent = completedQuestions;
-        
-        const submitBtn = document.getElementById('submit-btn');
-        if (completedQuestions === totalQuestions) {
-            submitBtn.disabled = false;
-            submitBtn.textContent = '🚀 Submit Assignment';
-        } else {
-            submitBtn.disabled = true;
-            submitBtn.textContent = `Complete ${totalQuestions - completedQuestions} more questions to submit`;
-        }
-    }
+    return inline_templates.render('assignment_interface.html', interface_html, assignment=assignment, questions=questions)
+
+def evaluate_submission_job(submission_id):
+    """Evaluate a queued submission: submitted -> evaluating -> evaluated"""
+    submission = Submission.query.get(submission_id)
+    if not submission:
+        return
     
-    document.getElementById('assignment-form').addEventListener('submit', function(e) {
-        e.preventDefault();
-        
-        if (completedQuestions < totalQuestions) {
-            alert('Please complete all questions before submitting.');
-            return;
-        }
-        
-        if (!confirm('🎯 Submit Assignment?\\n\\n✅ All questions completed\\n⚠️ Cannot be modified after submission\\n\\nProceed with submission?')) {
-            return;
-        }
-        
-        const submitBtn = document.getElementById('submit-btn');
-        const statusDiv = document.getElementById('submit-status');
-        
-        submitBtn.disabled = true;
-        submitBtn.textContent = '⏳ Submitting...';
-        statusDiv.innerHTML = '<div style="color: #3498db;">📤 Processing your submission...</div>';
-        
-        // Collect answers
-        const formData = new FormData(this);
-        const answers = [];
+    assignment = Assignment.query.get(submission.assignment_id)
+    submission.status = 'evaluating'
+    db.session.commit()
+    
+    try:
+        evaluation_results = engine.evaluate_submission(
+            json.loads(submission.answers), assignment.topic, app.config['SCORING_RUBRIC']
+        )
         
-        for (let i = 0; i < totalQuestions; i++) {
-            answers.push(formData.get('answer_' + i) || '');
-        }
+        submission.overall_score = evaluation_results['overall_score']
+        submission.grade_letter = evaluation_results['grade_letter']
+        submission.evaluation_results = json.dumps(evaluation_results)
+        submission.status = 'evaluated'
+        db.session.commit()
         
-        // Submit to server
-        fetch('/api/submit-assignment', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                assignment_id: '{{ assignment.id }}',
-                answers: answers
-            })
-        })
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                statusDiv.innerHTML = '<div style="color: #27ae60;">✅ ' + data.message + '</div>';
-                setTimeout(() => {
-                    window.location.href = '/engineer';
-                }, 2000);
-            } else {
-                statusDiv.innerHTML = '<div style="color: #e74c3c;">❌ Error: ' + data.error + '</div>';
-                submitBtn.disabled = false;
-                submitBtn.textContent = '🚀 Submit Assignment';
-            }
-        })
-        .catch(error => {
-            statusDiv.innerHTML = '<div style="color: #e74c3c;">❌ Error: ' + error.message + '</div>';
-            submitBtn.disabled = false;
-            submitBtn.textContent = '🚀 Submit Assignment';
-        });
-    });
-    
-    // Auto-save draft (optional)
-    setInterval(() => {
-        const answers = [];
-        for (let i = 0; i < totalQuestions; i++) {
-            const textarea = document.querySelector(`textarea[data-question="${i}"]`);
-            answers.push(textarea ? textarea.value : '');
-        }
-        localStorage.setItem('assignment_{{ assignment.id }}_draft', JSON.stringify(answers));
-    }, 30000); // Save every 30 seconds
-    
-    // Load draft on page load
-    window.addEventListener('load', () => {
-        const draft = localStorage.getItem('assignment_{{ assignment.id }}_draft');
-        if (draft) {
-            try {
-                const answers = JSON.parse(draft);
-                answers.forEach((answer, index) => {
-                    const textarea = document.querySelector(`textarea[data-question="${index}"]`);
-                    if (textarea && answer) {
-                        textarea.value = answer;
-                        updateWordCount(textarea, index);
-                    }
-                });
-                updateProgress();
-            } catch (e) {
-                console.log('Could not load draft');
-            }
-        }
-    });
-    </script>
-    </body></html>'''
-    
-    return render_template_string(interface_html, assignment=assignment, questions=questions)
+    except Exception:
+        # Continue without evaluation - admin can still grade manually
+        db.session.rollback()
+        submission.status = 'submitted'
+        db.session.commit()
+        raise
+
+evaluation_queue = EvaluationQueue(app, evaluate_submission_job)
 
 # API Routes
 @app.route('/api/create-full-system', methods=['POST'])
@@ -1337,30 +1149,27 @@ def create_full_system():
         if not engineers:
             return jsonify({'error': 'No engineers found. Please create engineer accounts first.'}), 400
         
-        assignments_created = 0
-        
-        for engineer in engineers:
-            for topic, data in PHYSICAL_DESIGN_TOPICS.items():
-                assignment_id = f"PD_{topic.upper()}_{engineer.id}_{datetime.datetime.now().strftime('%Y%m%d')}"
-                
-                # Check if assignment already exists
-                existing = Assignment.query.filter_by(id=assignment_id).first()
-                if existing:
-                    continue
-                
-                assignment = Assignment(
-                    id=assignment_id,
-                    title=data['title'],
-                    topic=topic,
-                    engineer_id=engineer.id,
-                    questions=json.dumps(data['questions']),
-                    due_date=datetime.date.today() + datetime.timedelta(days=14),
-                    points=150  # Higher points for comprehensive assignments
-                )
-                db.session.add(assignment)
-                assignments_created += 1
-        
+        now = datetime.datetime.utcnow()
+        day = datetime.datetime.now().strftime('%Y%m%d')
+        due_date = datetime.date.today() + datetime.timedelta(days=14)
+        questions = {topic: json.dumps(data['questions']) for topic, data in PHYSICAL_DESIGN_TOPICS.items()}
+        rows = [{
+            'id': f"PD_{topic.upper()}_{engineer.id}_{day}",
+            'title': data['title'],
+            'topic': topic,
+            'engineer_id': engineer.id,
+            'questions': questions[topic],
+            'created_date': now,
+            'due_date': due_date,
+            'points': 150  # Higher points for comprehensive assignments
+        } for engineer in engineers for topic, data in PHYSICAL_DESIGN_TOPICS.items()]
+        
+        # Existing ids are skipped; the new rows and their notifications share one transaction
+        created = bulk_assignments.create(db.session, rows)
+        data_versions.bump(db.session, *{row['engineer_id'] for row in created})
+        dashboard_counters.record(db.session, 'assignments', len(created))
         db.session.commit()
+        assignments_created = len(created)
         
         return jsonify({
             'success': True,
@@ -1414,24 +1223,8 @@ def submit_assignment():
         )
         
         db.session.add(submission)
-        db.session.commit()
-        
-        # Perform technical evaluation
-        try:
-            evaluator = TechnicalEvaluator()
-            evaluation_results = evaluator.evaluate_submission(answers, assignment.topic)
-            
-            submission.overall_score = evaluation_results['overall_score']
-            submission.grade_letter = evaluation_results['grade_letter']
-            submission.evaluation_results = json.dumps(evaluation_results)
-            
-            db.session.commit()
-            
-        except Exception as eval_error:
-            print(f"Evaluation error: {eval_error}")
-            # Continue without evaluation - admin can still grade manually
         
-        # Create notification for admin
+        # Notify admins in the same transaction as the submission
         admin_users = User.query.filter_by(is_admin=True).all()
         for admin in admin_users:
             notification = Notification(
@@ -1442,37 +1235,127 @@ def submit_assignment():
             db.session.add(notification)
         
         db.session.commit()
+        draft_sessions.forget((current_user.id, assignment_id))
+        
+        # Technical evaluation runs in the background
+        evaluation_queue.enqueue(submission.id)
         
         return jsonify({
             'success': True,
             'message': 'Assignment submitted successfully! Your instructor will review and grade it.',
             'submission_id': submission.id,
-            'technical_score': submission.overall_score
+            'status': 'queued'
         })
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Submission failed: {str(e)}'}), 500
 
+# Live draft scoring; the texts are in the database so any worker can take the next delta
+draft_sessions = DraftRegistry(maxsize=int(os.environ.get('DRAFT_SESSIONS', 1024)), store=DraftStore(db))
+
+def get_draft_session(assignment):
+    try:
+        questions = json.loads(assignment.questions)
+    except:
+        questions = []
+    return draft_sessions.get(
+        (current_user.id, assignment.id), assignment.topic, len(questions), app.config['SCORING_RUBRIC']
+    )
+
+@app.route('/api/draft/<assignment_id>/delta', methods=['POST'])
+@login_required
+def draft_delta(assignment_id):
+    """Apply one text delta to a draft answer; respond with that answer's new scores"""
+    assignment = Assignment.query.filter_by(id=assignment_id, engineer_id=current_user.id).first()
+    if not assignment:
+        return jsonify({'error': 'Assignment not found or access denied'}), 404
+    
+    data = request.get_json() or {}
+    draft = get_draft_session(assignment)
+    
+    try:
+        question_index = int(data['question_index'])
+        if not 0 <= question_index < len(draft.answers):
+            raise ValueError('question_index out of range')
+        start = None if data.get('start') is None else int(data['start'])
+        end = None if data.get('end') is None else int(data['end'])
+        length = None if data.get('length') is None else int(data['length'])
+        update = draft.apply(question_index, start, end, str(data.get('text', '')), length)
+    except DraftOutOfSync:
+        return jsonify({'error': 'Draft out of sync', 'resync': True}), 409
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid draft delta: {str(e)}'}), 400
+    
+    return jsonify(update)
+
+@app.route('/api/admin/submissions')
+@login_required
+@admin_required
+def api_admin_submissions():
+    """Newest-first submissions, keyset paginated and filtered in the database.
+    
+    Query: topic, engineer (username), grade (letter or 'ungraded'),
+    released (true/false), limit, cursor (from next_cursor) and
+    include_total=true to also run a COUNT over the filtered rows.
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        released = parse_bool(request.args.get('released'))
+        include_total = parse_bool(request.args.get('include_total'))
+        
+        query = filter_submissions(
+            recent_submissions_query(), Submission, Assignment, User,
+            topic=request.args.get('topic'), engineer=request.args.get('engineer'),
+            grade=request.args.get('grade'), released=released
+        )
+        
+        total = query.order_by(None).count() if include_total else None
+        submissions, next_cursor = keyset_page(
+            query, Submission.submitted_date, Submission.id, request.args.get('cursor'), limit
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'submissions': [{
+            'id': sub.id,
+            'assignment_id': sub.assignment_id,
+            'assignment_title': sub.assignment.title if sub.assignment else None,
+            'topic': sub.assignment.topic if sub.assignment else None,
+            'engineer_username': sub.engineer.username if sub.engineer else None,
+            'submitted_date': sub.submitted_date.isoformat(),
+            'status': sub.status,
+            'overall_score': sub.overall_score,
+            'grade_letter': sub.grade_letter,
+            'admin_grade': sub.admin_grade,
+            'is_grade_released': sub.is_grade_released
+        } for sub in submissions],
+        'next_cursor': next_cursor,
+        'total': total
+    })
+
 @app.route('/admin/submissions')
 @login_required
 @admin_required
 def admin_submissions():
-    submissions = Submission.query.order_by(Submission.submitted_date.desc()).all()
-    
-    # Enhanced submission data
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    # Filters run in the query, so they cover every page; the pagination links carry them along
+    filters = {name: request.args[name] for name in ('status', 'topic', 'engineer')
+               if request.args.get(name, 'all') != 'all'}
+    pagination = filter_submissions(recent_submissions_query(), Submission, Assignment, User, **filters).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    engineers = [username for (username,) in
+                 db.session.query(User.username).filter_by(is_admin=False).order_by(User.username)]
+    
+    # Only the rows on this page are built, so only their evaluation JSON is parsed
     submission_data = []
-    for sub in submissions:
-        user = User.query.get(sub.engineer_id)
-        assignment = Assignment.query.get(sub.assignment_id)
-        
-        # Parse evaluation results
-        eval_results = {}
-        if sub.evaluation_results:
-            try:
-                eval_results = json.loads(sub.evaluation_results)
-            except:
-                pass
+    for sub in pagination.items:
+        user = sub.engineer
+        assignment = sub.assignment
+        eval_results = sub.evaluation
         
         submission_data.append({
             'id': sub.id,
@@ -1535,6 +1418,7 @@ def admin_submissions():
     .btn-warning { background: #f39c12; color: white; }
     .btn-info { background: #17a2b8; color: white; }
     
+    .pagination { display: flex; justify-content: center; align-items: center; gap: 15px; padding: 0 20px 20px; color: #7f8c8d; }
     .grade-form { display: none; margin-top: 15px; padding: 15px; background: #f8f9fa; border-radius: 6px; }
     .form-group { margin: 10px 0; }
     .form-group label { display: block; margin-bottom: 5px; font-weight: 600; }
@@ -1561,49 +1445,46 @@ def admin_submissions():
     <div class="container">
     <div class="filters">
     <h3>🔍 Filter Submissions</h3>
-    <div class="filter-grid">
+    <form method="get" action="/admin/submissions" class="filter-grid">
     <div class="filter-group">
     <label>Status:</label>
-    <select id="status-filter" onchange="filterSubmissions()">
+    <select name="status" onchange="this.form.submit()">
     <option value="all">All Submissions</option>
-    <option value="pending">Pending Grading</option>
-    <option value="graded">Graded</option>
-    <option value="released">Released</option>
+    {% for value, label in [('pending', 'Pending Grading'), ('graded', 'Graded'), ('released', 'Released')] %}
+    <option value="{{ value }}"{% if filters.status == value %} selected{% endif %}>{{ label }}</option>
+    {% endfor %}
     </select>
     </div>
     <div class="filter-group">
     <label>Topic:</label>
-    <select id="topic-filter" onchange="filterSubmissions()">
+    <select name="topic" onchange="this.form.submit()">
     <option value="all">All Topics</option>
-    <option value="floorplanning">Floorplanning</option>
-    <option value="placement">Placement</option>
-    <option value="routing">Routing</option>
+    {% for topic in ['floorplanning', 'placement', 'routing'] %}
+    <option value="{{ topic }}"{% if filters.topic == topic %} selected{% endif %}>{{ topic.title() }}</option>
+    {% endfor %}
     </select>
     </div>
     <div class="filter-group">
     <label>Engineer:</label>
-    <select id="engineer-filter" onchange="filterSubmissions()">
+    <select name="engineer" onchange="this.form.submit()">
     <option value="all">All Engineers</option>
-    {% for submission in submissions %}
-    <option value="{{ submission.engineer }}">{{ submission.engineer }}</option>
+    {% for engineer in engineers %}
+    <option value="{{ engineer }}"{% if filters.engineer == engineer %} selected{% endif %}>{{ engineer }}</option>
     {% endfor %}
     </select>
     </div>
-    </div>
+    </form>
     </div>
     
     <div class="submissions-table">
     <div class="table-header">
-    <h2>📝 All Submissions ({{ submissions|length }})</h2>
+    <h2>📝 All Submissions ({{ pagination.total }})</h2>
     <p>Manage technical evaluations, assign grades, and release results to students</p>
     </div>
     
     <div class="submissions-grid" id="submissions-container">
     {% for submission in submissions %}
-    <div class="submission-card {% if not submission.is_graded %}needs-grading{% elif submission.is_released %}released{% else %}graded{% endif %}" 
-         data-status="{% if not submission.is_graded %}pending{% elif submission.is_released %}released{% else %}graded{% endif %}"
-         data-topic="{{ submission.assignment_topic }}"
-         data-engineer="{{ submission.engineer }}">
+    <div class="submission-card {% if not submission.is_graded %}needs-grading{% elif submission.is_released %}released{% else %}graded{% endif %}">
     
     <div class="submission-header">
     <div>
@@ -1699,34 +1580,17 @@ def admin_submissions():
     </div>
     {% endfor %}
     </div>
+    {% if pagination.pages > 1 %}
+    <div class="pagination">
+    {% if pagination.has_prev %}<a href="{{ url_for('admin_submissions', page=pagination.prev_num, **filters) }}" class="btn btn-info">← Newer</a>{% endif %}
+    <span>Page {{ pagination.page }} of {{ pagination.pages }}</span>
+    {% if pagination.has_next %}<a href="{{ url_for('admin_submissions', page=pagination.next_num, **filters) }}" class="btn btn-info">Older →</a>{% endif %}
+    </div>
+    {% endif %}
     </div>
     </div>
     
     <script>
-    function filterSubmissions() {
-        const statusFilter = document.getElementById('status-filter').value;
-        const topicFilter = document.getElementById('topic-filter').value;
-        const engineerFilter = document.getElementById('engineer-filter').value;
-        
-        const cards = document.querySelectorAll('.submission-card');
-        
-        cards.forEach(card => {
-            const status = card.dataset.status;
-            const topic = card.dataset.topic;
-            const engineer = card.dataset.engineer;
-            
-            const statusMatch = statusFilter === 'all' || status === statusFilter;
-            const topicMatch = topicFilter === 'all' || topic === topicFilter;
-            const engineerMatch = engineerFilter === 'all' || engineer === engineerFilter;
-            
-            if (statusMatch && topicMatch && engineerMatch) {
-                card.style.display = 'block';
-            } else {
-                card.style.display = 'none';
-            }
-        });
-    }
-    
     function toggleGradeForm(submissionId) {
         const form = document.getElementById('grade-form-' + submissionId);
         form.style.display = form.style.display === 'block' ? 'none' : 'block';
@@ -1799,7 +1663,7 @@ def admin_submissions():
     </script>
     </body></html>'''
     
-    return render_template_string(submissions_html, submissions=submission_data)
+    return inline_templates.render('admin_submissions.html', submissions_html, submissions=submission_data, engineers=engineers, pagination=pagination, filters=filters)
 
 @app.route('/admin/assignments')
 @login_required
@@ -2011,7 +1875,7 @@ def admin_assignments():
     </script>
     </body></html>'''
     
-    return render_template_string(assignments_html, assignments=assignment_data)
+    return inline_templates.render('admin_assignments.html', assignments_html, assignments=assignment_data)
 
 # Additional API routes for grading
 @app.route('/api/admin/grade-submission', methods=['POST'])
@@ -2088,38 +1952,61 @@ def release_grade_api():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+database_probe = DatabaseProbe(timeout=float(os.environ.get('READINESS_TIMEOUT', 2)))
+health_stats_cache = CachedValue(ttl=float(os.environ.get('HEALTH_STATS_TTL', 10)))
+
+@app.route('/livez')
+def livez():
+    """Liveness: the process is serving requests; touches nothing else"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: the database answers SELECT 1 within READINESS_TIMEOUT seconds"""
+    ready, error = database_probe.check(db.engine)
+    if not ready:
+        return jsonify({'status': 'unavailable', 'error': error}), 503
+    return jsonify({'status': 'ready'})
+
+def build_health_stats():
+    """Comprehensive system statistics for /health/stats"""
+    counts = dashboard_counters.snapshot()
+    total_users = counts['users']
+    total_engineers = counts['engineers']
+    total_assignments = counts['assignments']
+    total_submissions = counts['submissions']
+    pending_grading = counts['pending_grading']
+    
+    return {
+        'status': 'healthy',
+        'timestamp': datetime.datetime.utcnow().isoformat(),
+        'system': 'Physical Design Assignment System - Full Version',
+        'version': '2.0',
+        'evaluation_cache': evaluation_cache.stats(),
+        'statistics': {
+            'total_users': total_users,
+            'engineers': total_engineers,
+            'assignments': total_assignments,
+            'submissions': total_submissions,
+            'pending_grading': pending_grading,
+            'completion_rate': round((total_submissions / max(total_assignments, 1)) * 100, 1)
+        },
+        'features': [
+            'Role-based authentication',
+            'Comprehensive technical evaluation',
+            'Advanced assignment interface',
+            'Admin grading system',
+            'Real-time notifications',
+            'Progress tracking'
+        ]
+    }
+
 @app.route('/health')
+@app.route('/health/stats')
 def health():
+    """Detailed statistics, rebuilt at most every HEALTH_STATS_TTL seconds"""
     try:
-        # Get comprehensive system statistics
-        total_users = User.query.count()
-        total_engineers = User.query.filter_by(is_admin=False).count()
-        total_assignments = Assignment.query.count()
-        total_submissions = Submission.query.count()
-        pending_grading = Submission.query.filter(Submission.admin_grade.is_(None)).count()
-        
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.datetime.utcnow().isoformat(),
-            'system': 'Physical Design Assignment System - Full Version',
-            'version': '2.0',
-            'statistics': {
-                'total_users': total_users,
-                'engineers': total_engineers,
-                'assignments': total_assignments,
-                'submissions': total_submissions,
-                'pending_grading': pending_grading,
-                'completion_rate': round((total_submissions / max(total_assignments, 1)) * 100, 1)
-            },
-            'features': [
-                'Role-based authentication',
-                'Comprehensive technical evaluation',
-                'Advanced assignment interface',
-                'Admin grading system',
-                'Real-time notifications',
-                'Progress tracking'
-            ]
-        })
+        return jsonify(health_stats_cache.get(build_health_stats))
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -2134,6 +2021,12 @@ def init_app():
             print("🚀 Initializing Complete Physical Design System...")
             db.create_all()
             
+            # Databases created before background evaluation lack the status column
+            submission_columns = {column['name'] for column in db.inspect(db.engine).get_columns('submission')}
+            if 'status' not in submission_columns:
+                db.session.execute(db.text("ALTER TABLE submission ADD COLUMN status VARCHAR(20) DEFAULT 'submitted'"))
+                db.session.commit()
+            
             # Create admin if doesn't exist
             if not User.query.filter_by(username='admin').first():
                 print("Creating admin user...")
@@ -0,0 +1,39 @@
+function createFullAssignments() {
+    if (confirm('🚀 Create comprehensive Physical Design assignments?\n\n✅ 15 detailed questions per topic\n✅ Advanced technical evaluation\n✅ Professional grading system\n\nThis will create the complete assignment system for all engineers.')) {
+        const btn = event.target;
+        btn.disabled = true;
+        btn.textContent = '⏳ Creating...';
+
+        fetch('/api/create-full-system', {method: 'POST'})
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                alert('✅ ' + data.message);
+                location.reload();
+            } else {
+                alert('❌ Error: ' + data.error);
+                btn.disabled = false;
+                btn.textContent = '➕ Create Complete Assignment System';
+            }
+        })
+        .catch(error => {
+            alert('❌ Error: ' + error.message);
+            btn.disabled = false;
+            btn.textContent = '➕ Create Complete Assignment System';
+        });
+    }
+}
+
+function viewAnalytics() {
+    window.open('/api/analytics', '_blank');
+}
+
+function generateReport() {
+    if (confirm('Generate comprehensive system report?')) {
+        window.open('/api/report', '_blank');
+    }
+}
+
+function systemHealth() {
+    window.open('/health', '_blank');
+}
@@ -0,0 +1,185 @@
+let completedQuestions = 0;
+const totalQuestions = ASSIGNMENT.totalQuestions;
+
+function updateWordCount(textarea, questionIndex) {
+    const words = textarea.value.trim().split(/\s+/).filter(word => word.length > 0);
+    const wordCount = words.length;
+    const counter = document.getElementById('counter-' + questionIndex);
+
+    counter.textContent = wordCount + ' words';
+
+    if (wordCount >= 50) {
+        counter.className = 'word-counter good';
+    } else if (wordCount >= 25) {
+        counter.className = 'word-counter warning';
+    } else {
+        counter.className = 'word-counter';
+    }
+}
+
+function updateProgress() {
+    completedQuestions = 0;
+    const textareas = document.querySelectorAll('.answer-textarea');
+
+    textareas.forEach(textarea => {
+        const words = textarea.value.trim().split(/\s+/).filter(word => word.length > 0);
+        if (words.length >= 25) {
+            completedQuestions++;
+        }
+    });
+
+    const percentage = (completedQuestions / totalQuestions) * 100;
+    document.getElementById('progress-fill').style.width = percentage + '%';
+    document.getElementById('progress-count').textContent = completedQuestions;
+
+    const submitBtn = document.getElementById('submit-btn');
+    if (completedQuestions === totalQuestions) {
+        submitBtn.disabled = false;
+        submitBtn.textContent = '🚀 Submit Assignment';
+    } else {
+        submitBtn.disabled = true;
+        submitBtn.textContent = `Complete ${totalQuestions - completedQuestions} more questions to submit`;
+    }
+}
+
+document.getElementById('assignment-form').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    if (completedQuestions < totalQuestions) {
+        alert('Please complete all questions before submitting.');
+        return;
+    }
+
+    if (!confirm('🎯 Submit Assignment?\n\n✅ All questions completed\n⚠️ Cannot be modified after submission\n\nProceed with submission?')) {
+        return;
+    }
+
+    const submitBtn = document.getElementById('submit-btn');
+    const statusDiv = document.getElementById('submit-status');
+
+    submitBtn.disabled = true;
+    submitBtn.textContent = '⏳ Submitting...';
+    statusDiv.innerHTML = '<div style="color: #3498db;">📤 Processing your submission...</div>';
+
+    // Collect answers
+    const formData = new FormData(this);
+    const answers = [];
+
+    for (let i = 0; i < totalQuestions; i++) {
+        answers.push(formData.get('answer_' + i) || '');
+    }
+
+    // Submit to server
+    fetch('/api/submit-assignment', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            assignment_id: ASSIGNMENT.id,
+            answers: answers
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            statusDiv.innerHTML = '<div style="color: #27ae60;">✅ ' + data.message + '</div>';
+            setTimeout(() => {
+                window.location.href = '/engineer';
+            }, 2000);
+        } else {
+            statusDiv.innerHTML = '<div style="color: #e74c3c;">❌ Error: ' + data.error + '</div>';
+            submitBtn.disabled = false;
+            submitBtn.textContent = '🚀 Submit Assignment';
+        }
+    })
+    .catch(error => {
+        statusDiv.innerHTML = '<div style="color: #e74c3c;">❌ Error: ' + error.message + '</div>';
+        submitBtn.disabled = false;
+        submitBtn.textContent = '🚀 Submit Assignment';
+    });
+});
+
+// Live scoring: send only the changed region of each answer
+const syncedDrafts = {};
+const draftTimers = {};
+
+function scheduleDraftSync(textarea, questionIndex) {
+    clearTimeout(draftTimers[questionIndex]);
+    draftTimers[questionIndex] = setTimeout(() => syncDraft(textarea, questionIndex), 400);
+}
+
+function syncDraft(textarea, questionIndex, full) {
+    const previous = syncedDrafts[questionIndex] || '';
+    const current = textarea.value;
+    if (current === previous && !full) return;
+
+    let body = { question_index: questionIndex, text: current };
+    if (!full) {
+        // The server counts code points, not UTF-16 units, so emoji keep offsets aligned
+        const before = Array.from(previous);
+        const after = Array.from(current);
+        let prefix = 0;
+        while (prefix < before.length && prefix < after.length && before[prefix] === after[prefix]) prefix++;
+        let suffix = 0;
+        while (suffix < before.length - prefix && suffix < after.length - prefix &&
+               before[before.length - 1 - suffix] === after[after.length - 1 - suffix]) suffix++;
+        body = {
+            question_index: questionIndex,
+            start: prefix,
+            end: before.length - suffix,
+            text: after.slice(prefix, after.length - suffix).join(''),
+            length: before.length
+        };
+    }
+
+    syncedDrafts[questionIndex] = current;
+    fetch('/api/draft/' + ASSIGNMENT.id + '/delta', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    }).then(response => {
+        if (response.status === 409) return syncDraft(textarea, questionIndex, true);
+        if (response.ok) return response.json().then(showLiveScore);
+    });
+}
+
+// Each delta is answered with that question's updated scores
+function showLiveScore(update) {
+    const result = update.result || {};
+    const label = document.getElementById('live-score-' + update.question_index);
+    if (label && update.word_count > 0) {
+        label.textContent = '⚡ Live score: ' + Math.round(result.overall_score || 0) + '%';
+    }
+}
+
+// Auto-save draft (optional)
+setInterval(() => {
+    const answers = [];
+    for (let i = 0; i < totalQuestions; i++) {
+        const textarea = document.querySelector(`textarea[data-question="${i}"]`);
+        answers.push(textarea ? textarea.value : '');
+    }
+    localStorage.setItem('assignment_' + ASSIGNMENT.id + '_draft', JSON.stringify(answers));
+}, 30000); // Save every 30 seconds
+
+// Load draft on page load
+window.addEventListener('load', () => {
+    const draft = localStorage.getItem('assignment_' + ASSIGNMENT.id + '_draft');
+    if (draft) {
+        try {
+            const answers = JSON.parse(draft);
+            answers.forEach((answer, index) => {
+                const textarea = document.querySelector(`textarea[data-question="${index}"]`);
+                if (textarea && answer) {
+                    textarea.value = answer;
+                    updateWordCount(textarea, index);
+                    syncDraft(textarea, index, true);
+                }
+            });
+            updateProgress();
+        } catch (e) {
+            console.log('Could not load draft');
+        }
+    }
+});
@@ -0,0 +1,11 @@
+function viewSubmission(assignmentId) {
+    alert('📝 Submission Viewer\n\nThis will show your submitted answers for review.\n\nAssignment: ' + assignmentId);
+}
+
+function viewFeedback(assignmentId) {
+    alert('📊 Detailed Feedback\n\nThis will show comprehensive technical evaluation including:\n\n✅ Technical term analysis\n✅ Concept coverage assessment\n✅ Quantitative scoring\n✅ Study recommendations\n\nAssignment: ' + assignmentId);
+}
+
+function previewAssignment(assignmentId) {
+    alert('👁️ Assignment Preview\n\nThis will show all questions for review before starting.\n\nAssignment: ' + assignmentId);
+}
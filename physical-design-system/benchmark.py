@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Micro-benchmark every scoring rubric on a synthetic answer corpus.
+
+The corpus is deterministic for a given seed: answers of 20 to 5,000
+words per topic, mixing filler prose with real terms drawn from the
+rubrics' own lexicons, numbers with units and structure markers. Each
+rubric is timed on the uncached scoring path (analysis + match + score),
+which is what evaluate_technical_answer, analyze_answer_quality and
+calculate_auto_score run on an evaluation cache miss.
+
+Reports answers/sec, p50/p99 latency per answer and tracemalloc peak
+bytes per answer, and writes everything as JSON for comparison across
+commits.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --rubrics technical depth --answers 100
+    python benchmark.py --output new.json --compare bench.json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from scoring_engine import AnalyzedAnswer, engine
+
+TOPICS = ('floorplanning', 'placement', 'routing')
+QUESTIONS_PER_TOPIC = 3
+MIN_WORDS = 20
+MAX_WORDS = 5000
+LENGTH_BUCKETS = (50, 200, 1000, MAX_WORDS)
+
+FILLER_WORDS = (
+    'the', 'design', 'we', 'should', 'first', 'then', 'because', 'this', 'block', 'cell',
+    'path', 'check', 'after', 'before', 'each', 'team', 'flow', 'result', 'report', 'value',
+    'critical', 'target', 'constraint', 'margin', 'review', 'improve', 'reduce', 'increase',
+    'deviation', 'spinning', 'structure', 'approach', 'example', 'such', 'as', 'like'
+)
+UNITS = ('nm', 'ps', 'ns', 'mA', 'mW', 'MHz', 'GHz', '%', 'mm')
+
+def _load_root_app():
+    """Import the root app.py (3 Questions Version) without shadowing app.py here"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'app.py')
+    spec = importlib.util.spec_from_file_location('root_app', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Importing each module registers its rubric with the engine
+RUBRIC_MODULES = {
+    'technical': lambda: __import__('evaluator'),
+    'depth': lambda: __import__('app_working'),
+    'answer_quality': lambda: __import__('app'),
+    'keyword_count': _load_root_app
+}
+
+def generate_corpus(topic, count, seed, rubrics, min_words=MIN_WORDS, max_words=MAX_WORDS):
+    """Build a deterministic list of (question_index, answer) pairs for a topic.
+
+    Lengths are log-uniform between min_words and max_words; roughly one
+    word in six is a lexicon term and one in forty a number with a unit.
+    Terms come from the given rubrics, so only compare reports that were
+    run with the same --rubrics.
+    """
+    rng = random.Random(f'{seed}:{topic}')
+    terms = sorted({
+        phrase
+        for name in rubrics
+        for question_index in range(QUESTIONS_PER_TOPIC)
+        for phrase in engine.strategy(name).phrases(topic, question_index)
+    })
+
+    corpus = []
+    for i in range(count):
+        target = int(math.exp(rng.uniform(math.log(min_words), math.log(max_words))))
+        words = []
+        while len(words) < target:
+            roll = rng.random()
+            if roll < 0.16 and terms:
+                words.extend(rng.choice(terms).split())
+            elif roll < 0.185:
+                words.append(f'{rng.randint(1, 900)} {rng.choice(UNITS)}')
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+        if rng.random() < 0.3:
+            words.insert(0, '1.')
+        corpus.append((i % QUESTIONS_PER_TOPIC, ' '.join(words[:target])))
+    return corpus
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _score(answer, topic, question_index, rubric):
+    return engine.score_analyzed(AnalyzedAnswer(answer), topic, question_index, rubric)
+
+def bench_rubric(rubric, topic, corpus, repeat=1):
+    """Time and memory-profile one rubric over a corpus"""
+    # Warm up matchers, stem caches and lazy strategy construction
+    for question_index, answer in corpus[:5]:
+        _score(answer, topic, question_index, rubric)
+
+    latencies = []
+    by_bucket = {bucket: [] for bucket in LENGTH_BUCKETS}
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for question_index, answer in corpus:
+            t0 = time.perf_counter()
+            _score(answer, topic, question_index, rubric)
+            elapsed = time.perf_counter() - t0
+            latencies.append(elapsed)
+            words = len(answer.split())
+            by_bucket[next(bucket for bucket in LENGTH_BUCKETS if words <= bucket)].append(elapsed)
+    total = time.perf_counter() - started
+
+    # Separate pass: tracemalloc slows everything down, so it is not timed
+    peaks = []
+    tracemalloc.start()
+    for question_index, answer in corpus:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _score(answer, topic, question_index, rubric)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    latencies.sort()
+    peaks.sort()
+    return {
+        'answers': len(latencies),
+        'answers_per_sec': round(len(latencies) / total, 1) if total else 0.0,
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 4),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 4),
+        'alloc_peak_bytes_mean': round(sum(peaks) / len(peaks)) if peaks else 0,
+        'alloc_peak_bytes_p99': _percentile(peaks, 0.99),
+        'p50_ms_by_words': {
+            f'<={bucket}': round(_percentile(sorted(values), 0.50) * 1000, 4)
+            for bucket, values in by_bucket.items() if values
+        }
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(rubrics, answers, seed, repeat=1):
+    """Benchmark each rubric on every topic and return the JSON report"""
+    for name in rubrics:
+        RUBRIC_MODULES[name]()
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'rubrics': list(rubrics),
+            'answers_per_topic': answers,
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': {}
+    }
+
+    for topic in TOPICS:
+        corpus = generate_corpus(topic, answers, seed, rubrics)
+        for name in rubrics:
+            result = bench_rubric(name, topic, corpus, repeat)
+            report['results'].setdefault(name, {})[topic] = result
+            print(f"📊 {name:15} {topic:14} {result['answers_per_sec']:>10} answers/s  "
+                  f"p50 {result['p50_ms']:.3f} ms  p99 {result['p99_ms']:.3f} ms  "
+                  f"peak {result['alloc_peak_bytes_mean']} B", file=sys.stderr)
+    return report
+
+def compare(report, baseline):
+    """Print throughput and p99 changes against an earlier report"""
+    for name, topics in report['results'].items():
+        for topic, result in topics.items():
+            previous = baseline.get('results', {}).get(name, {}).get(topic)
+            if not previous:
+                continue
+            throughput = (result['answers_per_sec'] / previous['answers_per_sec'] - 1) * 100
+            p99 = (result['p99_ms'] / previous['p99_ms'] - 1) * 100 if previous['p99_ms'] else 0.0
+            flag = '⚠️' if throughput < -10 or p99 > 10 else '✅'
+            print(f"{flag} {name:15} {topic:14} throughput {throughput:+.1f}%  p99 {p99:+.1f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the scoring rubrics on a synthetic corpus')
+    parser.add_argument('--rubrics', nargs='+', choices=sorted(RUBRIC_MODULES), default=sorted(RUBRIC_MODULES))
+    parser.add_argument('--answers', type=int, default=300, help='answers per topic')
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--repeat', type=int, default=1, help='timed passes over the corpus')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='earlier JSON report to compare against')
+    args = parser.parse_args(argv)
+
+    report = run(args.rubrics, args.answers, args.seed, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Wrote {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# bulk_assignments.py - Set-based creation of many assignments and their notifications
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Ids per IN (...) query, well under SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+def _chunks(items, size=CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+CONFLICT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def _insert_ignoring_conflicts(session, table):
+    dialect_insert = CONFLICT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is None:
+        # Other databases rely on the existing-id check alone
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing()
+
+class BulkAssignments:
+    """Create assignments with one IN query per chunk and bulk INSERTs.
+
+    create() looks up which target ids already exist, inserts the rest
+    with INSERT ... ON CONFLICT DO NOTHING (so a concurrent run cannot
+    fail the batch), and inserts a notification for each row that was
+    actually created, all on the caller's transaction. Nothing is
+    committed here.
+
+    These are Core statements, so ORM flush events do not see them:
+    callers account for the new rows themselves (data versions,
+    dashboard counters).
+    """
+
+    def __init__(self, assignment_model, notification_model=None, notification_for=None):
+        self.assignments = assignment_model.__table__
+        self.notifications = notification_model.__table__ if notification_model is not None else None
+        self.notification_for = notification_for
+
+    def existing_ids(self, session, ids):
+        found = set()
+        for chunk in _chunks(list(ids)):
+            found.update(session.scalars(select(self.assignments.c.id).where(self.assignments.c.id.in_(chunk))))
+        return found
+
+    def create(self, session, rows):
+        """Insert the rows (dicts of assignment columns) whose id is new; return the inserted rows"""
+        rows = list({row['id']: row for row in rows}.values())
+        existing = self.existing_ids(session, [row['id'] for row in rows])
+        missing = [row for row in rows if row['id'] not in existing]
+        if not missing:
+            return []
+
+        statement = _insert_ignoring_conflicts(session, self.assignments).returning(self.assignments.c.id)
+        inserted_ids = set(session.execute(statement, missing).scalars())
+        inserted = [row for row in missing if row['id'] in inserted_ids]
+
+        if inserted and self.notifications is not None and self.notification_for is not None:
+            session.execute(insert(self.notifications), [self.notification_for(row) for row in inserted])
+        return inserted
@@ -0,0 +1,165 @@
+# cohort_analytics.py - Vectorized NumPy scoring for batches of answers
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the scalar evaluator always works
+    np = None
+
+from evaluator import GRADE_CUTOFFS, METHODOLOGY_KEYWORDS, NUMERICAL_PATTERN, TOOL_KEYWORDS, get_evaluator
+from scoring_engine import AnalyzedAnswer
+
+HAS_NUMPY = np is not None
+
+class TopicVectors:
+    """Weight vectors and concept incidence for one topic's phrase table.
+
+    Columns follow the order of the topic matcher's phrases, so a hit on
+    phrase j contributes term_weights[j], methodology[j] and tools[j] and
+    marks every concept in concept_incidence[j].
+    """
+
+    def __init__(self, lexicon):
+        phrases = lexicon.matcher.phrases
+        column = {phrase: j for j, phrase in enumerate(phrases)}
+        weights = dict(lexicon.term_weights)
+
+        self.matcher = lexicon.matcher
+        self.phrases = phrases
+        self.column = column
+        self.max_term_score = lexicon.max_term_score
+        self.term_weights = np.array([weights.get(phrase, 0) for phrase in phrases], dtype=float)
+        self.methodology = np.array([phrase in METHODOLOGY_KEYWORDS for phrase in phrases], dtype=float)
+        self.tools = np.array([phrase in TOOL_KEYWORDS for phrase in phrases], dtype=float)
+        self.concept_labels = [label for label, _ in lexicon.concepts]
+        self.concept_incidence = np.array(
+            [[phrase in keywords for _, keywords in lexicon.concepts] for phrase in phrases],
+            dtype=np.int32
+        ).reshape(len(phrases), len(lexicon.concepts))
+        self.terms = [term for term, _ in lexicon.term_weights]
+
+_topic_vectors = {}
+
+def _vectors_for(topic):
+    if not HAS_NUMPY:
+        raise RuntimeError('NumPy is not installed; use evaluator.evaluate_batch instead')
+    vectors = _topic_vectors.get(topic)
+    if vectors is None:
+        evaluator = get_evaluator()
+        vectors = TopicVectors(evaluator.lexicons.get(topic, evaluator.default_lexicon))
+        _topic_vectors[topic] = vectors
+    return vectors
+
+def hit_matrix(answers: List[str], topic: str):
+    """Match a batch of answers once and return the sparse hit coordinates.
+
+    Returns (rows, cols, valid, word_counts, numeric_counts): rows/cols are
+    the (answer, phrase) pairs that matched, valid flags answers long
+    enough to be scored.
+    """
+    vectors = _vectors_for(topic)
+    column = vectors.column
+
+    rows, cols = [], []
+    valid = np.zeros(len(answers), dtype=bool)
+    word_counts = np.zeros(len(answers), dtype=float)
+    numeric_counts = np.zeros(len(answers), dtype=float)
+
+    for i, answer in enumerate(answers):
+        analyzed = AnalyzedAnswer(answer)
+        if analyzed.stripped_length < 20:
+            continue
+        valid[i] = True
+        word_counts[i] = analyzed.word_count
+        numeric_counts[i] = analyzed.numeric_count(NUMERICAL_PATTERN)
+        for phrase in vectors.matcher.find(analyzed):
+            rows.append(i)
+            cols.append(column[phrase])
+
+    return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp), valid, word_counts, numeric_counts
+
+def score_answers(answers: List[str], topic: str) -> Dict:
+    """Score a batch of answers with sparse matrix-vector products.
+
+    Mirrors TechnicalEvaluator.score_answer: the per-answer scores agree
+    with the scalar path to floating point rounding.
+    """
+    vectors = _vectors_for(topic)
+    rows, cols, valid, word_counts, numeric_counts = hit_matrix(answers, topic)
+    n = len(answers)
+
+    # H @ w for each weight vector, with H held as (rows, cols) coordinates
+    term_score = np.bincount(rows, weights=vectors.term_weights[cols], minlength=n)
+    methodology_count = np.bincount(rows, weights=vectors.methodology[cols], minlength=n)
+    tool_mentions = np.bincount(rows, weights=vectors.tools[cols], minlength=n)
+
+    concept_hits = np.zeros((n, vectors.concept_incidence.shape[1]), dtype=np.int32)
+    np.add.at(concept_hits, rows, vectors.concept_incidence[cols])
+    covered = concept_hits > 0
+
+    tech_score = np.minimum(100, term_score / vectors.max_term_score * 100)
+    n_concepts = covered.shape[1]
+    concept_score = covered.sum(axis=1) / n_concepts * 100 if n_concepts else np.zeros(n)
+    methodology_score = np.minimum(100, methodology_count / 3 * 100)
+    length_score = np.minimum(100, word_counts / 150 * 100)
+    practical_score = np.minimum(100, tool_mentions * 20 + numeric_counts * 15 + length_score * 0.5)
+
+    overall = (
+        tech_score * 0.40 +
+        concept_score * 0.30 +
+        methodology_score * 0.20 +
+        practical_score * 0.10
+    )
+    overall = np.where(valid, overall, 0.0)
+
+    return {
+        'technical': np.where(valid, tech_score, 0.0),
+        'concept': np.where(valid, concept_score, 0.0),
+        'methodology': np.where(valid, methodology_score, 0.0),
+        'practical': np.where(valid, practical_score, 0.0),
+        'overall': overall,
+        'grade': grade_letters(overall),
+        'valid': valid,
+        'covered_concepts': covered,
+        'hits': (rows, cols)
+    }
+
+def grade_letters(scores):
+    """Vectorized TechnicalEvaluator._calculate_grade"""
+    cutoffs = np.array([cutoff for cutoff, _ in reversed(GRADE_CUTOFFS)], dtype=float)
+    letters = np.array(['F'] + [grade for _, grade in reversed(GRADE_CUTOFFS)])
+    return letters[np.searchsorted(cutoffs, scores, side='right')]
+
+def cohort_aggregates(answers: List[str], topic: str) -> Dict:
+    """Score a cohort's answers and summarize them in one pass.
+
+    term_frequency counts answers using each technical term and
+    concept_gaps counts scored answers missing each concept, matching the
+    term_counts / missing_counts tallies of evaluate_technical_submission.
+    """
+    vectors = _vectors_for(topic)
+    scores = score_answers(answers, topic)
+    rows, cols = scores['hits']
+    valid = scores['valid']
+
+    answers_per_phrase = np.bincount(cols, minlength=len(vectors.phrases))
+    term_frequency = {
+        term: int(answers_per_phrase[vectors.column[term]]) if term in vectors.column else 0
+        for term in vectors.terms
+    }
+    missing = (~scores['covered_concepts'] & valid[:, None]).sum(axis=0)
+    concept_gaps = {label: int(count) for label, count in zip(vectors.concept_labels, missing)}
+
+    grades, grade_counts = np.unique(scores['grade'], return_counts=True)
+    overall = scores['overall']
+
+    return {
+        'answers': len(answers),
+        'scored_answers': int(valid.sum()),
+        'mean_score': float(overall.mean()) if len(answers) else 0.0,
+        'median_score': float(np.median(overall)) if len(answers) else 0.0,
+        'p90_score': float(np.percentile(overall, 90)) if len(answers) else 0.0,
+        'grade_distribution': {str(grade): int(count) for grade, count in zip(grades, grade_counts)},
+        'term_frequency': term_frequency,
+        'concept_gaps': concept_gaps
+    }
@@ -0,0 +1,114 @@
+# dashboard_counters.py - In-memory dashboard counts kept current by session events
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import event, func, inspect, select
+
+_PENDING_KEY = 'dashboard_counter_deltas'
+
+class _Previous:
+    """Read an instance's column values as they were before the pending flush"""
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._state = inspect(obj)
+
+    def __getattr__(self, key):
+        history = self._state.attrs[key].history
+        if history.deleted:
+            return history.deleted[0]
+        return getattr(self._obj, key)
+
+class DashboardCounters:
+    """Row counts for the admin dashboard and health stats without COUNT(*) per request.
+
+    Each counter is a model plus an optional predicate (evaluated on
+    instances) and the equivalent SQL criterion (used to reconcile). Flushed
+    inserts, updates and deletes are turned into deltas that are applied
+    when the transaction commits and dropped if it rolls back.
+
+    Reads are in-memory. Changes made outside this process's ORM session
+    (other worker processes, bulk updates, raw SQL) are not seen as
+    deltas; instead a full recount runs on the first read after
+    reconcile_interval seconds (DASHBOARD_RECONCILE_SECONDS, default 10),
+    which bounds how stale a multi-worker count can be.
+    """
+
+    def __init__(self, app=None, db=None, reconcile_interval=None):
+        self.db = None
+        self.reconcile_interval = reconcile_interval
+        self.counters = {}
+        self.values = Counter()
+        self.reconciled_at = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.db = db
+        if self.reconcile_interval is None:
+            self.reconcile_interval = app.config.get('DASHBOARD_RECONCILE_SECONDS', 10)
+
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_soft_rollback', self._after_rollback)
+
+        app.extensions['dashboard_counters'] = self
+
+    def define(self, name, model, predicate=None, criterion=None):
+        """Count rows of model, optionally only those matching predicate/criterion"""
+        self.counters[name] = (model, predicate, criterion)
+
+    def _matches(self, predicate, obj):
+        return 1 if predicate is None or predicate(obj) else 0
+
+    def _after_flush(self, session, flush_context):
+        deltas = session.info.setdefault(_PENDING_KEY, Counter())
+        for name, (model, predicate, criterion) in self.counters.items():
+            for obj in session.new:
+                if isinstance(obj, model):
+                    deltas[name] += self._matches(predicate, obj)
+            for obj in session.deleted:
+                if isinstance(obj, model):
+                    deltas[name] -= self._matches(predicate, _Previous(obj))
+            if predicate is None:
+                continue
+            for obj in session.dirty:
+                if isinstance(obj, model) and session.is_modified(obj):
+                    deltas[name] += self._matches(predicate, obj) - self._matches(predicate, _Previous(obj))
+
+    def record(self, session, name, delta):
+        """Count rows written without a flush (Core statements) once session commits"""
+        session.info.setdefault(_PENDING_KEY, Counter())[name] += delta
+
+    def _after_commit(self, session):
+        deltas = session.info.pop(_PENDING_KEY, None)
+        if deltas:
+            with self._lock:
+                self.values.update(deltas)
+
+    def _after_rollback(self, session, previous_transaction):
+        session.info.pop(_PENDING_KEY, None)
+
+    def reconcile(self):
+        """Recount every counter from the database (needs an app context)"""
+        values = Counter()
+        # A separate connection, so the caller's pending session work is neither counted nor disturbed
+        with self.db.engine.connect() as connection:
+            for name, (model, predicate, criterion) in self.counters.items():
+                statement = select(func.count()).select_from(model)
+                if criterion is not None:
+                    statement = statement.where(criterion)
+                values[name] = connection.execute(statement).scalar()
+
+        with self._lock:
+            self.values = values
+            self.reconciled_at = time.monotonic()
+
+    def snapshot(self):
+        """Current counts as a dict, reconciling first if they are stale"""
+        if self.reconciled_at is None or time.monotonic() - self.reconciled_at > self.reconcile_interval:
+            self.reconcile()
+        with self._lock:
+            return {name: self.values[name] for name in self.counters}
@@ -0,0 +1,285 @@
+# draft_scoring.py - Live scoring of assignment answers while they are typed
+import threading
+from collections import Counter
+
+try:
+    from sqlalchemy import Column, Integer, String, Table, Text, insert, select, update
+    from sqlalchemy.exc import IntegrityError
+except ImportError:  # only DraftStore needs it; sessions alone work in one process
+    Table = None
+
+from evaluation_cache import LRUCache
+from scoring_engine import TERM_TOKEN_PATTERN, AnalyzedAnswer, engine, stem
+
+def _ngrams(stems, max_length):
+    """Space-joined stemmed n-grams of every size up to max_length"""
+    grams = list(stems)
+    for size in range(2, max_length + 1):
+        grams.extend(map(' '.join, zip(*(stems[i:] for i in range(size)))))
+    return grams
+
+def _edit_window(text, start, end, context):
+    """Widen [start, end) to whole words plus `context` term tokens per side.
+
+    The window always begins and ends at whitespace (or the ends of the
+    text), so tokens, words and numbers-with-unit never straddle it, and
+    any n-gram touching the edit lies entirely inside it.
+    """
+    lo = start
+    while lo > 0 and not text[lo - 1].isspace():
+        lo -= 1
+    seen = 0
+    while lo > 0 and seen < context:
+        word_end = lo
+        while word_end > 0 and text[word_end - 1].isspace():
+            word_end -= 1
+        lo = word_end
+        while lo > 0 and not text[lo - 1].isspace():
+            lo -= 1
+        seen += len(TERM_TOKEN_PATTERN.findall(text, lo, word_end))
+
+    n = len(text)
+    hi = end
+    while hi < n and not text[hi].isspace():
+        hi += 1
+    seen = 0
+    while hi < n and seen < context:
+        word_start = hi
+        while word_start < n and text[word_start].isspace():
+            word_start += 1
+        hi = word_start
+        while hi < n and not text[hi].isspace():
+            hi += 1
+        seen += len(TERM_TOKEN_PATTERN.findall(text, word_start, hi))
+
+    return lo, hi
+
+class DraftAnswer(AnalyzedAnswer):
+    """An AnalyzedAnswer that is edited in place as the engineer types.
+
+    The term index is a Counter of stemmed n-grams, so an edit retracts the
+    n-grams of the window around it and adds the window's new ones instead
+    of re-tokenizing the whole answer. Word and numeric counts are adjusted
+    the same way; everything else is recomputed lazily on demand.
+    """
+
+    __slots__ = ('_numeric_counts',)
+
+    def __init__(self, answer=''):
+        super().__init__(answer)
+        self._numeric_counts = {}
+
+    def term_index(self, max_length):
+        if self._index is None or self._index_length < max_length:
+            stems = list(map(stem, TERM_TOKEN_PATTERN.findall(self.lower)))
+            self._index = Counter(_ngrams(stems, max_length))
+            self._index_length = max_length
+        return self._index
+
+    def numeric_count(self, pattern):
+        count = self._numeric_counts.get(pattern)
+        if count is None:
+            count = self._numeric_counts[pattern] = len(pattern.findall(self.text))
+        return count
+
+    def numeric_spans(self, pattern):
+        return [match.span() for match in pattern.finditer(self.text)]
+
+    def apply_edit(self, start, end, replacement):
+        """Replace text[start:end] with replacement and update the analysis"""
+        text = self.text
+        if not 0 <= start <= end <= len(text):
+            raise ValueError('Edit range outside the current draft')
+
+        new_text = text[:start] + replacement + text[end:]
+        replacement_lower = replacement.lower()
+        if len(self.lower) != len(text) or len(replacement_lower) != len(replacement):
+            # Lowercasing changed some lengths; offsets no longer line up
+            self.__init__(new_text)
+            return
+
+        lo, hi = _edit_window(text, start, end, max(1, self._index_length))
+        new_hi = hi + len(replacement) - (end - start)
+        new_lower = self.lower[:start] + replacement_lower + self.lower[end:]
+
+        if self._index is not None:
+            old_stems = map(stem, TERM_TOKEN_PATTERN.findall(self.lower, lo, hi))
+            new_stems = map(stem, TERM_TOKEN_PATTERN.findall(new_lower, lo, new_hi))
+            self._index.subtract(_ngrams(list(old_stems), self._index_length))
+            self._index.update(_ngrams(list(new_stems), self._index_length))
+            for gram in [gram for gram, count in self._index.items() if count <= 0]:
+                del self._index[gram]
+
+        self.word_count += len(new_text[lo:new_hi].split()) - len(text[lo:hi].split())
+        for pattern in self._numeric_counts:
+            self._numeric_counts[pattern] += (
+                len(pattern.findall(new_text, lo, new_hi)) - len(pattern.findall(text, lo, hi))
+            )
+
+        self.text = new_text
+        self.lower = new_lower
+        self.stripped_length = len(new_text.strip())
+        self._offsets = None
+        self._numeric = {}
+        self._markers = None
+        self._stems = None
+
+class DraftStore:
+    """Draft texts in a draft_answers table, so every worker sees the latest text.
+
+    Each answer carries a revision that is bumped by every saved edit. A
+    worker whose in-memory analysis is at an older revision reloads the
+    text before applying the next delta, and a save only succeeds from the
+    revision it was based on, so two workers cannot both apply an edit to
+    the same text. Writes are Core statements on their own connection:
+    they neither join the request's transaction nor trigger its flush
+    events.
+    """
+
+    def __init__(self, db):
+        if Table is None:
+            raise RuntimeError('DraftStore needs SQLAlchemy: pip install Flask-SQLAlchemy')
+        self.db = db
+        self.table = Table(
+            'draft_answers', db.metadata,
+            Column('owner', String(200), primary_key=True),
+            Column('question_index', Integer, primary_key=True),
+            Column('text', Text, nullable=False),
+            Column('revision', Integer, nullable=False),
+            extend_existing=True
+        )
+
+    @staticmethod
+    def _owner(key):
+        return ':'.join(map(str, key))
+
+    def load(self, key, question_index):
+        """(text, revision) of one answer; ('', 0) before its first edit"""
+        table = self.table
+        with self.db.engine.connect() as connection:
+            row = connection.execute(
+                select(table.c.text, table.c.revision)
+                .where(table.c.owner == self._owner(key), table.c.question_index == question_index)
+            ).first()
+        return (row.text, row.revision) if row else ('', 0)
+
+    def save(self, key, question_index, text, revision):
+        """Store text as the revision after `revision`; False if another worker got there first"""
+        table = self.table
+        owner = self._owner(key)
+        with self.db.engine.begin() as connection:
+            if revision == 0:
+                try:
+                    connection.execute(insert(table).values(
+                        owner=owner, question_index=question_index, text=text, revision=1
+                    ))
+                except IntegrityError:
+                    return False
+                return True
+            result = connection.execute(
+                update(table)
+                .where(table.c.owner == owner, table.c.question_index == question_index,
+                       table.c.revision == revision)
+                .values(text=text, revision=revision + 1)
+            )
+            return result.rowcount == 1
+
+    def forget(self, key):
+        """Drop every answer of a draft, e.g. once it has been submitted"""
+        with self.db.engine.begin() as connection:
+            connection.execute(self.table.delete().where(self.table.c.owner == self._owner(key)))
+
+class DraftSession:
+    """Live scores for one engineer's in-progress assignment.
+
+    With a DraftStore the texts are shared by every worker and this
+    session is only a cache of their analysis, checked against the stored
+    revision on each edit.
+    """
+
+    def __init__(self, topic, question_count, rubric, store=None, key=None):
+        self.topic = topic
+        self.rubric = rubric
+        self.store = store
+        self.key = key
+        self.answers = [DraftAnswer() for _ in range(question_count)]
+        self.revisions = [0] * question_count
+        self.results = [engine.score_analyzed(answer, topic, i, rubric) for i, answer in enumerate(self.answers)]
+        self.lock = threading.Lock()
+
+    def _refresh(self, question_index):
+        """Reload an answer another worker edited since this one last saw it"""
+        text, revision = self.store.load(self.key, question_index)
+        if revision != self.revisions[question_index]:
+            self.answers[question_index] = DraftAnswer(text)
+            self.revisions[question_index] = revision
+
+    def apply(self, question_index, start, end, text, length=None):
+        """Apply one client edit and return the updated scores.
+
+        start/end of None replaces the whole answer. length is the size of
+        the draft the client edited; a mismatch raises DraftOutOfSync so the
+        client can resend its full text. Offsets count code points.
+        """
+        with self.lock:
+            if self.store is not None:
+                self._refresh(question_index)
+            answer = self.answers[question_index]
+            if start is None:
+                start, end = 0, len(answer.text)
+            elif length is not None and length != len(answer.text):
+                raise DraftOutOfSync(question_index)
+            answer.apply_edit(start, end, text)
+
+            if self.store is not None:
+                revision = self.revisions[question_index]
+                if not self.store.save(self.key, question_index, answer.text, revision):
+                    self.revisions[question_index] = -1  # reload on the next edit
+                    raise DraftOutOfSync(question_index)
+                self.revisions[question_index] = revision + 1
+
+            self.results[question_index] = engine.score_analyzed(answer, self.topic, question_index, self.rubric)
+            return self._update(question_index)
+
+    def _update(self, question_index):
+        summary = engine.strategy(self.rubric).summarize(self.results, self.answers, self.topic)
+        return {
+            'question_index': question_index,
+            'word_count': self.answers[question_index].word_count,
+            'result': self.results[question_index],
+            'overall_score': summary.get('overall_score'),
+            'grade_letter': summary.get('grade_letter'),
+            'summary': summary.get('summary', {})
+        }
+
+class DraftOutOfSync(Exception):
+    """The client's view of a draft no longer matches the server's"""
+
+class DraftRegistry:
+    """Per-process DraftSessions, evicting the least recently used.
+
+    Given a DraftStore, the draft texts live in the database and any
+    worker can take the next delta: a worker without the session, or with
+    an older revision, loads the stored text once and carries on
+    incrementally. Without one, drafts exist only in this process.
+    """
+
+    def __init__(self, maxsize=1024, store=None):
+        self.sessions = LRUCache(maxsize)
+        self.store = store
+        self._lock = threading.Lock()
+
+    def get(self, key, topic, question_count, rubric):
+        session = self.sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self.sessions.get(key)
+                if session is None:
+                    session = DraftSession(topic, question_count, rubric, self.store, key)
+                    self.sessions.set(key, session)
+        return session
+
+    def forget(self, key):
+        self.sessions.pop(key)
+        if self.store is not None:
+            self.store.forget(key)
@@ -0,0 +1,159 @@
+# evaluation_cache.py - Memoized answer evaluations keyed by content hash
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+def lexicon_version(*tables):
+    """Fingerprint scoring tables so any lexicon edit yields a new cache key"""
+    payload = json.dumps(tables, sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def answer_digest(answer):
+    """SHA-256 of the normalized answer text.
+
+    Only normalization that cannot change a score is applied: surrounding
+    whitespace is trimmed and line endings are unified.
+    """
+    normalized = (answer or '').strip().replace('\r\n', '\n')
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize
+        }
+
+class EvaluationCache:
+    """Two-tier cache of per-answer evaluation results.
+
+    Keys are (topic, question index, lexicon version, answer digest), so a
+    change to a scorer's lexicon invalidates its entries without an explicit
+    flush. The optional SQLite tier keeps results across restarts and is
+    shared by every worker on the host. Cached results are shared objects
+    and must not be mutated by callers.
+    """
+
+    def __init__(self, maxsize=4096, sqlite_path=None):
+        self.memory = LRUCache(maxsize)
+        self.disk_hits = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS evaluation_cache (cache_key TEXT PRIMARY KEY, result TEXT NOT NULL)'
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            maxsize=int(os.environ.get('EVALUATION_CACHE_SIZE', 4096)),
+            sqlite_path=os.environ.get('EVALUATION_CACHE_PATH')
+        )
+
+    @staticmethod
+    def make_key(topic, question_index, version, answer):
+        return (topic, question_index, version, answer_digest(answer))
+
+    def get_or_compute(self, topic, question_index, version, answer, compute):
+        """Return the cached result for this answer, computing it on a miss"""
+        key = self.make_key(topic, question_index, version, answer)
+        result = self.memory.get(key, _MISSING)
+        if result is not _MISSING:
+            return result
+
+        result = self._disk_get(key)
+        if result is _MISSING:
+            result = compute()
+            self._disk_set(key, result)
+        self.memory.set(key, result)
+        return result
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return _MISSING
+        with self._db_lock:
+            row = self._db.execute(
+                'SELECT result FROM evaluation_cache WHERE cache_key = ?', ('|'.join(map(str, key)),)
+            ).fetchone()
+        if row is None:
+            return _MISSING
+        self.disk_hits += 1
+        return json.loads(row[0])
+
+    def _disk_set(self, key, result):
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO evaluation_cache (cache_key, result) VALUES (?, ?)',
+                ('|'.join(map(str, key)), json.dumps(result))
+            )
+            self._db.commit()
+
+    def clear(self):
+        self.memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute('DELETE FROM evaluation_cache')
+                self._db.commit()
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats['disk_hits'] = self.disk_hits
+        stats['disk_enabled'] = self._db is not None
+        return stats
+
+# Shared by every scorer in the process; keys never collide across scorers
+# because each one contributes its own lexicon version.
+evaluation_cache = EvaluationCache.from_env()
@@ -0,0 +1,79 @@
+# evaluation_queue.py - Background technical evaluation for submissions
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class ThreadPoolBackend:
+    """Run evaluation jobs on an in-process thread pool (default backend)"""
+
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='evaluation')
+
+    def submit(self, fn, *args):
+        self.executor.submit(fn, *args)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+class InlineBackend:
+    """Run evaluation jobs synchronously in the calling thread"""
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+    def shutdown(self, wait=True):
+        pass
+
+# Local backends selectable through EVALUATION_QUEUE_BACKEND
+BACKENDS = {
+    'thread': ThreadPoolBackend,
+    'inline': InlineBackend
+}
+
+def register_backend(name, factory):
+    """Make another local backend selectable by name"""
+    BACKENDS[name] = factory
+
+class EvaluationQueue:
+    """Queue that evaluates submissions outside the submit request.
+
+    The handler receives a submission id and runs inside an app context,
+    so it can use the Flask-SQLAlchemy session like a request would.
+    """
+
+    def __init__(self, app=None, handler=None, backend=None):
+        self.app = None
+        self.handler = None
+        self.backend = backend
+        if app is not None:
+            self.init_app(app, handler)
+
+    def init_app(self, app, handler):
+        self.app = app
+        self.handler = handler
+
+        if self.backend is None:
+            name = app.config.get('EVALUATION_QUEUE_BACKEND', 'thread')
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown evaluation queue backend: {name}")
+            self.backend = BACKENDS[name](max_workers=app.config.get('EVALUATION_QUEUE_WORKERS', 4))
+
+        app.extensions['evaluation_queue'] = self
+
+    def enqueue(self, submission_id):
+        """Schedule evaluation of a committed submission"""
+        self.backend.submit(self._run, submission_id)
+
+    def _run(self, submission_id):
+        with self.app.app_context():
+            try:
+                self.handler(submission_id)
+            except Exception:
+                logger.exception('Evaluation failed for submission %s', submission_id)
+
+    def shutdown(self, wait=True):
+        self.backend.shutdown(wait=wait)
@@ -1,10 +1,37 @@
 import re
 import math
-from typing import Dict, List, Tuple
+import threading
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Tuple
+try:
+    from .evaluation_cache import lexicon_version
+    from .scoring_engine import AnalyzedAnswer, ScoringStrategy, TermMatcher, engine
+except ImportError:  # imported as a top-level module inside physical-design-system/
+    from evaluation_cache import lexicon_version
+    from scoring_engine import AnalyzedAnswer, ScoringStrategy, TermMatcher, engine
 
-class TechnicalEvaluator:
+METHODOLOGY_KEYWORDS = ('analyze', 'approach', 'strategy', 'method', 'implement', 'optimize')
+TOOL_KEYWORDS = ('innovus', 'icc', 'primetime', 'virtuoso', 'calibre', 'encounter')
+# Lowest score for each letter grade, best first; anything below is an F
+GRADE_CUTOFFS = (
+    (95, "A+"), (90, "A"), (85, "A-"), (80, "B+"), (75, "B"),
+    (70, "B-"), (65, "C+"), (60, "C"), (55, "C-"), (50, "D")
+)
+NUMERICAL_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\s*(?:mm|nm|ps|ns|mA|MHz|GHz|%)\b')
+
+class TopicLexicon(NamedTuple):
+    """Immutable scoring tables for one topic"""
+    term_weights: Tuple[Tuple[str, int], ...]
+    max_term_score: int
+    concepts: Tuple[Tuple[str, FrozenSet[str]], ...]
+    matcher: TermMatcher
+
+class TechnicalEvaluator(ScoringStrategy):
     """Technical evaluator for physical design content"""
     
+    name = 'technical'
+    
     def __init__(self):
         self.technical_terms = {
             'floorplanning': {
@@ -53,10 +80,48 @@ class TechnicalEvaluator:
                 'manufacturability': ['DRC', 'yield', 'litho', 'process', 'margin']
             }
         }
+        
+        # Frozen per-topic tables, built once per evaluator and never mutated
+        self.lexicons: Mapping[str, TopicLexicon] = MappingProxyType({
+            topic: self._build_lexicon(topic)
+            for topic in set(self.technical_terms) | set(self.key_concepts)
+        })
+        self.default_lexicon = self._build_lexicon(None)
+        self.lexicon_version = lexicon_version(
+            'evaluator', self.technical_terms, self.key_concepts, METHODOLOGY_KEYWORDS, TOOL_KEYWORDS
+        )
+    
+    def _build_lexicon(self, topic) -> TopicLexicon:
+        """Precompute weights, concept keyword sets and the matcher for a topic"""
+        terms = self.technical_terms.get(topic, {})
+        concepts = self.key_concepts.get(topic, {})
+        
+        phrases = list(terms)
+        for keywords in concepts.values():
+            phrases.extend(keywords)
+        phrases.extend(METHODOLOGY_KEYWORDS)
+        phrases.extend(TOOL_KEYWORDS)
+        
+        return TopicLexicon(
+            term_weights=tuple(terms.items()),
+            max_term_score=sum(terms.values()) if terms else 1,
+            concepts=tuple(
+                (concept_name.replace('_', ' ').title(), frozenset(keywords))
+                for concept_name, keywords in concepts.items()
+            ),
+            matcher=TermMatcher(phrases)
+        )
+    
+    def phrases(self, topic, question_index):
+        return self.lexicons.get(topic, self.default_lexicon).matcher.phrases
     
     def evaluate_technical_answer(self, answer: str, topic: str, question_index: int):
-        """Evaluate a single technical answer"""
-        if not answer or len(answer.strip()) < 20:
+        """Evaluate a single technical answer, reusing cached results for identical text"""
+        return engine.score_answer(answer, topic, question_index, self.name)
+    
+    def score_answer(self, analyzed: AnalyzedAnswer, hits, topic, question_index):
+        """Score one answer from the engine's shared match results"""
+        if analyzed.stripped_length < 20:
             return {
                 'overall_score': 0.0,
                 'grade_letter': 'F',
@@ -65,48 +130,44 @@ class TechnicalEvaluator:
                 'missing_concepts': []
             }
         
-        answer_lower = answer.lower()
+        lexicon = self.lexicons.get(topic, self.default_lexicon)
         
         # Technical terms evaluation (40%)
-        terms = self.technical_terms.get(topic, {})
         found_terms = []
         term_score = 0
-        max_term_score = sum(terms.values()) if terms else 1
+        max_term_score = lexicon.max_term_score
         
-        for term, weight in terms.items():
-            if term in answer_lower:
+        for term, weight in lexicon.term_weights:
+            if term in hits:
                 found_terms.append(term)
                 term_score += weight
         
         tech_score = min(100, (term_score / max_term_score) * 100) if max_term_score > 0 else 0
         
         # Concept coverage evaluation (30%)
-        concepts = self.key_concepts.get(topic, {})
+        concepts = lexicon.concepts
         covered_concepts = 0
         missing_concepts = []
         
-        for concept_name, keywords in concepts.items():
-            if any(keyword in answer_lower for keyword in keywords):
+        for concept_label, keywords in concepts:
+            if not keywords.isdisjoint(hits):
                 covered_concepts += 1
             else:
-                missing_concepts.append(concept_name.replace('_', ' ').title())
+                missing_concepts.append(concept_label)
         
         concept_score = (covered_concepts / len(concepts)) * 100 if concepts else 0
         
         # Methodology evaluation (20%)
-        methodology_keywords = ['analyze', 'approach', 'strategy', 'method', 'implement', 'optimize']
-        methodology_count = sum(1 for keyword in methodology_keywords if keyword in answer_lower)
+        methodology_count = sum(1 for keyword in METHODOLOGY_KEYWORDS if keyword in hits)
         methodology_score = min(100, (methodology_count / 3) * 100)
         
         # Practical application evaluation (10%)
-        word_count = len(answer.split())
+        word_count = analyzed.word_count
         length_score = min(100, (word_count / 150) * 100)
         
         # Tools and numerical values
-        tools = ['innovus', 'icc', 'primetime', 'virtuoso', 'calibre', 'encounter']
-        tool_mentions = sum(1 for tool in tools if tool in answer_lower)
-        numerical_pattern = r'\b\d+(?:\.\d+)?\s*(?:mm|nm|ps|ns|mA|MHz|GHz|%)\b'
-        numerical_values = len(re.findall(numerical_pattern, answer))
+        tool_mentions = sum(1 for tool in TOOL_KEYWORDS if tool in hits)
+        numerical_values = analyzed.numeric_count(NUMERICAL_PATTERN)
         
         practical_score = min(100, (tool_mentions * 20 + numerical_values * 15 + length_score * 0.5))
         
@@ -151,28 +212,44 @@ class TechnicalEvaluator:
             'missing_concepts': missing_concepts
         }
     
+    def summarize(self, results, analyzed_answers, topic):
+        return _summarize_submission(self, results, analyzed_answers, topic)
+    
     def _calculate_grade(self, score: float) -> str:
         """Convert score to letter grade"""
-        if score >= 95: return "A+"
-        elif score >= 90: return "A"
-        elif score >= 85: return "A-"
-        elif score >= 80: return "B+"
-        elif score >= 75: return "B"
-        elif score >= 70: return "B-"
-        elif score >= 65: return "C+"
-        elif score >= 60: return "C"
-        elif score >= 55: return "C-"
-        elif score >= 50: return "D"
-        else: return "F"
+        for cutoff, grade in GRADE_CUTOFFS:
+            if score >= cutoff:
+                return grade
+        return "F"
+
+_evaluator = None
+_evaluator_lock = threading.Lock()
+
+def get_evaluator() -> TechnicalEvaluator:
+    """Return the process-wide evaluator, building it on first use.
+
+    The evaluator holds only read-only tables after construction, so one
+    instance is shared by every request thread.
+    """
+    global _evaluator
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                _evaluator = TechnicalEvaluator()
+    return _evaluator
+
+engine.register(TechnicalEvaluator.name, get_evaluator)
 
 def evaluate_technical_submission(answers: List[str], topic: str) -> Dict:
     """Evaluate complete submission"""
-    evaluator = TechnicalEvaluator()
+    return engine.evaluate_submission(answers, topic, 'technical')
+
+def _summarize_submission(evaluator: TechnicalEvaluator, results: List[Dict], answers: List[AnalyzedAnswer], topic: str) -> Dict:
+    """Roll per-answer results up into the submission report"""
     question_analyses = []
     total_score = 0
     
-    for i, answer in enumerate(answers):
-        analysis = evaluator.evaluate_technical_answer(answer, topic, i)
+    for i, analysis in enumerate(results):
         question_analyses.append({
             'question': i + 1,
             'score': analysis['overall_score'],
@@ -207,7 +284,7 @@ def evaluate_technical_submission(answers: List[str], topic: str) -> Dict:
         top_strengths.append("Strong technical vocabulary")
     if avg_score >= 70:
         top_strengths.append("Good problem-solving approach")
-    if any(len(answer.split()) >= 100 for answer in answers):
+    if any(answer.word_count >= 100 for answer in answers):
         top_strengths.append("Detailed explanations")
     
     top_weaknesses = []
@@ -215,7 +292,7 @@ def evaluate_technical_submission(answers: List[str], topic: str) -> Dict:
         top_weaknesses.append("Needs more technical depth")
     if missing_counts:
         top_weaknesses.append("Missing key concepts")
-    if any(len(answer.split()) < 50 for answer in answers):
+    if any(answer.word_count < 50 for answer in answers):
         top_weaknesses.append("Some answers too brief")
     
     # Grade distribution
@@ -234,12 +311,40 @@ def evaluate_technical_submission(answers: List[str], topic: str) -> Dict:
         'detailed_breakdown': {
             'avg_technical_terms': min(100, len(set(all_terms)) / max(1, len(answers) * 3) * 100),
             'avg_concept_coverage': max(0, 100 - len(set(all_missing)) / max(1, len(answers)) * 20),
-            'avg_methodology': 70 if any('approach' in answer.lower() for answer in answers) else 50,
-            'avg_practical': min(100, sum(len(answer.split()) for answer in answers) / (len(answers) * 150) * 100)
+            'avg_methodology': 70 if any(answer.contains('approach') for answer in answers) else 50,
+            'avg_practical': min(100, sum(answer.word_count for answer in answers) / (len(answers) * 150) * 100)
         },
         'recommendations': _generate_recommendations(top_weaknesses, topic)
     }
 
+def evaluate_batch(submissions: Iterable[Tuple[List[str], str]]) -> List[Dict]:
+    """Evaluate many submissions in one call.
+
+    Takes (answers, topic) pairs and returns the results in input order.
+    Submissions are grouped by topic so each group resolves its lexicon
+    and matcher once; answers are scored straight through the evaluator,
+    bypassing the evaluation cache a backfill would only churn.
+    """
+    by_topic = defaultdict(list)
+    count = 0
+    for index, (answers, topic) in enumerate(submissions):
+        by_topic[topic].append((index, answers))
+        count += 1
+    
+    evaluator = get_evaluator()
+    results: List[Dict] = [None] * count
+    for topic, group in by_topic.items():
+        matcher = evaluator.lexicons.get(topic, evaluator.default_lexicon).matcher
+        for index, answers in group:
+            analyzed_answers = [AnalyzedAnswer(answer) for answer in answers]
+            scored = [
+                evaluator.score_answer(analyzed, matcher.find(analyzed), topic, question_index)
+                for question_index, analyzed in enumerate(analyzed_answers)
+            ]
+            results[index] = evaluator.summarize(scored, analyzed_answers, topic)
+    
+    return results
+
 def _generate_recommendations(weaknesses: List[str], topic: str) -> List[str]:
     """Generate study recommendations"""
     recommendations = []
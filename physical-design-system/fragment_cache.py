@@ -0,0 +1,62 @@
+# fragment_cache.py - Rendered HTML fragments keyed by owner and data version
+import os
+import threading
+from collections import Counter
+
+from markupsafe import Markup
+
+try:
+    from .evaluation_cache import LRUCache
+except ImportError:  # imported as a top-level module inside physical-design-system/
+    from evaluation_cache import LRUCache
+
+_MISSING = object()
+
+class FragmentCache:
+    """Bounded LRU of rendered fragments.
+
+    Keys are (fragment name, owner, version), where the version comes from
+    the data versions behind the dashboard ETags (http_cache.py). Every
+    event that changes what a fragment shows - an assignment changing
+    status, a submission graded or released, a notification added - bumps
+    the owner's version, so stale entries are never looked up again and
+    age out through LRU eviction.
+    """
+
+    def __init__(self, maxsize=512):
+        self.memory = LRUCache(maxsize)
+        self.by_fragment = {'hits': Counter(), 'misses': Counter()}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(maxsize=int(os.environ.get('FRAGMENT_CACHE_SIZE', 512)))
+
+    def render(self, name, owner, version, render):
+        """Return fragment `name` for owner at version, calling render() on a miss"""
+        key = (name, owner, version)
+        html = self.memory.get(key, _MISSING)
+        with self._lock:
+            self.by_fragment['misses' if html is _MISSING else 'hits'][name] += 1
+        if html is _MISSING:
+            html = Markup(render())
+            self.memory.set(key, html)
+        return html
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self):
+        stats = self.memory.stats()
+        with self._lock:
+            stats['fragments'] = {
+                name: {
+                    'hits': self.by_fragment['hits'][name],
+                    'misses': self.by_fragment['misses'][name]
+                }
+                for name in sorted(set(self.by_fragment['hits']) | set(self.by_fragment['misses']))
+            }
+        return stats
+
+# Shared by every view in the process; fragment names keep their keys apart
+fragment_cache = FragmentCache.from_env()
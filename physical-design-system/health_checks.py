@@ -0,0 +1,58 @@
+# health_checks.py - Liveness/readiness probes and cached health statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from sqlalchemy import text
+
+class DatabaseProbe:
+    """Readiness check: SELECT 1 on a pooled connection, bounded by a timeout.
+
+    The query runs on a single background thread so a hung database cannot
+    hold the probe past `timeout`. While a timed-out check is still stuck,
+    later probes fail fast instead of piling up more blocked threads.
+    """
+
+    def __init__(self, timeout=2.0):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='readiness')
+        self._pending = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _select_one(engine):
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+    def check(self, engine):
+        """Return (ready, error); error is None when ready"""
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                return False, 'previous check still running'
+            self._pending = self._executor.submit(self._select_one, engine)
+            future = self._pending
+        try:
+            future.result(timeout=self.timeout)
+        except FutureTimeout:
+            return False, f'database did not answer within {self.timeout}s'
+        except Exception as e:
+            return False, str(e)
+        return True, None
+
+class CachedValue:
+    """A single computed value reused for `ttl` seconds"""
+
+    def __init__(self, ttl=10.0):
+        self.ttl = ttl
+        self._value = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, compute):
+        """Return the cached value, recomputing it with compute() once it expires"""
+        with self._lock:
+            if time.monotonic() >= self._expires:
+                self._value = compute()
+                self._expires = time.monotonic() + self.ttl
+            return self._value
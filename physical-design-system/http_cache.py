@@ -0,0 +1,249 @@
+# http_cache.py - Conditional GETs keyed on data versions, and response compression
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+import uuid
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+try:
+    import brotli
+except ImportError:  # responses are gzip-only without it
+    brotli = None
+
+try:
+    from sqlalchemy import Column, Integer, String, Table, event, select, text
+except ImportError:  # only SessionVersions needs it; the dict apps run on Flask alone
+    event = None
+
+# Version bumped by every change; pages that show everyone's data key on it
+EVERYTHING = 'all'
+
+# Session.info key for the scopes a transaction's changes will bump
+_PENDING_KEY = 'data_version_scopes'
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+def _user_scope(user_id):
+    return f'user:{user_id}'
+
+class StorageVersions:
+    """Data versions kept as counters in a storage.py backend.
+
+    The dict apps call bump() with the users whose pages a change affects
+    whenever they write to the store.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        # Per-process counters restart from 0 in every worker; the epoch keeps their ETags apart
+        self.epoch = '' if storage.shared else uuid.uuid4().hex[:8]
+
+    def bump(self, *user_ids):
+        self.storage.next_id(f'version:{EVERYTHING}')
+        for user_id in user_ids:
+            self.storage.next_id(f'version:{_user_scope(user_id)}')
+
+    def key(self, user_id, everything=False):
+        """ETag parts for user_id's view of their own data (or everyone's), None when logged out"""
+        if user_id is None:
+            return None
+        scope = EVERYTHING if everything else _user_scope(user_id)
+        return (self.epoch, user_id, self.storage.current_id(f'version:{scope}'))
+
+class SessionVersions:
+    """Data versions in a data_versions table, bumped once a change commits.
+
+    users_of(obj) names the users whose pages show a flushed instance.
+    Flushes only note the scopes to bump; the bumps run in a short
+    transaction of their own after the session commits (and are dropped
+    if it rolls back). The writing transaction therefore never holds the
+    lock on the shared 'all' row, so writes are not serialized behind it.
+    Since the data is visible before its bump, a page read in between is
+    fresh but tagged with the old version, which costs one extra 200,
+    never a stale 304.
+    """
+
+    def __init__(self, app=None, db=None, users_of=None):
+        self.db = None
+        self.users_of = users_of
+        self.table = None
+        if app is not None:
+            self.init_app(app, db, users_of)
+
+    def init_app(self, app, db, users_of=None):
+        if event is None:
+            raise RuntimeError('SessionVersions needs SQLAlchemy: pip install Flask-SQLAlchemy')
+        self.db = db
+        if users_of is not None:
+            self.users_of = users_of
+        self.table = Table(
+            'data_versions', db.metadata,
+            Column('scope', String(64), primary_key=True),
+            Column('version', Integer, nullable=False),
+            extend_existing=True
+        )
+        self._bump = text(
+            'INSERT INTO data_versions (scope, version) VALUES (:scope, 1) '
+            'ON CONFLICT (scope) DO UPDATE SET version = data_versions.version + 1'
+        )
+
+        event.listen(db.session, 'after_flush', self._after_flush)
+        event.listen(db.session, 'after_commit', self._after_commit)
+        event.listen(db.session, 'after_soft_rollback', self._after_rollback)
+        app.extensions['data_versions'] = self
+
+    def _after_flush(self, session, flush_context):
+        changed = list(itertools.chain(session.new, session.dirty, session.deleted))
+        if not changed:
+            return
+        self.bump(session, *{user_id for obj in changed for user_id in self.users_of(obj)})
+
+    def bump(self, session, *user_ids):
+        """Bump versions once session commits; for changes made without a flush (Core statements)"""
+        scopes = session.info.setdefault(_PENDING_KEY, set())
+        scopes.add(EVERYTHING)
+        scopes.update(_user_scope(user_id) for user_id in user_ids if user_id is not None)
+
+    def _after_commit(self, session):
+        scopes = session.info.pop(_PENDING_KEY, None)
+        if not scopes:
+            return
+        try:
+            # Sorted, so concurrent bumps take the row locks in the same order
+            with self.db.engine.begin() as connection:
+                for scope in sorted(scopes):
+                    connection.execute(self._bump, {'scope': scope})
+        except Exception:
+            # The change itself is committed; only its pages' ETags lag until the next bump
+            logger.exception('Could not bump data versions %s', sorted(scopes))
+
+    def _after_rollback(self, session, previous_transaction):
+        # A savepoint rollback keeps the enclosing transaction's bumps
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
+
+    def key(self, user_id, everything=False):
+        """ETag parts for user_id's view of their own data (or everyone's), None when logged out"""
+        if user_id is None:
+            return None
+        scope = EVERYTHING if everything else _user_scope(user_id)
+        version = self.db.session.execute(
+            select(self.table.c.version).where(self.table.c.scope == scope)
+        ).scalar()
+        return (user_id, version or 0)
+
+def _release(app):
+    """Fingerprint of what pages are rendered from, so a deploy never answers 304 for old markup.
+
+    Covers the app module (and the inline templates in it), the files in
+    the app's template folder and the static asset manifest, so deploys
+    that only change a template or an asset change every ETag too.
+    """
+    if app.config.get('ETAG_RELEASE'):
+        return app.config['ETAG_RELEASE']
+    digest = hashlib.sha1()
+    paths = [getattr(sys.modules.get(app.import_name), '__file__', None)]
+    if app.template_folder:
+        template_dir = os.path.join(app.root_path, app.template_folder)
+        for root, dirs, files in os.walk(template_dir):
+            dirs.sort()
+            paths.extend(os.path.join(root, name) for name in sorted(files))
+    for path in paths:
+        if path and os.path.isfile(path):
+            digest.update(path.encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    static_assets = app.extensions.get('static_assets')
+    if static_assets is not None:
+        digest.update(json.dumps(static_assets.manifest, sort_keys=True).encode())
+    return digest.hexdigest()[:12]
+
+class HTTPCache:
+    """ETag/304 handling and negotiated gzip/brotli compression.
+
+    Views decorated with conditional(key) are answered with 304 before
+    they run when the client's ETag still matches the data version, so a
+    polling dashboard costs one version lookup. Other GET responses get
+    a weak ETag from their body, which saves the transfer but not the
+    rendering.
+    """
+
+    def __init__(self, app=None):
+        self.min_size = 500
+        self.level = 6
+        self._release = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.level = app.config.get('COMPRESS_LEVEL', 6)
+        self._release = None
+        app.after_request(self._after_request)
+        app.extensions['http_cache'] = self
+
+    @property
+    def release(self):
+        """Release fingerprint; taken on first use, once every extension has loaded"""
+        if self._release is None:
+            self._release = _release(current_app)
+        return self._release
+
+    def conditional(self, key):
+        """Serve the view with a weak ETag built from key(); key() returning None disables it"""
+        def decorator(view):
+            @wraps(view)
+            def wrapped(*args, **kwargs):
+                parts = key()
+                if parts is None:
+                    return view(*args, **kwargs)
+
+                # Read the version before rendering: a change made meanwhile only costs one extra 200
+                etag = hashlib.sha1(repr((self.release, request.full_path) + tuple(parts)).encode()).hexdigest()[:20]
+                if request.if_none_match.contains_weak(etag):
+                    response = make_response('', 304)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = 'private, no-cache'
+                return response
+            return wrapped
+        return decorator
+
+    def _after_request(self, response):
+        if (request.method in ('GET', 'HEAD') and response.status_code == 200 and 'ETag' not in response.headers
+                and not response.is_streamed and not response.direct_passthrough):
+            response.add_etag(weak=True)
+            response.make_conditional(request)
+        self._compress(response)
+        return response
+
+    def _compress(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or not response.mimetype or not response.mimetype.startswith(COMPRESSIBLE)):
+            return
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return
+
+        encoding = request.accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=5))
+        elif encoding == 'gzip':
+            response.set_data(gzip.compress(data, compresslevel=self.level))
+        else:
+            return
+        response.headers['Content-Encoding'] = encoding
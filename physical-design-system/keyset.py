@@ -0,0 +1,97 @@
+# keyset.py - Cursor (keyset) pagination for newest-first listings
+import base64
+import datetime
+import json
+
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+def encode_cursor(timestamp, row_id):
+    """Opaque token for the position just after (timestamp, row_id)"""
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def parse_limit(value):
+    """Page size from a query-string value, clamped to 1..MAX_LIMIT"""
+    try:
+        limit = int(value) if value is not None else DEFAULT_LIMIT
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, MAX_LIMIT))
+
+def keyset_page(query, timestamp_column, id_column, cursor=None, limit=DEFAULT_LIMIT):
+    """One page of query ordered by (timestamp, id) descending.
+
+    Rows after the cursor are found with a range condition on the sort key
+    instead of OFFSET, so every page costs the same however deep it is.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            timestamp_column < timestamp,
+            and_(timestamp_column == timestamp, id_column < row_id)
+        ))
+
+    rows = query.order_by(None).order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+def parse_bool(value):
+    """'true'/'1'/'yes' -> True, 'false'/'0'/'no' -> False, missing -> None"""
+    if value is None or value == '':
+        return None
+    lowered = value.lower()
+    if lowered in ('true', '1', 'yes'):
+        return True
+    if lowered in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'Expected a boolean, got {value!r}')
+
+# Grading states a submissions listing can filter on
+SUBMISSION_STATUSES = ('pending', 'graded', 'released')
+
+def _status_condition(submission, status):
+    graded = submission.admin_grade.isnot(None)
+    if status == 'pending':
+        return submission.admin_grade.is_(None)
+    if status == 'graded':
+        return and_(graded, submission.is_grade_released.isnot(True))
+    return and_(graded, submission.is_grade_released.is_(True))
+
+def filter_submissions(query, submission, assignment, user, topic=None, engineer=None,
+                       status=None, grade=None, released=None):
+    """Narrow a submission query for the admin listings.
+
+    The models are passed in so both app schemas share one set of filters:
+    topic (assignment topic), engineer (username), status (one of
+    SUBMISSION_STATUSES), grade (letter, or 'ungraded') and released (bool).
+    """
+    if topic:
+        query = query.join(assignment, assignment.id == submission.assignment_id).filter(assignment.topic == topic)
+    if engineer:
+        query = query.join(user, user.id == submission.engineer_id).filter(user.username == engineer)
+    if status in SUBMISSION_STATUSES:
+        query = query.filter(_status_condition(submission, status))
+    if grade == 'ungraded':
+        query = query.filter(submission.admin_grade.is_(None))
+    elif grade:
+        query = query.filter(submission.admin_grade == grade)
+    if released is not None:
+        query = query.filter(submission.is_grade_released == released)
+    return query
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""Deadline-day load test for the submit and review flows.
+
+Drives a running server (e.g. `gunicorn -w 4 app_working:app`) with N
+synthetic engineers and M admins over asyncio + aiohttp:
+
+  engineers: log in, fetch the dashboard, submit each open assignment
+  admins:    log in, page through the submissions list
+
+and reports throughput, p50/p95/p99 latency and error rate per endpoint.
+Paths come from a profile (app_working or routes) and can be overridden
+one by one, so the same run works against either app variant.
+
+Requires aiohttp (`pip install aiohttp`); it is not an app dependency.
+
+Usage:
+    python loadtest.py --setup --engineers 50          # app_working: create users + assignments
+    python loadtest.py --engineers 50 --admins 2 --duration 60 --output load.json
+    python loadtest.py --profile routes --base-url http://127.0.0.1:5000
+
+--setup creates the synthetic engineers directly in the app_working
+database (set DATABASE_URL to point at Postgres), then has the admin
+create their assignments through /api/create-full-system.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+
+try:
+    import aiohttp
+except ImportError:  # only needed to run the load test itself
+    aiohttp = None
+
+PROFILES = {
+    'app_working': {
+        'login': '/login',
+        'dashboard': '/engineer',
+        'submit': '/api/submit-assignment',
+        'submissions': '/admin/submissions',
+        'create_assignments': '/api/create-full-system'
+    },
+    'routes': {
+        'login': '/login',
+        'dashboard': '/engineer/dashboard',
+        'submit': '/api/submit',
+        'submissions': '/admin/submissions',
+        'create_assignments': '/api/create-demo-assignments'
+    }
+}
+
+# Links to assignments that have not been submitted yet
+ASSIGNMENT_LINK = re.compile(r'href="(?:/engineer)?/assignment/([^"/?#]+)"')
+
+ANSWER_SENTENCES = (
+    'We analyze the power grid and IR drop across each voltage domain before placement.',
+    'Timing closure relies on useful skew, clock tree balancing and setup margin on critical paths.',
+    'Congestion is reduced by cell padding, placement blockages and layer assignment for long nets.',
+    'Double patterning and via stacking constraints shape the routing strategy at 7 nm.',
+    'For example, a 15% utilization drop cut the worst hotspot from 125 C to 98 C.',
+    'First, we implement the floorplan; second, we optimize macro placement with Innovus.'
+)
+
+class Stats:
+    """Latencies and outcomes per endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, elapsed, status, ok):
+        self.latencies[endpoint].append(elapsed)
+        self.statuses[endpoint][str(status)] += 1
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, duration):
+        endpoints = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            count = len(latencies)
+            endpoints[endpoint] = {
+                'requests': count,
+                'throughput_rps': round(count / duration, 2) if duration else 0.0,
+                'p50_ms': round(_percentile(latencies, 0.50) * 1000, 1),
+                'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+                'p99_ms': round(_percentile(latencies, 0.99) * 1000, 1),
+                'max_ms': round(latencies[-1] * 1000, 1),
+                'error_rate': round(self.errors[endpoint] / count, 4),
+                'statuses': dict(self.statuses[endpoint])
+            }
+        return endpoints
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Client:
+    """One logged-in user with its own cookie jar"""
+
+    def __init__(self, base_url, stats, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        # unsafe=True keeps cookies for bare IP hosts such as 127.0.0.1
+        self.session = aiohttp.ClientSession(
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        )
+
+    async def request(self, endpoint, method, path, expect=(200,), **kwargs):
+        """Send a request, record it under endpoint and return (status, body)"""
+        started = time.perf_counter()
+        try:
+            async with self.session.request(method, self.base_url + path, allow_redirects=False, **kwargs) as response:
+                body = await response.text()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.stats.record(endpoint, time.perf_counter() - started, type(e).__name__, False)
+            return None, ''
+        self.stats.record(endpoint, time.perf_counter() - started, status, status in expect)
+        return status, body
+
+    async def login(self, paths, username, password):
+        # Both apps redirect to a dashboard on success and re-render the form on failure
+        status, _ = await self.request('login', 'POST', paths['login'], expect=(302, 303),
+                                       data={'username': username, 'password': password})
+        return status in (302, 303)
+
+    async def close(self):
+        await self.session.close()
+
+def _answers(rng, count):
+    return [' '.join(rng.choice(ANSWER_SENTENCES) for _ in range(rng.randint(3, 12))) for _ in range(count)]
+
+async def engineer_flow(args, paths, stats, username, deadline, rng):
+    client = Client(args.base_url, stats, args.timeout)
+    try:
+        if not await client.login(paths, username, args.password):
+            return
+        submitted = set()
+        while time.monotonic() < deadline:
+            status, body = await client.request('dashboard', 'GET', paths['dashboard'])
+            pending = [a for a in dict.fromkeys(ASSIGNMENT_LINK.findall(body)) if a not in submitted]
+            if status == 200 and pending:
+                assignment_id = pending[0]
+                submitted.add(assignment_id)
+                await client.request('submit', 'POST', paths['submit'], json={
+                    'assignment_id': assignment_id,
+                    'answers': _answers(rng, args.answers_per_submission)
+                })
+            await asyncio.sleep(rng.uniform(0, args.think_time))
+    finally:
+        await client.close()
+
+async def admin_flow(args, paths, stats, deadline, rng):
+    client = Client(args.base_url, stats, args.timeout)
+    try:
+        if not await client.login(paths, args.admin_user, args.admin_password):
+            return
+        page = 1
+        while time.monotonic() < deadline:
+            status, _ = await client.request('submissions', 'GET', paths['submissions'], params={'page': page})
+            page = page + 1 if status == 200 and page < args.admin_pages else 1
+            await asyncio.sleep(rng.uniform(0, args.think_time))
+    finally:
+        await client.close()
+
+async def run_load(args, paths):
+    stats = Stats()
+    rng = random.Random(args.seed)
+    started = time.monotonic()
+    deadline = started + args.ramp_up + args.duration
+
+    async def delayed(delay, coroutine):
+        await asyncio.sleep(delay)
+        await coroutine
+
+    tasks = []
+    for n in range(1, args.engineers + 1):
+        username = args.username_format.format(n=n)
+        delay = args.ramp_up * (n - 1) / max(1, args.engineers)
+        tasks.append(delayed(delay, engineer_flow(args, paths, stats, username, deadline, random.Random(rng.random()))))
+    for _ in range(args.admins):
+        tasks.append(admin_flow(args, paths, stats, deadline, random.Random(rng.random())))
+
+    await asyncio.gather(*tasks)
+    duration = time.monotonic() - started
+    return {
+        'meta': {
+            'base_url': args.base_url,
+            'profile': args.profile,
+            'paths': paths,
+            'engineers': args.engineers,
+            'admins': args.admins,
+            'duration_s': round(duration, 1),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'endpoints': stats.report(duration)
+    }
+
+def setup_app_working(args, paths):
+    """Create the synthetic engineers in the app_working database, then their assignments"""
+    import app_working
+    from werkzeug.security import generate_password_hash
+
+    password_hash = generate_password_hash(args.password)
+    with app_working.app.app_context():
+        created = 0
+        for n in range(1, args.engineers + 1):
+            username = args.username_format.format(n=n)
+            if app_working.User.query.filter_by(username=username).first():
+                continue
+            app_working.db.session.add(app_working.User(
+                username=username,
+                email=f'{username}@loadtest.local',
+                password_hash=password_hash,
+                is_admin=False,
+                engineer_id=f'LT{n:05d}',
+                department='Load Test'
+            ))
+            created += 1
+        app_working.db.session.commit()
+    print(f"✅ Created {created} synthetic engineers", file=sys.stderr)
+
+    async def create_assignments():
+        stats = Stats()
+        client = Client(args.base_url, stats, args.timeout)
+        try:
+            if not await client.login(paths, args.admin_user, args.admin_password):
+                raise SystemExit('Admin login failed; check --admin-user/--admin-password')
+            status, body = await client.request('create_assignments', 'POST', paths['create_assignments'])
+            print(f"✅ {paths['create_assignments']}: {status} {body[:200]}", file=sys.stderr)
+        finally:
+            await client.close()
+
+    asyncio.run(create_assignments())
+
+def print_report(report):
+    print(f"{'endpoint':<14}{'requests':>9}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}",
+          file=sys.stderr)
+    for endpoint, row in report['endpoints'].items():
+        print(f"{endpoint:<14}{row['requests']:>9}{row['throughput_rps']:>9}{row['p50_ms']:>9}"
+              f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['error_rate'] * 100:>8.1f}%", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the submit and review flows')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='app_working')
+    for name in PROFILES['app_working']:
+        parser.add_argument(f"--{name.replace('_', '-')}-path", dest=f'{name}_path', help=f'override the {name} path')
+    parser.add_argument('--engineers', type=int, default=20)
+    parser.add_argument('--admins', type=int, default=1)
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load after ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which engineers start')
+    parser.add_argument('--think-time', type=float, default=1.0, help='max random pause between requests')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--username-format', default='loadtest{n}')
+    parser.add_argument('--password', default='loadtest123')
+    parser.add_argument('--admin-user', default='admin')
+    parser.add_argument('--admin-password', default='admin123')
+    parser.add_argument('--admin-pages', type=int, default=5, help='submission pages each admin cycles through')
+    parser.add_argument('--answers-per-submission', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--setup', action='store_true', help='create synthetic engineers and assignments, then exit')
+    parser.add_argument('--output', help='write the JSON report here')
+    args = parser.parse_args(argv)
+
+    if aiohttp is None:
+        raise SystemExit('loadtest.py needs aiohttp: pip install aiohttp')
+
+    paths = dict(PROFILES[args.profile])
+    for name in paths:
+        override = getattr(args, f'{name}_path')
+        if override:
+            paths[name] = override
+
+    if args.setup:
+        if args.profile != 'app_working':
+            raise SystemExit('--setup only knows how to create users for app_working')
+        setup_app_working(args, paths)
+        return
+
+    report = asyncio.run(run_load(args, paths))
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Wrote {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
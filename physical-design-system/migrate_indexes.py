@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Create the dashboard indexes on an existing app_working database.
+
+db.create_all() only builds indexes for tables it creates, so databases
+from before the indexes were declared need this once. Every index in
+the model metadata is created if missing (CREATE INDEX IF NOT EXISTS
+semantics), which makes the script safe to re-run.
+
+--explain prints the query plan of each hot dashboard query and exits
+non-zero if any of them still scans a whole table.
+
+Usage:
+    python migrate_indexes.py                  # create missing indexes
+    python migrate_indexes.py --dry-run        # list what would be created
+    python migrate_indexes.py --explain        # check the plans afterwards
+    DATABASE_URL=postgresql://... python migrate_indexes.py
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import func, inspect, select
+
+from app_working import Assignment, Notification, Submission, app, db
+
+def hot_queries():
+    """The per-page-load query shapes the indexes are built for"""
+    return {
+        'unread notifications': select(Notification)
+            .where(Notification.user_id == 1, Notification.is_read.is_(False))
+            .order_by(Notification.created_date.desc()).limit(5),
+        'pending grading count': select(func.count()).select_from(Submission)
+            .where(Submission.admin_grade.is_(None)),
+        'recent submissions': select(Submission)
+            .order_by(Submission.submitted_date.desc(), Submission.id.desc()).limit(20),
+        'engineer assignments': select(Assignment).where(Assignment.engineer_id == 1),
+        'engineer submissions': select(Submission).where(Submission.engineer_id == 1),
+        'existing submission': select(Submission)
+            .where(Submission.assignment_id == 'PD_PLACEMENT_1', Submission.engineer_id == 1)
+    }
+
+def missing_indexes():
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                yield index
+
+def create_indexes(dry_run=False):
+    created = 0
+    for index in missing_indexes():
+        print(f"{'Would create' if dry_run else '🔧 Creating'} {index.name} on {index.table.name}")
+        if not dry_run:
+            index.create(db.engine, checkfirst=True)
+        created += 1
+    if not created:
+        print("✅ All indexes already exist")
+    return created
+
+def _plan(connection, statement):
+    dialect = connection.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'sqlite':
+        return [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}')]
+    return [row[0] for row in connection.exec_driver_sql(f'EXPLAIN {sql}')]
+
+def _is_full_scan(line):
+    # SQLite: "SCAN submission" without an index; Postgres: "Seq Scan on submission"
+    return (line.startswith('SCAN') and 'INDEX' not in line) or 'Seq Scan' in line
+
+def explain():
+    """Print each hot query's plan; return the names of queries that scan a whole table"""
+    full_scans = []
+    with db.engine.connect() as connection:
+        for name, statement in hot_queries().items():
+            plan = _plan(connection, statement)
+            scans = any(_is_full_scan(line.strip()) for line in plan)
+            print(f"{'⚠️' if scans else '✅'} {name}")
+            for line in plan:
+                print(f"    {line}")
+            if scans:
+                full_scans.append(name)
+    return full_scans
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create missing dashboard indexes on the app_working database')
+    parser.add_argument('--dry-run', action='store_true', help='list missing indexes without creating them')
+    parser.add_argument('--explain', action='store_true',
+                        help='print query plans and fail on full table scans (Postgres may still '
+                             'prefer Seq Scan on tiny tables; run ANALYZE on realistic data)')
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        print(f"📦 {app.config['SQLALCHEMY_DATABASE_URI']}")
+        if args.explain:
+            full_scans = explain()
+            if full_scans:
+                print(f"❌ Full table scans: {', '.join(full_scans)}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            create_indexes(args.dry_run)
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 # models.py - FIXED VERSION
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import enum
@@ -69,6 +70,16 @@ class Assignment(db.Model):
     engineer = db.relationship('User', foreign_keys=[engineer_id], backref='assignments')
     admin = db.relationship('User', foreign_keys=[assigned_by_admin])
     
+    __table_args__ = (
+        # Engineer dashboard: filter_by(engineer_id)
+        db.Index('ix_assignments_engineer_created', 'engineer_id', 'created_date'),
+    )
+    
+    @classmethod
+    def with_engineer(cls):
+        """Query that loads the engineer with each row, so to_dict() stays one query"""
+        return cls.query.options(joinedload(cls.engineer))
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -110,8 +121,21 @@ class Submission(db.Model):
     
     __table_args__ = (
         db.UniqueConstraint('assignment_id', 'engineer_id', name='unique_submission'),
+        # Newest-first listings and the (submitted_date, id) keyset cursor
+        db.Index('ix_submissions_submitted_id', 'submitted_date', 'id'),
+        # Engineer dashboard: filter_by(engineer_id, is_grade_released)
+        db.Index('ix_submissions_engineer_released', 'engineer_id', 'is_grade_released'),
+        # Pending-grading counts and queues only ever look at ungraded rows
+        db.Index('ix_submissions_ungraded', 'submitted_date',
+                 sqlite_where=db.text('admin_grade IS NULL'),
+                 postgresql_where=db.text('admin_grade IS NULL')),
     )
     
+    @classmethod
+    def with_related(cls):
+        """Query that loads assignment and engineer with each row, so listings and to_dict() stay one query"""
+        return cls.query.options(joinedload(cls.assignment), joinedload(cls.engineer))
+    
     def to_dict(self, include_evaluation=False):
         data = {
             'id': self.id,
@@ -147,3 +171,8 @@ class Notification(db.Model):
     
     # Relationship
     user = db.relationship('User', backref='notifications')
+    
+    __table_args__ = (
+        # Unread notifications, newest first: filter_by(user_id, is_read).order_by(created_date.desc())
+        db.Index('ix_notifications_user_read_created', 'user_id', 'is_read', 'created_date'),
+    )
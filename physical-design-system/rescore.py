@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Re-score stored submissions after the evaluator's term weights change.
+
+Streams submissions out of the database in id order, scores each chunk
+across a process pool and writes overall_score, grade_letter and
+evaluation_results back with one bulk UPDATE per chunk. Progress is
+checkpointed after every committed chunk, so an interrupted backfill
+resumes where it stopped.
+
+Both schemas are supported and detected from the database: models.py
+(submissions/assignments tables with JSON columns, scored with the
+technical rubric) and app_working.py (submission/assignment tables with
+JSON stored as text, scored with its SCORING_RUBRIC, default depth).
+
+Usage:
+    python rescore.py --database-url sqlite:///physical_design.db
+    python rescore.py --database-url sqlite:///instance/physical_design.db --rubric technical
+    python rescore.py --topic routing --chunk-size 1000 --workers 8
+    python rescore.py --restart    # ignore an existing checkpoint
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from sqlalchemy import JSON, Text, bindparam, column, create_engine, inspect, select, table, update
+from sqlalchemy.types import TypeDecorator
+
+from evaluator import evaluate_batch
+from scoring_engine import engine as scoring_engine
+
+DEFAULT_CHECKPOINT = 'rescore.checkpoint.json'
+
+class JSONText(TypeDecorator):
+    """JSON kept in a text column, as app_working.py stores it"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else json.loads(value)
+
+def _tables(submissions, assignments, json_type):
+    return (
+        table(submissions, column('id'), column('assignment_id'), column('answers', json_type),
+              column('overall_score'), column('grade_letter'), column('evaluation_results', json_type)),
+        table(assignments, column('id'), column('topic'))
+    )
+
+# (submissions, assignments) tables of each app's database
+SCHEMAS = {
+    'models': _tables('submissions', 'assignments', JSON),
+    'app_working': _tables('submission', 'assignment', JSONText)
+}
+
+# The rubric each app scores submissions with
+DEFAULT_RUBRICS = {
+    'models': 'technical',
+    'app_working': os.environ.get('SCORING_RUBRIC', 'depth')
+}
+
+# Modules that register each rubric with the scoring engine on import
+RUBRIC_MODULES = {
+    'technical': 'evaluator',
+    'depth': 'app_working'
+}
+
+def load_rubric(rubric):
+    """Import the module that registers rubric; also run in every worker process"""
+    module = RUBRIC_MODULES.get(rubric)
+    if module is None:
+        raise SystemExit(f"Unknown rubric {rubric!r}; choose from {', '.join(sorted(RUBRIC_MODULES))}")
+    if module == 'app_working' and module not in sys.modules:
+        # Imported only for its rubric: keep its startup off the database being re-scored
+        os.environ['DATABASE_URL'] = 'sqlite://'
+    importlib.import_module(module)
+
+def detect_schema(engine):
+    """Name of the SCHEMAS entry whose submissions table exists in the database"""
+    tables = set(inspect(engine).get_table_names())
+    for name, (submissions_table, _) in SCHEMAS.items():
+        if submissions_table.name in tables:
+            return name
+    raise SystemExit('No submissions table found; is --database-url an app database?')
+
+def _score_rows(rows, rubric='technical'):
+    """Score (id, answers, topic) rows in a worker process"""
+    if rubric == 'technical':
+        results = evaluate_batch((answers, topic) for _, answers, topic in rows)
+    else:
+        results = [scoring_engine.evaluate_submission(answers, topic, rubric) for _, answers, topic in rows]
+    return [(row[0], result) for row, result in zip(rows, results)]
+
+def load_checkpoint(path, topic):
+    """Return the last committed submission id, or 0 to start fresh"""
+    if not os.path.exists(path):
+        return 0, 0
+
+    with open(path) as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get('topic') != topic:
+        raise SystemExit(f"Checkpoint {path} was written for topic {checkpoint.get('topic')!r}; "
+                         f"use --restart to discard it")
+    return checkpoint['last_id'], checkpoint['rescored']
+
+def save_checkpoint(path, topic, last_id, rescored):
+    """Atomically record progress after a chunk has been committed"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'topic': topic, 'last_id': last_id, 'rescored': rescored}, f)
+    os.replace(tmp_path, path)
+
+def stream_submissions(engine, after_id, chunk_size, topic=None, schema='models'):
+    """Yield chunks of (id, answers, topic) rows using keyset pagination on id"""
+    submissions_table, assignments_table = SCHEMAS[schema]
+    query = (
+        select(submissions_table.c.id, submissions_table.c.answers, assignments_table.c.topic)
+        .join(assignments_table, submissions_table.c.assignment_id == assignments_table.c.id)
+        .order_by(submissions_table.c.id)
+        .limit(chunk_size)
+    )
+    if topic:
+        query = query.where(assignments_table.c.topic == topic)
+
+    while True:
+        with engine.connect() as conn:
+            rows = [tuple(row) for row in conn.execute(query.where(submissions_table.c.id > after_id))]
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1][0]
+
+def write_results(engine, scored, schema='models'):
+    """Write one chunk of results back with a single executemany UPDATE"""
+    submissions_table, _ = SCHEMAS[schema]
+    statement = (
+        update(submissions_table)
+        .where(submissions_table.c.id == bindparam('submission_id'))
+        .values(
+            overall_score=bindparam('new_overall_score'),
+            grade_letter=bindparam('new_grade_letter'),
+            evaluation_results=bindparam('new_evaluation_results')
+        )
+    )
+    params = [
+        {
+            'submission_id': submission_id,
+            'new_overall_score': result['overall_score'],
+            'new_grade_letter': result['grade_letter'],
+            'new_evaluation_results': result
+        }
+        for submission_id, result in scored
+    ]
+    with engine.begin() as conn:
+        conn.execute(statement, params)
+
+def rescore(database_url, topic=None, chunk_size=500, workers=None, checkpoint=DEFAULT_CHECKPOINT, restart=False,
+            schema=None, rubric=None):
+    """Re-score every stored submission, resuming from the checkpoint if present.
+
+    schema defaults to the one found in the database, rubric to the one
+    that schema's app scores with.
+    """
+    if restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    last_id, rescored = load_checkpoint(checkpoint, topic)
+    if last_id:
+        print(f"↩️ Resuming after submission {last_id} ({rescored} already re-scored)")
+
+    engine = create_engine(database_url)
+    schema = schema or detect_schema(engine)
+    rubric = rubric or DEFAULT_RUBRICS[schema]
+    load_rubric(rubric)
+    print(f"📦 {schema} schema, {rubric} rubric")
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_rubric, initargs=(rubric,)) as executor:
+        for rows in stream_submissions(engine, last_id, chunk_size, topic, schema):
+            # Split the chunk so every worker gets a share
+            step = max(1, -(-len(rows) // workers))
+            slices = [rows[i:i + step] for i in range(0, len(rows), step)]
+            scored = [item for part in executor.map(partial(_score_rows, rubric=rubric), slices) for item in part]
+
+            write_results(engine, scored, schema)
+            last_id = rows[-1][0]
+            rescored += len(rows)
+            save_checkpoint(checkpoint, topic, last_id, rescored)
+            print(f"✅ Re-scored {rescored} submissions (through id {last_id})")
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    engine.dispose()
+    return rescored
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-score stored submissions with the current evaluator')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', 'sqlite:///physical_design.db'))
+    parser.add_argument('--topic', help='only re-score submissions for this topic')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--restart', action='store_true', help='discard an existing checkpoint')
+    parser.add_argument('--schema', choices=sorted(SCHEMAS), help='database layout (default: detected)')
+    parser.add_argument('--rubric', choices=sorted(RUBRIC_MODULES),
+                        help='scoring rubric (default: the one the schema\'s app uses)')
+    args = parser.parse_args(argv)
+
+    total = rescore(args.database_url, args.topic, args.chunk_size, args.workers, args.checkpoint, args.restart,
+                    args.schema, args.rubric)
+    print(f"🎉 Backfill complete: {total} submissions re-scored")
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,18 @@
-from flask import render_template, request, redirect, url_for, flash, jsonify
+from flask import current_app, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from app import db, limiter
 from models import User, Assignment, Submission, Notification, UserRole
-from evaluator import TechnicalEvaluator, evaluate_technical_submission
+from evaluator import TechnicalEvaluator, evaluate_batch
+from bulk_assignments import BulkAssignments
+from dashboard_counters import DashboardCounters
+from evaluation_queue import EvaluationQueue
+from health_checks import CachedValue, DatabaseProbe
+from http_cache import HTTPCache, SessionVersions
+from evaluation_cache import evaluation_cache
+from fragment_cache import fragment_cache
+from scoring_engine import engine
+import cohort_analytics
+from keyset import filter_submissions, keyset_page, parse_bool, parse_limit
 from functools import wraps
 import datetime
 import random
@@ -24,6 +34,9 @@ def engineer_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Submissions loaded per query when re-scoring a topic
+RESCORE_CHUNK_SIZE = 500
+
 # Topic Questions
 TOPICS = {
     "floorplanning": [
@@ -79,9 +92,78 @@ TOPICS = {
     ]
 }
 
+evaluation_queue = EvaluationQueue()
+
+dashboard_counters = DashboardCounters()
+database_probe = DatabaseProbe()
+health_stats_cache = CachedValue()
+dashboard_counters.define('total_engineers', User,
+                          lambda u: u.role == UserRole.ENGINEER and u.is_active,
+                          db.and_(User.role == UserRole.ENGINEER, User.is_active.is_(True)))
+dashboard_counters.define('total_submissions', Submission)
+dashboard_counters.define('pending_grading', Submission,
+                          lambda s: s.admin_grade is None, Submission.admin_grade.is_(None))
+dashboard_counters.define('graded_submissions', Submission,
+                          lambda s: s.admin_grade is not None and s.is_grade_released is True,
+                          db.and_(Submission.admin_grade.isnot(None), Submission.is_grade_released.is_(True)))
+
+def users_shown(obj):
+    """Users whose own pages display obj"""
+    if isinstance(obj, User):
+        return [obj.id]
+    return [getattr(obj, 'engineer_id', None) or getattr(obj, 'user_id', None)]
+
+# Dashboard ETags, from per-user data versions bumped by each flush
+http_cache = HTTPCache()
+data_versions = SessionVersions(users_of=users_shown)
+
+def new_assignment_notification(row):
+    return {
+        'user_id': row['engineer_id'],
+        'title': 'New Assignment',
+        'message': f"{row['title']} is due on {row['due_date'].strftime('%Y-%m-%d')}",
+        'type': 'assignment',
+        'is_read': False,
+        'created_date': row['created_date']
+    }
+
+bulk_assignments = BulkAssignments(Assignment, Notification, new_assignment_notification)
+
+def evaluate_submission_job(submission_id):
+    """Evaluate a queued submission: submitted -> evaluating -> evaluated"""
+    submission = Submission.query.get(submission_id)
+    if not submission:
+        return
+    
+    submission.status = 'evaluating'
+    db.session.commit()
+    
+    try:
+        evaluation_results = engine.evaluate_submission(
+            submission.answers, submission.assignment.topic, current_app.config.get('SCORING_RUBRIC', 'technical')
+        )
+        submission.overall_score = evaluation_results['overall_score']
+        submission.grade_letter = evaluation_results['grade_letter']
+        submission.evaluation_results = evaluation_results
+        submission.status = 'evaluated'
+        db.session.commit()
+    except Exception:
+        # Leave the submission gradeable by hand
+        db.session.rollback()
+        submission.status = 'submitted'
+        db.session.commit()
+        raise
+
 def register_routes(app):
     """Register all routes with the Flask app"""
     
+    evaluation_queue.init_app(app, evaluate_submission_job)
+    dashboard_counters.init_app(app, db)
+    http_cache.init_app(app)
+    data_versions.init_app(app, db)
+    database_probe.timeout = app.config.get('READINESS_TIMEOUT', 2.0)
+    health_stats_cache.ttl = app.config.get('HEALTH_STATS_TTL', 10.0)
+    
     # Landing page
     @app.route('/')
     def index():
@@ -136,19 +218,12 @@ def register_routes(app):
     @app.route('/admin/dashboard')
     @login_required
     @admin_required
+    @http_cache.conditional(lambda: data_versions.key(current_user.id, everything=True))
     def admin_dashboard():
-        stats = {
-            'total_engineers': User.query.filter_by(role=UserRole.ENGINEER, is_active=True).count(),
-            'total_submissions': Submission.query.count(),
-            'pending_grading': Submission.query.filter(Submission.admin_grade.is_(None)).count(),
-            'graded_submissions': Submission.query.filter(
-                Submission.admin_grade.isnot(None),
-                Submission.is_grade_released == True
-            ).count()
-        }
+        stats = dashboard_counters.snapshot()
         
         recent_activities = []
-        recent_submissions = Submission.query.order_by(Submission.submitted_date.desc()).limit(5).all()
+        recent_submissions = Submission.with_related().order_by(Submission.submitted_date.desc()).limit(5).all()
         
         for submission in recent_submissions:
             recent_activities.append({
@@ -164,7 +239,7 @@ def register_routes(app):
     @admin_required
     def admin_submissions():
         page = request.args.get('page', 1, type=int)
-        submissions = Submission.query.order_by(Submission.submitted_date.desc()).paginate(
+        submissions = Submission.with_related().order_by(Submission.submitted_date.desc()).paginate(
             page=page, per_page=20, error_out=False
         )
         
@@ -176,6 +251,40 @@ def register_routes(app):
                              engineers=engineers, 
                              topics=topics)
     
+    @app.route('/api/admin/submissions')
+    @login_required
+    @admin_required
+    def api_admin_submissions():
+        """Newest-first submissions, keyset paginated and filtered in the database.
+        
+        Query: topic, engineer (username), grade (letter or 'ungraded'),
+        released (true/false), limit, cursor (from next_cursor) and
+        include_total=true to also run a COUNT over the filtered rows.
+        """
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            released = parse_bool(request.args.get('released'))
+            include_total = parse_bool(request.args.get('include_total'))
+            
+            query = filter_submissions(
+                Submission.with_related(), Submission, Assignment, User,
+                topic=request.args.get('topic'), engineer=request.args.get('engineer'),
+                grade=request.args.get('grade'), released=released
+            )
+            
+            total = query.order_by(None).count() if include_total else None
+            submissions, next_cursor = keyset_page(
+                query, Submission.submitted_date, Submission.id, request.args.get('cursor'), limit
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'submissions': [submission.to_dict() for submission in submissions],
+            'next_cursor': next_cursor,
+            'total': total
+        })
+    
     @app.route('/admin/submission/<int:submission_id>')
     @login_required
     @admin_required
@@ -259,12 +368,85 @@ def register_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
     
+    @app.route('/admin/rescore/<topic>', methods=['POST'])
+    @login_required
+    @admin_required
+    def rescore_topic(topic):
+        """Re-run evaluation with the configured SCORING_RUBRIC for every submission on a topic.
+        
+        Submissions are read in id order, RESCORE_CHUNK_SIZE at a time, and
+        each chunk is committed before the next is loaded, so memory stays
+        flat however many submissions the topic has.
+        """
+        if topic not in TOPICS:
+            return jsonify({'error': 'Unknown topic'}), 404
+        
+        rubric = current_app.config.get('SCORING_RUBRIC', 'technical')
+        try:
+            rescored = 0
+            last_id = 0
+            while True:
+                submissions = (Submission.query.join(Assignment)
+                               .filter(Assignment.topic == topic, Submission.id > last_id)
+                               .order_by(Submission.id).limit(RESCORE_CHUNK_SIZE).all())
+                if not submissions:
+                    break
+                # Same scores as evaluate_submission_job gives new submissions; see rescore._score_rows
+                if rubric == 'technical':
+                    results = evaluate_batch((submission.answers, topic) for submission in submissions)
+                else:
+                    results = [engine.evaluate_submission(submission.answers, topic, rubric)
+                               for submission in submissions]
+                
+                for submission, evaluation_results in zip(submissions, results):
+                    submission.overall_score = evaluation_results['overall_score']
+                    submission.grade_letter = evaluation_results['grade_letter']
+                    submission.evaluation_results = evaluation_results
+                    if submission.status == 'submitted':
+                        submission.status = 'evaluated'
+                
+                last_id = submissions[-1].id
+                rescored += len(submissions)
+                db.session.commit()
+            
+            return jsonify({
+                'success': True,
+                'message': f'Re-scored {rescored} {topic} submissions',
+                'rescored': rescored
+            })
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+    
+    @app.route('/admin/analytics/<topic>')
+    @login_required
+    @admin_required
+    def topic_analytics(topic):
+        """Cohort-wide score, term frequency and concept gap summary for a topic"""
+        if topic not in TOPICS:
+            return jsonify({'error': 'Unknown topic'}), 404
+        if not cohort_analytics.HAS_NUMPY:
+            return jsonify({'error': 'Cohort analytics require NumPy'}), 501
+        
+        rows = db.session.query(Submission.answers).join(Assignment).filter(Assignment.topic == topic).all()
+        answers = [answer for (submission_answers,) in rows for answer in submission_answers]
+        
+        return jsonify(cohort_analytics.cohort_aggregates(answers, topic))
+    
     # Engineer routes
     @app.route('/engineer/dashboard')
     @login_required
     @engineer_required
+    @http_cache.conditional(lambda: data_versions.key(current_user.id))
     def engineer_dashboard():
-        assignments = Assignment.query.filter_by(engineer_id=current_user.id).all()
+        # Only the assignment list is cached: the page around it carries flashed
+        # messages and the CSRF token, which differ per request
+        assignment_list = fragment_cache.render(
+            'engineer_assignment_list', current_user.id, data_versions.key(current_user.id),
+            lambda: render_template('engineer_assignment_list.html',
+                                    assignments=Assignment.query.filter_by(engineer_id=current_user.id).all())
+        )
         submissions = Submission.query.filter_by(
             engineer_id=current_user.id,
             is_grade_released=True
@@ -275,7 +457,7 @@ def register_routes(app):
         ).order_by(Notification.created_date.desc()).limit(5).all()
         
         return render_template('engineer_dashboard.html',
-                             assignments=assignments,
+                             assignment_list=assignment_list,
                              submissions=submissions,
                              notifications=notifications)
     
@@ -336,21 +518,14 @@ def register_routes(app):
             db.session.add(submission)
             db.session.commit()
             
-            # Evaluate submission
-            try:
-                evaluation_results = evaluate_technical_submission(answers, assignment.topic)
-                submission.overall_score = evaluation_results['overall_score']
-                submission.grade_letter = evaluation_results['grade_letter']
-                submission.evaluation_results = evaluation_results
-                submission.status = 'evaluated'
-                db.session.commit()
-            except Exception as e:
-                print(f"Evaluation failed: {e}")
+            # Evaluate in the background so the worker is freed immediately
+            evaluation_queue.enqueue(submission.id)
             
             return jsonify({
                 'success': True,
                 'message': 'Assignment submitted successfully!',
-                'submission_id': submission.id
+                'submission_id': submission.id,
+                'status': 'queued'
             })
             
         except Exception as e:
@@ -366,30 +541,31 @@ def register_routes(app):
         try:
             engineers = User.query.filter_by(role=UserRole.ENGINEER).all()
             
-            for engineer in engineers:
-                # Check if engineer already has assignments
-                existing = Assignment.query.filter_by(engineer_id=engineer.id).first()
-                if existing:
-                    continue
-                
-                # Create one assignment per topic
-                for topic in TOPICS.keys():
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    assignment_id = f"PD_{topic.upper()}_{engineer.engineer_id}_{timestamp}"
-                    
-                    assignment = Assignment(
-                        id=assignment_id,
-                        title=f"{topic.title()} Technical Assessment",
-                        topic=topic,
-                        engineer_id=engineer.id,
-                        questions=TOPICS[topic],
-                        due_date=datetime.date.today() + datetime.timedelta(days=7),
-                        points=120,
-                        assigned_by_admin=current_user.id
-                    )
-                    
-                    db.session.add(assignment)
+            # Skip engineers who already have assignments, found with one IN query
+            engineer_ids = [engineer.id for engineer in engineers]
+            assigned = set(db.session.scalars(
+                db.select(Assignment.engineer_id).where(Assignment.engineer_id.in_(engineer_ids)).distinct()
+            )) if engineer_ids else set()
+            
+            # Create one assignment per topic
+            now = datetime.datetime.utcnow()
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            due_date = datetime.date.today() + datetime.timedelta(days=7)
+            rows = [{
+                'id': f"PD_{topic.upper()}_{engineer.engineer_id}_{timestamp}",
+                'title': f"{topic.title()} Technical Assessment",
+                'topic': topic,
+                'engineer_id': engineer.id,
+                'questions': TOPICS[topic],
+                'created_date': now,
+                'due_date': due_date,
+                'points': 120,
+                'is_active': True,
+                'assigned_by_admin': current_user.id
+            } for engineer in engineers if engineer.id not in assigned for topic in TOPICS]
             
+            created = bulk_assignments.create(db.session, rows)
+            data_versions.bump(db.session, *{row['engineer_id'] for row in created})
             db.session.commit()
             return jsonify({'success': True, 'message': 'Demo assignments created'})
             
@@ -397,10 +573,35 @@ def register_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
     
+    @app.route('/livez')
+    def livez():
+        """Liveness: the process is serving requests; touches nothing else"""
+        return jsonify({'status': 'alive'})
+    
+    @app.route('/readyz')
+    def readyz():
+        """Readiness: the database answers SELECT 1 within the probe timeout"""
+        ready, error = database_probe.check(db.engine)
+        if not ready:
+            return jsonify({'status': 'unavailable', 'error': error}), 503
+        return jsonify({'status': 'ready'})
+    
     @app.route('/health')
     def health():
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.datetime.utcnow().isoformat(),
-            'system': 'Physical Design Assignment System v2.0'
+            'system': 'Physical Design Assignment System v2.0',
+            'evaluation_cache': evaluation_cache.stats(),
+            'fragment_cache': fragment_cache.stats()
         })
+    
+    @app.route('/health/stats')
+    def health_stats():
+        """Health plus dashboard counts, rebuilt at most every HEALTH_STATS_TTL seconds"""
+        return jsonify(health_stats_cache.get(lambda: {
+            'status': 'healthy',
+            'timestamp': datetime.datetime.utcnow().isoformat(),
+            'evaluation_cache': evaluation_cache.stats(),
+            'statistics': dashboard_counters.snapshot()
+        }))
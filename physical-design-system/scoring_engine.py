@@ -0,0 +1,284 @@
+# scoring_engine.py - One scoring pipeline shared by every rubric
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List
+
+try:
+    from .evaluation_cache import evaluation_cache
+except ImportError:  # imported as a top-level module inside physical-design-system/
+    from evaluation_cache import evaluation_cache
+
+TOKEN_PATTERN = re.compile(r'\S+')
+# Words for term matching; hyphens and slashes split, 'A*' keeps its star
+TERM_TOKEN_PATTERN = re.compile(r'\w+\*?')
+STRUCTURE_MARKERS = ('1.', '2.', 'first', 'second', 'step', 'approach', 'strategy')
+EXAMPLE_MARKERS = ('example', 'for instance', 'such as', 'e.g.', 'like')
+# Bumped whenever matching semantics change, so cached scores are not reused
+MATCHING_VERSION = 'tokens-2'
+
+# Longer suffixes precede the shorter ones they end with; an inflectional
+# suffix is only removed if at least three letters remain
+STEM_SUFFIXES = (
+    'izations', 'ization', 'ations', 'ation', 'ating', 'ated', 'ions', 'ion',
+    'izing', 'ized', 'izes', 'ize', 'ments', 'ment', 'ings', 'ing', 'ed', 'es'
+)
+INFLECTIONAL_SUFFIXES = ('ed', 'es')
+# Derivational suffixes need a longer stem, so "timing" does not become "tim"
+MIN_DERIVED_STEM = 4
+# Words whose derived forms are different terms: "in place of" is not
+# placement, a metal stack is not via stacking. A derivational suffix is
+# kept when stripping it would leave one of these. Each entry is pinned in
+# test_scoring_engine.py to the terms it keeps apart; "setup time" vs
+# timing needs no entry, since MIN_DERIVED_STEM already keeps "timing".
+BASE_WORDS = frozenset({'design', 'place', 'stack', 'state'})
+
+def _strippable(token, suffix):
+    stem_length = len(token) - len(suffix)
+    if suffix in INFLECTIONAL_SUFFIXES:
+        return stem_length >= 3
+    base = token[:stem_length]
+    return stem_length >= MIN_DERIVED_STEM and base not in BASE_WORDS and base + 'e' not in BASE_WORDS
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Light suffix stripping so "placements" and "placement" or "legalized" and "legalization" agree"""
+    for _ in range(3):
+        if token.endswith('ies') and len(token) > 4:
+            token = token[:-3] + 'y'
+            continue
+        for suffix in STEM_SUFFIXES:
+            if token.endswith(suffix) and _strippable(token, suffix):
+                token = token[:-len(suffix)]
+                if token[-1] == token[-2] and token[-1] not in 'lsz':
+                    token = token[:-1]  # spinning -> spin
+                break
+        else:
+            if token.endswith('s') and len(token) > 3 and token[-2] not in 'siu':
+                token = token[:-1]
+            else:
+                break
+    if token.endswith('e') and len(token) > 3:
+        token = token[:-1]
+    return token
+
+@lru_cache(maxsize=16384)
+def phrase_key(phrase: str) -> str:
+    """Space-joined stems a phrase is indexed and looked up under"""
+    return ' '.join(map(stem, TERM_TOKEN_PATTERN.findall(phrase.lower())))
+
+class AnalyzedAnswer:
+    """Facts about one answer, derived once and shared by every rubric.
+
+    Token offsets, numeric spans, marker flags and the term index are
+    computed on first access, since not every rubric needs them. Rubrics
+    use different unit patterns, so spans are kept per pattern.
+    """
+
+    __slots__ = (
+        'text', 'lower', 'stripped_length', 'word_count',
+        '_offsets', '_numeric', '_markers', '_stems', '_index', '_index_length'
+    )
+
+    def __init__(self, answer):
+        self.text = answer or ''
+        self.lower = self.text.lower()
+        self.stripped_length = len(self.text.strip())
+        self.word_count = len(self.text.split())
+        self._offsets = None
+        self._numeric = {}
+        self._markers = None
+        self._stems = None
+        self._index = None
+        self._index_length = 0
+
+    @property
+    def token_offsets(self):
+        """(start, end) of every whitespace-separated word in text"""
+        if self._offsets is None:
+            self._offsets = [match.span() for match in TOKEN_PATTERN.finditer(self.text)]
+        return self._offsets
+
+    def term_index(self, max_length):
+        """Set of stemmed n-grams up to max_length words, for O(1) phrase probes"""
+        if self._index is None or self._index_length < max_length:
+            if self._stems is None:
+                self._stems = list(map(stem, TERM_TOKEN_PATTERN.findall(self.lower)))
+            stems = self._stems
+            index = set(stems)
+            for size in range(2, max_length + 1):
+                index.update(map(' '.join, zip(*(stems[i:] for i in range(size)))))
+            self._index = index
+            self._index_length = max_length
+        return self._index
+
+    def contains(self, phrase):
+        """True if phrase occurs as whole words, allowing inflected forms"""
+        key = phrase_key(phrase)
+        return bool(key) and key in self.term_index(key.count(' ') + 1)
+
+    def numeric_spans(self, pattern):
+        """(start, end) of every number-with-unit matched by pattern"""
+        spans = self._numeric.get(pattern)
+        if spans is None:
+            spans = self._numeric[pattern] = [match.span() for match in pattern.finditer(self.text)]
+        return spans
+
+    def numeric_count(self, pattern):
+        """Number of numbers-with-unit matched by pattern"""
+        return len(self.numeric_spans(pattern))
+
+    def _has_marker(self, marker):
+        # Punctuation markers such as '1.' and 'e.g.' have no word form to index
+        if marker.replace(' ', '').isalpha():
+            return self.contains(marker)
+        return marker in self.lower
+
+    def _marker_flags(self):
+        if self._markers is None:
+            self._markers = (
+                any(self._has_marker(marker) for marker in STRUCTURE_MARKERS),
+                any(self._has_marker(marker) for marker in EXAMPLE_MARKERS)
+            )
+        return self._markers
+
+    @property
+    def has_structure(self):
+        return self._marker_flags()[0]
+
+    @property
+    def has_examples(self):
+        return self._marker_flags()[1]
+
+class TermMatcher:
+    """Precompiled lexicon matcher.
+
+    Phrases from every rubric being applied are merged into one table keyed
+    by their normalized token sequence, so 'IR drop', 'ir drop' and
+    'IR drops' share a single hash probe into the answer's term index.
+    Matches respect word boundaries: 'via' does not match "deviation".
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = tuple(dict.fromkeys(phrases))
+        by_key = {}
+        for phrase in self.phrases:
+            key = phrase_key(phrase)
+            if key:
+                by_key.setdefault(key, []).append(phrase)
+        self.entries = tuple((key, tuple(group)) for key, group in by_key.items())
+        self.max_length = max((key.count(' ') + 1 for key in by_key), default=1)
+
+    def find(self, analyzed: 'AnalyzedAnswer') -> FrozenSet[str]:
+        """Return every lexicon phrase that occurs in the answer"""
+        index = analyzed.term_index(self.max_length)
+        return frozenset(phrase for key, group in self.entries if key in index for phrase in group)
+
+class ScoringStrategy:
+    """A rubric plugged into the ScoringEngine.
+
+    Strategies declare the phrases they look for and score from the shared
+    match results instead of scanning the answer themselves. Set
+    lexicon_version to a fingerprint of the strategy's tables to have its
+    per-answer results memoized in the evaluation cache.
+    """
+
+    name = None
+    lexicon_version = None
+
+    def phrases(self, topic, question_index) -> Iterable[str]:
+        """Phrases this rubric checks for, as they appear in lowercased text"""
+        return ()
+
+    def score_answer(self, analyzed, hits, topic, question_index):
+        """Score one AnalyzedAnswer; hits holds every matched phrase from phrases()"""
+        raise NotImplementedError
+
+    def summarize(self, results, analyzed_answers, topic):
+        """Combine per-answer results into a submission-level evaluation"""
+        return {'question_analyses': results}
+
+class ScoringEngine:
+    """Registry of rubrics that normalizes and matches each answer once"""
+
+    def __init__(self):
+        self._factories = {}
+        self._strategies = {}
+        self._matchers = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory):
+        """Register a rubric; factory is called once, on first use"""
+        with self._lock:
+            self._factories[name] = factory
+            self._strategies.pop(name, None)
+            self._matchers.clear()
+
+    def rubrics(self) -> List[str]:
+        return sorted(self._factories)
+
+    def strategy(self, name) -> ScoringStrategy:
+        strategy = self._strategies.get(name)
+        if strategy is None:
+            if name not in self._factories:
+                raise KeyError(f"Unknown scoring rubric: {name}")
+            with self._lock:
+                strategy = self._strategies.get(name)
+                if strategy is None:
+                    strategy = self._strategies[name] = self._factories[name]()
+        return strategy
+
+    def _matcher(self, names, topic, question_index) -> TermMatcher:
+        key = (names, topic, question_index)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            phrases = []
+            for name in names:
+                phrases.extend(self.strategy(name).phrases(topic, question_index))
+            matcher = self._matchers[key] = TermMatcher(phrases)
+        return matcher
+
+    def score_answer(self, answer, topic, question_index, rubrics):
+        """Score one answer with one rubric, or several sharing one match pass.
+
+        answer may be raw text or an AnalyzedAnswer. Pass a rubric name to
+        get that rubric's result, or a list of names to get a
+        {name: result} dict. Cached results skip analysis entirely.
+        """
+        single = isinstance(rubrics, str)
+        names = (rubrics,) if single else tuple(rubrics)
+        analyzed = answer if isinstance(answer, AnalyzedAnswer) else None
+        text = analyzed.text if analyzed is not None else answer
+        shared = {}
+
+        def compute(name):
+            if 'hits' not in shared:
+                shared['analyzed'] = analyzed or AnalyzedAnswer(text)
+                shared['hits'] = self._matcher(names, topic, question_index).find(shared['analyzed'])
+            return self.strategy(name).score_answer(shared['analyzed'], shared['hits'], topic, question_index)
+
+        results = {}
+        for name in names:
+            version = self.strategy(name).lexicon_version
+            if version is None:
+                results[name] = compute(name)
+            else:
+                results[name] = evaluation_cache.get_or_compute(
+                    topic, question_index, f'{version}:{MATCHING_VERSION}', text, lambda name=name: compute(name)
+                )
+
+        return results[rubrics] if single else results
+
+    def score_analyzed(self, analyzed, topic, question_index, rubric):
+        """Score an AnalyzedAnswer with one rubric, bypassing the evaluation cache"""
+        hits = self._matcher((rubric,), topic, question_index).find(analyzed)
+        return self.strategy(rubric).score_answer(analyzed, hits, topic, question_index)
+
+    def evaluate_submission(self, answers, topic, rubric) -> Dict:
+        """Score every answer of a submission and summarize with the rubric"""
+        analyzed_answers = [AnalyzedAnswer(answer) for answer in answers]
+        results = [self.score_answer(analyzed, topic, i, rubric) for i, analyzed in enumerate(analyzed_answers)]
+        return self.strategy(rubric).summarize(results, analyzed_answers, topic)
+
+# Process-wide engine; each scorer module registers its rubric on import
+engine = ScoringEngine()
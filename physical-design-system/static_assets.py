@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Fingerprinted, precompressed CSS/JS for the page templates.
+
+Stylesheets and scripts live in assets/. The build step copies each one
+to assets/build/ under a content-hashed name (admin_dashboard.3f2a9c1d7e4b.css),
+writes .gz and, when the brotli package is installed, .br variants next
+to it, and records the names in manifest.json. Because a file's name
+changes whenever its content does, the served files can be cached by
+browsers and proxies for a year as immutable.
+
+Templates reference assets through asset_url('admin_dashboard.css').
+Apps only load the manifest on startup; the build runs once per deploy
+(the Procfile release phase), not in every worker:
+
+    python static_assets.py            # build assets/build/
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from flask import abort, request, send_file
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped without it
+    brotli = None
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+BUILD_DIR = os.path.join(ASSET_DIR, 'build')
+MANIFEST = 'manifest.json'
+
+# Served types; Flask adds charset=utf-8 to text/*, which keeps the emoji in the scripts intact
+MIMETYPES = {
+    '.css': 'text/css',
+    '.js': 'text/javascript'
+}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+logger = logging.getLogger(__name__)
+
+def _write(path, data):
+    """Write atomically, so concurrent workers never serve a partial file"""
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, path)
+
+def _sources(source_dir):
+    return sorted(name for name in os.listdir(source_dir)
+                  if os.path.splitext(name)[1] in MIMETYPES)
+
+def build(source_dir=ASSET_DIR, build_dir=BUILD_DIR):
+    """Fingerprint and precompress every asset; return the manifest"""
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {}
+    for name in _sources(source_dir):
+        with open(os.path.join(source_dir, name), 'rb') as f:
+            data = f.read()
+        stem, ext = os.path.splitext(name)
+        fingerprinted = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+        manifest[name] = fingerprinted
+
+        path = os.path.join(build_dir, fingerprinted)
+        if os.path.exists(path):
+            continue  # content-addressed: already built
+        _write(f'{path}.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write(f'{path}.br', brotli.compress(data, quality=11))
+        _write(path, data)
+
+    # Earlier fingerprints stay on disk for pages rendered before a deploy
+    _write(os.path.join(build_dir, MANIFEST), json.dumps(manifest, indent=2).encode())
+    logger.info('Built %d assets into %s%s', len(manifest), build_dir,
+                '' if brotli else ' (gzip only, brotli not installed)')
+    return manifest
+
+def _is_stale(source_dir, build_dir):
+    manifest_path = os.path.join(build_dir, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return True
+    built = os.path.getmtime(manifest_path)
+    return any(os.path.getmtime(os.path.join(source_dir, name)) > built for name in _sources(source_dir))
+
+class StaticAssets:
+    """Serve the built assets with immutable caching and precompressed variants"""
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        self.files = set()
+        self.build_dir = BUILD_DIR
+        self.url_prefix = '/assets'
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        source_dir = app.config.get('ASSET_SOURCE_DIR', ASSET_DIR)
+        self.build_dir = app.config.get('ASSET_BUILD_DIR', os.path.join(source_dir, 'build'))
+        self.url_prefix = app.config.get('ASSET_URL_PREFIX', '/assets')
+
+        manifest_path = os.path.join(self.build_dir, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise RuntimeError(f'No asset manifest in {self.build_dir}; run `python static_assets.py` first')
+        if _is_stale(source_dir, self.build_dir):
+            logger.warning('Assets in %s changed since the last build; run `python static_assets.py`', source_dir)
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+        self.files = set(self.manifest.values())
+
+        app.add_url_rule(f'{self.url_prefix}/<filename>', 'static_assets', self.serve)
+        app.jinja_env.globals['asset_url'] = self.url
+        app.extensions['static_assets'] = self
+
+    def url(self, name):
+        """URL of the current fingerprinted build of asset `name`"""
+        return f'{self.url_prefix}/{self.manifest[name]}'
+
+    def serve(self, filename):
+        if filename not in self.files:
+            abort(404)
+
+        path = os.path.join(self.build_dir, filename)
+        encoding = None
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if request.accept_encodings[candidate] and os.path.exists(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        response = send_file(path, mimetype=MIMETYPES[os.path.splitext(filename)[1]], conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    build()
@@ -0,0 +1,338 @@
+# storage.py - Pluggable persistence for the dict-backed app variants
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # only needed for redis:// storage URLs
+    redis = None
+
+class DictStore(MutableMapping):
+    """Plain in-process dict; values are the live objects (the original behaviour)"""
+
+    def __init__(self, indexed=()):
+        self.indexed = tuple(indexed)
+        self._data = {}
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def find(self, **criteria):
+        """Values whose fields equal every criterion, in insertion order"""
+        return [value for value in self._data.values()
+                if all(value.get(field) == wanted for field, wanted in criteria.items())]
+
+class AssignmentStore(DictStore):
+    """DictStore for assignments with by_engineer and by_status index maps.
+
+    Each map goes from a field value to the keys holding it, so dashboard
+    lookups cost O(result) instead of a scan over every assignment. Values
+    are live dicts; a status change (pending -> submitted -> under_review ->
+    published/completed) reaches the indexes when the assignment is written
+    back with store[key] = assignment, as the routes already do.
+    """
+
+    def __init__(self):
+        super().__init__(('engineer_id', 'status'))
+        self.by_engineer = {}
+        self.by_status = {}
+        self._indexed_values = {}  # key -> (engineer_id, status) as last indexed
+        self._sequence = {}  # key -> insertion number, to keep results in insertion order
+        self._next_sequence = itertools.count()
+
+    def _unindex(self, key):
+        engineer_id, status = self._indexed_values.pop(key)
+        for index, value in ((self.by_engineer, engineer_id), (self.by_status, status)):
+            bucket = index[value]
+            del bucket[key]
+            if not bucket:
+                del index[value]
+
+    def __setitem__(self, key, value):
+        if key in self._indexed_values:
+            self._unindex(key)
+        else:
+            self._sequence[key] = next(self._next_sequence)
+        engineer_id, status = value.get('engineer_id'), value.get('status')
+        self.by_engineer.setdefault(engineer_id, {})[key] = None
+        self.by_status.setdefault(status, {})[key] = None
+        self._indexed_values[key] = (engineer_id, status)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._unindex(key)
+        del self._sequence[key]
+
+    def find(self, **criteria):
+        if not criteria or set(criteria) - {'engineer_id', 'status'}:
+            return super().find(**criteria)
+
+        engineer_id, status = criteria.get('engineer_id'), criteria.get('status')
+        buckets = []
+        if 'engineer_id' in criteria:
+            buckets.append(self.by_engineer.get(engineer_id, {}))
+        if 'status' in criteria:
+            buckets.append(self.by_status.get(status, {}))
+        # Walk the smaller bucket and check the other criterion against the indexed values
+        keys = [key for key in min(buckets, key=len)
+                if ('engineer_id' not in criteria or self._indexed_values[key][0] == engineer_id)
+                and ('status' not in criteria or self._indexed_values[key][1] == status)]
+        return [self[key] for key in sorted(keys, key=self._sequence.__getitem__)]
+
+class MemoryStorage:
+    """Per-process storage: lost on restart and not shared between workers"""
+
+    # Collections with a specialised in-memory store; others are plain DictStores
+    STORES = {'assignments': AssignmentStore}
+    shared = False
+
+    def __init__(self, url=None):
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name, indexed=()):
+        store = self.STORES.get(name)
+        if store is not None:
+            return store()
+        return DictStore(indexed)
+
+    def next_id(self, name):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+            return self._counters[name]
+
+    def current_id(self, name):
+        return self._counters.get(name, 0)
+
+class SQLiteStore(MutableMapping):
+    """JSON values in a SQLite table, with a column and index per indexed field.
+
+    Values are copies: write them back (store[key] = value) after changing them.
+    """
+
+    def __init__(self, storage, name, indexed=()):
+        self.storage = storage
+        self.table = name
+        self.indexed = tuple(indexed)
+        columns = ''.join(f', "{field}"' for field in self.indexed)
+        self._upsert = (
+            f'INSERT INTO "{name}" (key, value{columns}) VALUES (?, ?{", ?" * len(self.indexed)}) '
+            f'ON CONFLICT(key) DO UPDATE SET value = excluded.value'
+            + ''.join(f', "{field}" = excluded."{field}"' for field in self.indexed)
+        )
+
+        connection = storage.connection()
+        connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" (key TEXT PRIMARY KEY, value TEXT NOT NULL'
+            + ''.join(f', "{field}"' for field in self.indexed) + ')'
+        )
+        for field in self.indexed:
+            connection.execute(f'CREATE INDEX IF NOT EXISTS "ix_{name}_{field}" ON "{name}" ("{field}")')
+
+    def __getitem__(self, key):
+        row = self.storage.connection().execute(f'SELECT value FROM "{self.table}" WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key, value):
+        fields = tuple(value.get(field) for field in self.indexed) if self.indexed else ()
+        self.storage.connection().execute(self._upsert, (key, json.dumps(value)) + fields)
+
+    def __delitem__(self, key):
+        cursor = self.storage.connection().execute(f'DELETE FROM "{self.table}" WHERE key = ?', (key,))
+        if not cursor.rowcount:
+            raise KeyError(key)
+
+    def __iter__(self):
+        rows = self.storage.connection().execute(f'SELECT key FROM "{self.table}" ORDER BY rowid').fetchall()
+        return (key for (key,) in rows)
+
+    def __len__(self):
+        return self.storage.connection().execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def values(self):
+        rows = self.storage.connection().execute(f'SELECT value FROM "{self.table}" ORDER BY rowid').fetchall()
+        return [json.loads(value) for (value,) in rows]
+
+    def find(self, **criteria):
+        unindexed = set(criteria) - set(self.indexed)
+        if unindexed:
+            raise ValueError(f'Not indexed: {", ".join(sorted(unindexed))}')
+        where = ' AND '.join(f'"{field}" = ?' for field in criteria) or '1'
+        rows = self.storage.connection().execute(
+            f'SELECT value FROM "{self.table}" WHERE {where} ORDER BY rowid', tuple(criteria.values())
+        ).fetchall()
+        return [json.loads(value) for (value,) in rows]
+
+class SQLiteStorage:
+    """Storage in one SQLite file in WAL mode, shared by every worker on the host"""
+
+    shared = True
+
+    def __init__(self, url):
+        self.path = urlparse(url).path.lstrip('/') or 'pd_storage.db'
+        if url.startswith('sqlite:////'):
+            self.path = '/' + self.path
+        self._local = threading.local()
+        self.connection().execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+
+    def connection(self):
+        """This thread's connection (autocommit; sqlite3 connections are not thread-safe)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def collection(self, name, indexed=()):
+        return SQLiteStore(self, name, indexed)
+
+    def next_id(self, name):
+        return self.connection().execute(
+            'INSERT INTO counters (name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + 1 RETURNING value', (name,)
+        ).fetchone()[0]
+
+    def current_id(self, name):
+        row = self.connection().execute('SELECT value FROM counters WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else 0
+
+class RedisStore(MutableMapping):
+    """JSON values in a Redis hash, with a set per indexed field value.
+
+    A sorted set keeps insertion order so iteration matches the dict
+    backend. Values are copies: write them back after changing them.
+    """
+
+    def __init__(self, storage, name, indexed=()):
+        self.client = storage.client
+        self.key = f'{storage.prefix}{name}'
+        self.order_key = f'{self.key}:order'
+        self.sequence_key = f'{self.key}:sequence'
+        self.indexed = tuple(indexed)
+
+    def _index_key(self, field, value):
+        return f'{self.key}:{field}:{json.dumps(value)}'
+
+    def __getitem__(self, key):
+        raw = self.client.hget(self.key, key)
+        if raw is None:
+            raise KeyError(key)
+        return json.loads(raw)
+
+    def __setitem__(self, key, value):
+        def update(pipe):
+            raw = pipe.hget(self.key, key)
+            old = json.loads(raw) if raw is not None else None
+            sequence = None if raw is not None else pipe.incr(self.sequence_key)
+            pipe.multi()
+            pipe.hset(self.key, key, json.dumps(value))
+            if sequence is not None:
+                pipe.zadd(self.order_key, {key: sequence})
+            for field in self.indexed:
+                if old is not None:
+                    pipe.srem(self._index_key(field, old.get(field)), key)
+                pipe.sadd(self._index_key(field, value.get(field)), key)
+        self.client.transaction(update, self.key)
+
+    def __delitem__(self, key):
+        def delete(pipe):
+            raw = pipe.hget(self.key, key)
+            if raw is None:
+                raise KeyError(key)
+            old = json.loads(raw)
+            pipe.multi()
+            pipe.hdel(self.key, key)
+            pipe.zrem(self.order_key, key)
+            for field in self.indexed:
+                pipe.srem(self._index_key(field, old.get(field)), key)
+        self.client.transaction(delete, self.key)
+
+    def __iter__(self):
+        return iter(self.client.zrange(self.order_key, 0, -1))
+
+    def __len__(self):
+        return self.client.hlen(self.key)
+
+    def _load(self, keys):
+        if not keys:
+            return []
+        return [json.loads(raw) for raw in self.client.hmget(self.key, keys) if raw is not None]
+
+    def values(self):
+        return self._load(list(self))
+
+    def find(self, **criteria):
+        unindexed = set(criteria) - set(self.indexed)
+        if unindexed:
+            raise ValueError(f'Not indexed: {", ".join(sorted(unindexed))}')
+        if not criteria:
+            return self.values()
+        matches = self.client.sinter([self._index_key(field, value) for field, value in criteria.items()])
+        order = {key: i for i, key in enumerate(self)} if len(matches) > 1 else {}
+        return self._load(sorted(matches, key=lambda key: order.get(key, 0)))
+
+class RedisStorage:
+    """Storage on a Redis-compatible server, shared by every worker and host"""
+
+    shared = True
+
+    def __init__(self, url):
+        if redis is None:
+            raise RuntimeError('redis:// storage needs the redis package: pip install redis')
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = os.environ.get('STORAGE_PREFIX', 'pd:')
+
+    def collection(self, name, indexed=()):
+        return RedisStore(self, name, indexed)
+
+    def next_id(self, name):
+        return self.client.incr(f'{self.prefix}counter:{name}')
+
+    def current_id(self, name):
+        return int(self.client.get(f'{self.prefix}counter:{name}') or 0)
+
+# Storage backends selectable through STORAGE_URL's scheme
+BACKENDS = {
+    'memory': MemoryStorage,
+    'sqlite': SQLiteStorage,
+    'redis': RedisStorage
+}
+
+def register_backend(scheme, factory):
+    """Make another storage backend selectable by URL scheme"""
+    BACKENDS[scheme] = factory
+
+def open_storage(url=None):
+    """Open the storage named by url or $STORAGE_URL (memory:// by default).
+
+    memory://                   per-process dicts
+    sqlite:///pd_storage.db     SQLite file in WAL mode (relative path)
+    redis://localhost:6379/0    Redis-compatible server
+    """
+    url = url or os.environ.get('STORAGE_URL', 'memory://')
+    scheme = urlparse(url).scheme
+    if scheme not in BACKENDS:
+        raise ValueError(f'Unknown storage backend: {scheme}')
+    return BACKENDS[scheme](url)
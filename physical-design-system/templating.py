@@ -0,0 +1,37 @@
+# templating.py - Compile-once rendering for templates kept inline in Python source
+import os
+
+from flask import render_template
+from jinja2 import ChoiceLoader, DictLoader, FileSystemBytecodeCache
+
+class InlineTemplates:
+    """Serve template strings defined in route code through the app's Jinja loader.
+
+    render_template_string compiles its source on every call. Registering
+    the source under a name instead lets Jinja keep the compiled template
+    in its cache, and the bytecode cache lets restarts and other workers
+    skip compilation as well.
+    """
+
+    def __init__(self, app=None):
+        self.sources = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.jinja_env.loader = ChoiceLoader([DictLoader(self.sources), app.jinja_env.loader])
+        cache_dir = app.config.get('TEMPLATE_CACHE_DIR')
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        app.extensions['inline_templates'] = self
+
+    def register(self, name, source):
+        """Make source loadable as `name`, e.g. a base template for {% extends %}"""
+        if self.sources.get(name) is not source:
+            self.sources[name] = source
+
+    def render(self, name, source, **context):
+        """Render source as template `name`; it is only compiled the first time"""
+        self.register(name, source)
+        return render_template(name, **context)
@@ -0,0 +1,13 @@
+# conftest.py - Import the app modules from the parent directory, on a throwaway database
+import os
+import sys
+
+# app_working creates its tables on import; keep them in memory
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Apps only load the asset manifest; build it the way the release phase does
+import static_assets  # noqa: E402
+
+static_assets.build()
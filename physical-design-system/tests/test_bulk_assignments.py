@@ -0,0 +1,87 @@
+# test_bulk_assignments.py - Bulk assignment creation is idempotent
+import datetime
+import json
+
+import pytest
+
+from app_working import Assignment, Notification, app, bulk_assignments, dashboard_counters, db
+
+def rows(prefix, count, engineer_id=1):
+    return [{
+        'id': f'{prefix}_{i}',
+        'title': f'Bulk {i}',
+        'topic': 'placement',
+        'engineer_id': engineer_id,
+        'questions': json.dumps(['Q']),
+        'created_date': datetime.datetime(2026, 1, 1),
+        'due_date': datetime.date(2026, 1, 15),
+        'points': 150
+    } for i in range(count)]
+
+def count(model, *criteria):
+    return db.session.query(model).filter(*criteria).count()
+
+@pytest.fixture
+def session():
+    with app.app_context():
+        yield db.session
+        db.session.rollback()
+        Assignment.query.filter(Assignment.id.like('BULK%')).delete(synchronize_session=False)
+        Notification.query.filter(Notification.message.like('Bulk %')).delete(synchronize_session=False)
+        db.session.commit()
+
+def test_repeat_creates_nothing(session):
+    first = bulk_assignments.create(session, rows('BULK', 1200))
+    session.commit()
+    second = bulk_assignments.create(session, rows('BULK', 1200))
+    session.commit()
+
+    assert len(first) == 1200
+    assert second == []
+    assert count(Assignment, Assignment.id.like('BULK%')) == 1200
+
+def test_duplicate_input_rows_are_inserted_once(session):
+    created = bulk_assignments.create(session, rows('BULK', 5) * 3)
+    assert [row['id'] for row in created] == [f'BULK_{i}' for i in range(5)]
+
+def test_only_new_rows_are_inserted_and_notified(session):
+    notifications = count(Notification)
+    bulk_assignments.create(session, rows('BULK', 3))
+    session.commit()
+
+    created = bulk_assignments.create(session, rows('BULK', 8))
+    session.commit()
+
+    assert [row['id'] for row in created] == [f'BULK_{i}' for i in range(3, 8)]
+    assert count(Notification) == notifications + 8
+
+def test_rows_inserted_concurrently_are_skipped(session, monkeypatch):
+    bulk_assignments.create(session, rows('BULK', 2))
+    session.commit()
+    # Another worker inserted BULK_0 and BULK_1 after our existence check
+    monkeypatch.setattr(bulk_assignments, 'existing_ids', lambda session, ids: set())
+
+    created = bulk_assignments.create(session, rows('BULK', 4))
+    session.commit()
+
+    assert [row['id'] for row in created] == ['BULK_2', 'BULK_3']
+    assert count(Assignment, Assignment.id.like('BULK%')) == 4
+
+def test_create_full_system_twice():
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    day = datetime.datetime.now().strftime('%Y%m%d')
+    with app.app_context():
+        Assignment.query.filter(Assignment.id.like(f'PD_%_{day}')).delete(synchronize_session=False)
+        db.session.commit()
+        dashboard_counters.reconcile()
+
+    first = client.post('/api/create-full-system').get_json()
+    second = client.post('/api/create-full-system').get_json()
+
+    engineers = first['details']['engineers']
+    assert first['details']['total_assignments'] == engineers * first['details']['topics']
+    assert second['details']['total_assignments'] == 0
+    with app.app_context():
+        counted = dashboard_counters.snapshot()['assignments']
+        assert counted == Assignment.query.count()
@@ -0,0 +1,54 @@
+# test_cohort_analytics.py - The NumPy path scores exactly like the scalar evaluator
+import random
+from collections import Counter
+
+import pytest
+
+import cohort_analytics
+from evaluator import GRADE_CUTOFFS, get_evaluator
+from scoring_engine import engine
+
+pytestmark = pytest.mark.skipif(not cohort_analytics.HAS_NUMPY, reason='NumPy is not installed')
+
+TOPICS = ('floorplanning', 'placement', 'routing', 'unknown')
+FILLER = ('the', 'we', 'first', 'then', 'because', 'deviation', 'spinning', 'setup', 'time', 'place', '5 nm', '40%')
+
+def cohort(topic, size=100, seed=5):
+    rng = random.Random(f'{topic}-{seed}')
+    lexicon = get_evaluator().lexicons.get(topic, get_evaluator().default_lexicon)
+    words = list(lexicon.matcher.phrases) + list(FILLER) * 4
+    return [' '.join(rng.choice(words) for _ in range(rng.choice([0, 2, 10, 50, 200]))) for _ in range(size)]
+
+@pytest.mark.parametrize('topic', TOPICS)
+def test_scores_and_grades_match_the_scalar_evaluator(topic):
+    answers = cohort(topic)
+    vectorized = cohort_analytics.score_answers(answers, topic)
+
+    for i, answer in enumerate(answers):
+        scalar = engine.score_answer(answer, topic, 0, 'technical')
+        assert vectorized['overall'][i] == pytest.approx(scalar['overall_score'], abs=1e-9)
+        assert vectorized['grade'][i] == scalar['grade_letter']
+
+@pytest.mark.parametrize('topic', TOPICS)
+def test_aggregates_match_scalar_tallies(topic):
+    answers = cohort(topic, seed=6)
+    aggregates = cohort_analytics.cohort_aggregates(answers, topic)
+
+    term_counts, missing_counts = Counter(), Counter()
+    for answer in answers:
+        scalar = engine.score_answer(answer, topic, 0, 'technical')
+        term_counts.update(scalar['technical_terms_found'])
+        missing_counts.update(scalar['missing_concepts'])
+
+    assert {term: count for term, count in aggregates['term_frequency'].items() if count} == term_counts
+    assert {label: count for label, count in aggregates['concept_gaps'].items() if count} == missing_counts
+    assert sum(aggregates['grade_distribution'].values()) == len(answers)
+
+def test_grade_letters_at_the_cutoffs():
+    evaluator = get_evaluator()
+    scores = [score for cutoff, _ in GRADE_CUTOFFS for score in (cutoff - 1e-9, cutoff, cutoff + 1e-9)] + [0.0, 100.0]
+    assert list(cohort_analytics.grade_letters(scores)) == [evaluator._calculate_grade(score) for score in scores]
+
+def test_empty_cohort():
+    aggregates = cohort_analytics.cohort_aggregates([], 'routing')
+    assert aggregates['answers'] == 0 and aggregates['mean_score'] == 0.0
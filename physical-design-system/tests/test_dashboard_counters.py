@@ -0,0 +1,56 @@
+# test_dashboard_counters.py - Counters follow writes made by this process and by others
+import pytest
+from sqlalchemy import event
+
+from app_working import Submission, User, app, dashboard_counters, db
+
+@pytest.fixture
+def counters():
+    with app.app_context():
+        dashboard_counters.reconcile()
+        yield dashboard_counters
+
+@pytest.fixture
+def engineer():
+    with app.app_context():
+        return User.query.filter_by(is_admin=False).first().id
+
+def _add_submission(engineer_id):
+    db.session.add(Submission(assignment_id='PD_TEST', engineer_id=engineer_id, answers='[]'))
+    db.session.commit()
+
+def test_own_commits_update_counts_without_a_recount(counters, engineer, monkeypatch):
+    before = counters.snapshot()['submissions']
+    recounts = []
+    monkeypatch.setattr(counters, 'reconcile', lambda: recounts.append(1))
+
+    _add_submission(engineer)
+
+    assert counters.snapshot()['submissions'] == before + 1
+    assert recounts == []
+
+def test_reads_do_not_query_the_database(counters):
+    counters.snapshot()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        for _ in range(100):
+            counters.snapshot()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert statements == []
+
+def test_other_workers_writes_show_up_after_the_interval(counters, engineer):
+    before = counters.snapshot()['submissions']
+
+    # Another worker: same database, none of this process's session events
+    with db.engine.begin() as connection:
+        connection.execute(Submission.__table__.insert(), {
+            'assignment_id': 'PD_TEST', 'engineer_id': engineer, 'answers': '[]'
+        })
+
+    assert counters.snapshot()['submissions'] == before
+    counters.reconciled_at -= counters.reconcile_interval + 1
+    assert counters.snapshot()['submissions'] == before + 1
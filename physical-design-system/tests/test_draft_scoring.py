@@ -0,0 +1,117 @@
+# test_draft_scoring.py - Incremental draft analysis agrees with analyzing the whole text
+import random
+
+import pytest
+
+from app_working import QUANTITY_PATTERN
+from draft_scoring import DraftAnswer, DraftOutOfSync, DraftRegistry, DraftSession
+from evaluator import NUMERICAL_PATTERN, get_evaluator
+from scoring_engine import AnalyzedAnswer, engine
+
+PATTERNS = (NUMERICAL_PATTERN, QUANTITY_PATTERN)
+PIECES = (
+    ' ', ' ', '  ', '\n', '-', '*', ',', 'A*', 'e.g.', 'x', 'ing', 's', 'İ',
+    '5 nm', '10ps', '3.2 GHz', '40%', 'deviation', 'spinning', 'time', 'place'
+)
+
+def vocabulary():
+    lexicon = get_evaluator().lexicons['placement']
+    return list(lexicon.matcher.phrases) + list(PIECES)
+
+def random_edit(rng, text, words):
+    start = rng.randint(0, len(text))
+    end = rng.randint(start, min(len(text), start + rng.choice([0, 1, 3, 20])))
+    replacement = ''.join(rng.choice(words) for _ in range(rng.choice([0, 1, 1, 2, 5])))
+    return start, end, replacement
+
+@pytest.mark.parametrize('seed', range(5))
+def test_edits_match_a_fresh_analysis(seed):
+    rng = random.Random(seed)
+    words = vocabulary()
+    for _ in range(20):
+        draft = DraftAnswer('')
+        max_length = rng.choice([1, 2, 3])
+        draft.term_index(max_length)
+        for pattern in PATTERNS:
+            draft.numeric_count(pattern)
+
+        for _ in range(40):
+            draft.apply_edit(*random_edit(rng, draft.text, words))
+            fresh = AnalyzedAnswer(draft.text)
+
+            assert set(draft.term_index(max_length)) == fresh.term_index(max_length), repr(draft.text)
+            assert all(count > 0 for count in draft.term_index(max_length).values())
+            assert draft.word_count == fresh.word_count
+            assert draft.stripped_length == fresh.stripped_length
+            for pattern in PATTERNS:
+                assert draft.numeric_count(pattern) == fresh.numeric_count(pattern)
+
+@pytest.mark.parametrize('rubric', ['technical', 'depth'])
+def test_session_scores_match_scoring_the_final_text(rubric):
+    rng = random.Random(rubric)
+    words = vocabulary()
+    session = DraftSession('placement', 3, rubric)
+    texts = [''] * 3
+
+    for _ in range(60):
+        question_index = rng.randrange(3)
+        start, end, replacement = random_edit(rng, texts[question_index], words)
+        update = session.apply(question_index, start, end, replacement, len(texts[question_index]))
+        texts[question_index] = texts[question_index][:start] + replacement + texts[question_index][end:]
+
+        assert update['result'] == engine.score_analyzed(
+            AnalyzedAnswer(texts[question_index]), 'placement', question_index, rubric
+        )
+        assert update['word_count'] == len(texts[question_index].split())
+
+def test_stale_client_is_told_to_resync():
+    session = DraftSession('routing', 1, 'technical')
+    session.apply(0, None, None, 'via stacking on metal 3')
+
+    with pytest.raises(DraftOutOfSync):
+        session.apply(0, 0, 0, 'redundant ', length=5)
+
+    update = session.apply(0, None, None, 'redundant via on metal 3')
+    assert update['word_count'] == 5
+
+@pytest.fixture
+def store():
+    from app_working import app, db
+    from draft_scoring import DraftStore
+    with app.app_context():
+        yield DraftStore(db)
+
+def test_workers_share_drafts_through_the_store(store):
+    # Two processes behind round-robin: each has its own registry, both share the table
+    workers = [DraftRegistry(store=store), DraftRegistry(store=store)]
+    key = ('test-user', 'SHARED_DRAFT')
+    rng = random.Random(3)
+    words = vocabulary() + ['🚀', 'naïve', '𝛼']
+    text = ''
+
+    for step in range(40):
+        session = workers[step % 2].get(key, 'placement', 1, 'technical')
+        start, end, replacement = random_edit(rng, text, words)
+        update = session.apply(0, start, end, replacement, len(text))
+        text = text[:start] + replacement + text[end:]
+
+        assert update['result'] == engine.score_analyzed(AnalyzedAnswer(text), 'placement', 0, 'technical')
+    assert store.load(key, 0) == (text, 40)
+
+    workers[0].forget(key)
+    assert store.load(key, 0) == ('', 0)
+
+def test_concurrent_save_is_rejected(store):
+    key = ('test-user', 'RACE_DRAFT')
+    first = DraftRegistry(store=store).get(key, 'routing', 1, 'technical')
+    second = DraftRegistry(store=store).get(key, 'routing', 1, 'technical')
+    first.apply(0, None, None, 'via ladder')
+
+    # second still believes it holds revision 0 when it saves
+    second._refresh = lambda question_index: None
+    with pytest.raises(DraftOutOfSync):
+        second.apply(0, None, None, 'redundant via')
+
+    del second._refresh
+    assert second.apply(0, 0, 0, 'a ', length=10)['word_count'] == 3
+    store.forget(key)
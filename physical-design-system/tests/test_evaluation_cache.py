@@ -0,0 +1,63 @@
+# test_evaluation_cache.py - Cache keys ignore only what cannot change a score
+import pytest
+
+import app_working  # registers the 'depth' rubric
+import evaluator  # registers the 'technical' rubric
+from evaluation_cache import EvaluationCache, lexicon_version
+from scoring_engine import AnalyzedAnswer, engine
+
+ANSWER = 'Reduce IR drop with a denser power grid.\nKeep utilization near 70% and check 5 ns paths.'
+
+@pytest.mark.parametrize('variant', [
+    ANSWER,
+    f'  {ANSWER}  ',
+    f'\n{ANSWER}\n\n',
+    ANSWER.replace('\n', '\r\n'),
+    f"\t{ANSWER.replace(chr(10), chr(13) + chr(10))}\r\n",
+])
+def test_equivalent_answers_share_a_key_and_a_score(variant):
+    assert EvaluationCache.make_key('routing', 0, 'v1', variant) == EvaluationCache.make_key('routing', 0, 'v1', ANSWER)
+    for rubric in ('technical', 'depth'):
+        assert engine.score_analyzed(AnalyzedAnswer(variant), 'routing', 0, rubric) == \
+            engine.score_analyzed(AnalyzedAnswer(ANSWER), 'routing', 0, rubric)
+
+@pytest.mark.parametrize('variant', [
+    ANSWER.lower(),
+    ANSWER.replace('IR drop', 'IR  drop'),
+    ANSWER.replace('\n', ' '),
+    ANSWER + '.',
+])
+def test_other_edits_change_the_key(variant):
+    assert EvaluationCache.make_key('routing', 0, 'v1', variant) != EvaluationCache.make_key('routing', 0, 'v1', ANSWER)
+
+def test_key_separates_topic_question_and_version():
+    keys = {
+        EvaluationCache.make_key(topic, question_index, version, ANSWER)
+        for topic in ('routing', 'placement') for question_index in (0, 1) for version in ('v1', 'v2')
+    }
+    assert len(keys) == 8
+
+def test_missing_answer_is_the_empty_answer():
+    assert EvaluationCache.make_key('routing', 0, 'v1', None) == EvaluationCache.make_key('routing', 0, 'v1', '  ')
+
+def test_lexicon_version_follows_table_contents():
+    assert lexicon_version({'via': 3}, ['a', 'b']) == lexicon_version({'via': 3}, ['a', 'b'])
+    assert lexicon_version({'via': 3}) != lexicon_version({'via': 4})
+
+def test_equivalent_answers_are_computed_once(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = EvaluationCache(sqlite_path=path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'overall_score': 42.0}
+
+    for variant in (ANSWER, f' {ANSWER} ', ANSWER.replace('\n', '\r\n')):
+        assert cache.get_or_compute('routing', 0, 'v1', variant, compute) == {'overall_score': 42.0}
+    assert len(calls) == 1
+
+    # A new process finds the result on disk
+    restarted = EvaluationCache(sqlite_path=path)
+    assert restarted.get_or_compute('routing', 0, 'v1', ANSWER, compute) == {'overall_score': 42.0}
+    assert len(calls) == 1 and restarted.disk_hits == 1
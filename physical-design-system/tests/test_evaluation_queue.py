@@ -0,0 +1,28 @@
+# test_evaluation_queue.py - Queued evaluations run in an app context and log their failures
+import logging
+
+from flask import Flask, current_app
+
+from evaluation_queue import EvaluationQueue, InlineBackend
+
+def test_handler_runs_in_an_app_context():
+    app = Flask(__name__)
+    seen = []
+    queue = EvaluationQueue(app, lambda submission_id: seen.append((current_app.name, submission_id)),
+                            backend=InlineBackend())
+
+    queue.enqueue(7)
+
+    assert seen == [(app.name, 7)]
+
+def test_failures_are_logged_with_the_traceback(caplog):
+    def handler(submission_id):
+        raise RuntimeError('evaluator exploded')
+
+    queue = EvaluationQueue(Flask(__name__), handler, backend=InlineBackend())
+    with caplog.at_level(logging.ERROR, logger='evaluation_queue'):
+        queue.enqueue(42)
+
+    [record] = caplog.records
+    assert record.getMessage() == 'Evaluation failed for submission 42'
+    assert record.exc_info[0] is RuntimeError
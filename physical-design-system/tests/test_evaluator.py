@@ -0,0 +1,55 @@
+# test_evaluator.py - Technical rubric results are the same on every scoring path
+import random
+
+import pytest
+
+from evaluation_cache import evaluation_cache
+from evaluator import evaluate_batch, evaluate_technical_submission, get_evaluator
+from scoring_engine import AnalyzedAnswer
+
+TOPICS = ('floorplanning', 'placement', 'routing', 'unknown')
+FILLER = ('the', 'we', 'first', 'then', 'because', 'deviation', 'spinning', 'setup', 'time', 'in', 'place', 'of')
+
+def random_answer(rng, topic):
+    lexicon = get_evaluator().lexicons.get(topic, get_evaluator().default_lexicon)
+    vocabulary = list(lexicon.matcher.phrases) + list(FILLER) + ['12 nm', '3.5 ps', '40%']
+    return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 120)))
+
+@pytest.fixture
+def submissions():
+    rng = random.Random(7)
+    return [
+        ([random_answer(rng, topic) for _ in range(3)], topic)
+        for topic in TOPICS for _ in range(15)
+    ]
+
+def test_evaluate_batch_matches_single_submissions(submissions):
+    evaluation_cache.clear()
+    expected = [evaluate_technical_submission(answers, topic) for answers, topic in submissions]
+    rng = random.Random(11)
+    shuffled = list(range(len(submissions)))
+    rng.shuffle(shuffled)
+
+    results = evaluate_batch(submissions[i] for i in shuffled)
+
+    assert results == [expected[i] for i in shuffled]
+
+def test_evaluate_batch_of_nothing():
+    assert evaluate_batch([]) == []
+
+@pytest.mark.parametrize('topic', TOPICS)
+def test_single_pass_matcher_agrees_with_per_term_scans(topic):
+    evaluator = get_evaluator()
+    lexicon = evaluator.lexicons.get(topic, evaluator.default_lexicon)
+    rng = random.Random(topic)
+    evaluation_cache.clear()
+
+    for question_index in range(3):
+        for _ in range(40):
+            answer = random_answer(rng, topic)
+            analyzed = AnalyzedAnswer(answer)
+            scanned = frozenset(phrase for phrase in lexicon.matcher.phrases if analyzed.contains(phrase))
+
+            assert lexicon.matcher.find(analyzed) == scanned
+            assert evaluator.evaluate_technical_answer(answer, topic, question_index) == \
+                evaluator.score_answer(analyzed, scanned, topic, question_index)
@@ -0,0 +1,151 @@
+# test_http_cache.py - Dashboard ETags follow data versions; responses are compressed
+import gzip
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from app_working import Notification, User, app, db
+from http_cache import HTTPCache, StorageVersions, _release
+from storage import MemoryStorage
+
+def logged_in(username, password):
+    client = app.test_client()
+    client.post('/login', data={'username': username, 'password': password})
+    return client
+
+def user_id(username):
+    with app.app_context():
+        return User.query.filter_by(username=username).first().id
+
+def notify(username):
+    with app.app_context():
+        db.session.add(Notification(user_id=user_id(username), title='Test', message='Data changed'))
+        db.session.commit()
+
+@pytest.fixture
+def engineer():
+    return logged_in('engineer1', 'eng123')
+
+def test_unchanged_page_answers_304(engineer):
+    first = engineer.get('/engineer')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    again = engineer.get('/engineer', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+def test_own_change_invalidates_the_etag(engineer):
+    etag = engineer.get('/engineer').headers['ETag']
+    notify('engineer1')
+
+    response = engineer.get('/engineer', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_other_users_change_keeps_the_etag(engineer):
+    etag = engineer.get('/engineer').headers['ETag']
+    notify('engineer2')
+
+    assert engineer.get('/engineer', headers={'If-None-Match': etag}).status_code == 304
+
+def test_admin_dashboard_follows_every_change():
+    admin = logged_in('admin', 'admin123')
+    etag = admin.get('/admin').headers['ETag']
+    assert admin.get('/admin', headers={'If-None-Match': etag}).status_code == 304
+
+    notify('engineer2')
+
+    assert admin.get('/admin', headers={'If-None-Match': etag}).status_code == 200
+
+def test_writes_do_not_bump_inside_their_transaction(engineer):
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        db.session.add(Notification(user_id=user_id('engineer1'), title='Test', message='Data changed'))
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            db.session.flush()
+            assert not any('data_versions' in statement for statement in statements)
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert any('data_versions' in statement for statement in statements)
+
+def test_rolled_back_change_keeps_the_etag(engineer):
+    etag = engineer.get('/engineer').headers['ETag']
+    with app.app_context():
+        db.session.add(Notification(user_id=user_id('engineer1'), title='Test', message='Rolled back'))
+        db.session.flush()
+        db.session.rollback()
+
+    assert engineer.get('/engineer', headers={'If-None-Match': etag}).status_code == 304
+
+def test_etags_differ_per_user():
+    first = logged_in('engineer1', 'eng123').get('/engineer').headers['ETag']
+    second = logged_in('engineer2', 'eng123').get('/engineer').headers['ETag']
+    assert first != second
+
+def test_large_pages_are_gzipped(engineer):
+    response = engineer.get('/engineer', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'</html>' in gzip.decompress(response.data)
+
+    plain = engineer.get('/engineer')
+    assert 'Content-Encoding' not in plain.headers
+
+def test_only_bodies_over_the_threshold_are_compressed():
+    tiny = Flask(__name__)
+    tiny.config['ETAG_RELEASE'] = 'test'
+    HTTPCache(tiny)
+    tiny.add_url_rule('/small', 'small', lambda: 'x' * 100)
+    tiny.add_url_rule('/large', 'large', lambda: 'x' * 1000)
+    client = tiny.test_client()
+
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+    large = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert large.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(large.data) == b'x' * 1000
+
+    # Views without conditional() still get a body ETag
+    etag = large.headers['ETag']
+    assert client.get('/large', headers={'If-None-Match': etag}).status_code == 304
+
+def test_template_and_asset_deploys_change_the_release(tmp_path):
+    (tmp_path / 'templates').mkdir()
+    page = tmp_path / 'templates' / 'page.html'
+    page.write_text('<p>v1</p>')
+    tiny = Flask(__name__, root_path=str(tmp_path))
+
+    class Assets:
+        manifest = {'page.css': 'page.aaaaaaaaaaaa.css'}
+    tiny.extensions['static_assets'] = Assets()
+
+    first = _release(tiny)
+    assert _release(tiny) == first
+
+    page.write_text('<p>v2</p>')
+    second = _release(tiny)
+    assert second != first
+
+    Assets.manifest = {'page.css': 'page.bbbbbbbbbbbb.css'}
+    assert _release(tiny) not in (first, second)
+
+def test_storage_versions_scope_by_user():
+    versions = StorageVersions(MemoryStorage())
+    alice, bob, everything = versions.key('alice'), versions.key('bob'), versions.key('alice', everything=True)
+
+    versions.bump('alice')
+
+    assert versions.key('alice') != alice
+    assert versions.key('bob') == bob
+    assert versions.key('alice', everything=True) != everything
+    assert versions.key(None) is None
@@ -0,0 +1,114 @@
+# test_keyset.py - Cursor pagination visits every row once, in order
+import datetime
+
+import pytest
+
+from app_working import Assignment, Submission, User, app, db
+from keyset import (MAX_LIMIT, decode_cursor, encode_cursor, filter_submissions, keyset_page, parse_bool,
+                    parse_limit)
+
+BASE = datetime.datetime(2026, 1, 1)
+
+def test_cursor_round_trip():
+    timestamp = datetime.datetime(2026, 3, 4, 5, 6, 7, 890123)
+    token = encode_cursor(timestamp, 42)
+    assert '=' not in token
+    assert decode_cursor(token) == (timestamp, 42)
+
+@pytest.mark.parametrize('token', ['zzz', '', 'WzEsMl0', encode_cursor(BASE, 1)[:-3], '!!!!'])
+def test_malformed_cursor_is_a_value_error(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+@pytest.mark.parametrize('value, limit', [(None, 20), ('5', 5), ('0', 1), ('-3', 1), ('1000', MAX_LIMIT)])
+def test_parse_limit_clamps(value, limit):
+    assert parse_limit(value) == limit
+
+def test_parse_limit_rejects_text():
+    with pytest.raises(ValueError):
+        parse_limit('ten')
+
+@pytest.mark.parametrize('value, parsed', [(None, None), ('', None), ('TRUE', True), ('1', True), ('no', False)])
+def test_parse_bool(value, parsed):
+    assert parse_bool(value) is parsed
+
+def test_parse_bool_rejects_other_words():
+    with pytest.raises(ValueError):
+        parse_bool('maybe')
+
+@pytest.fixture
+def submissions():
+    """47 submissions, four sharing each timestamp so pages break inside ties"""
+    with app.app_context():
+        engineer = User.query.filter_by(is_admin=False).first()
+        rows = [
+            Submission(assignment_id=f'KEYSET_{i}', engineer_id=engineer.id, answers='[]',
+                       submitted_date=BASE + datetime.timedelta(hours=i // 4))
+            for i in range(47)
+        ]
+        db.session.add_all(rows)
+        db.session.commit()
+        yield Submission.query.filter(Submission.assignment_id.like('KEYSET_%'))
+        Submission.query.filter(Submission.assignment_id.like('KEYSET_%')).delete(synchronize_session=False)
+        db.session.commit()
+
+def walk(query, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = keyset_page(query, Submission.submitted_date, Submission.id, cursor, limit)
+        seen.extend(row.id for row in rows)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+@pytest.mark.parametrize('limit', [1, 4, 7, 47, 100])
+def test_pages_cover_every_row_once_in_order(submissions, limit):
+    expected = [row.id for row in submissions.order_by(Submission.submitted_date.desc(), Submission.id.desc())]
+
+    seen, pages = walk(submissions, limit)
+
+    assert seen == expected
+    assert pages == max(1, -(-len(expected) // limit))
+
+def test_new_rows_do_not_shift_later_pages(submissions):
+    first, cursor = keyset_page(submissions, Submission.submitted_date, Submission.id, None, 10)
+    db.session.add(Submission(assignment_id='KEYSET_new', engineer_id=first[0].engineer_id, answers='[]',
+                              submitted_date=BASE + datetime.timedelta(days=30)))
+    db.session.commit()
+
+    rest = []
+    while cursor:
+        rows, cursor = keyset_page(submissions, Submission.submitted_date, Submission.id, cursor, 10)
+        rest.extend(row.id for row in rows)
+
+    old = [row.id for row in submissions.filter(Submission.assignment_id != 'KEYSET_new')
+           .order_by(Submission.submitted_date.desc(), Submission.id.desc())]
+    assert [row.id for row in first] + rest == old
+
+@pytest.mark.parametrize('filters, expected', [
+    ({'status': 'pending'}, {'KEYSET_0'}),
+    ({'status': 'graded'}, {'KEYSET_1'}),
+    ({'status': 'released'}, {'KEYSET_2'}),
+    ({'status': 'bogus'}, {'KEYSET_0', 'KEYSET_1', 'KEYSET_2'}),
+    ({'grade': 'ungraded'}, {'KEYSET_0'}),
+    ({'grade': 'A'}, {'KEYSET_2'}),
+    ({'released': False}, {'KEYSET_0', 'KEYSET_1'}),
+])
+def test_filter_submissions(submissions, filters, expected):
+    rows = submissions.filter(Submission.assignment_id.in_(['KEYSET_0', 'KEYSET_1', 'KEYSET_2'])).all()
+    for row in rows:
+        row.admin_grade, row.is_grade_released = {'KEYSET_0': (None, False), 'KEYSET_1': ('B', False),
+                                                  'KEYSET_2': ('A', True)}[row.assignment_id]
+    db.session.commit()
+
+    query = filter_submissions(submissions.filter(Submission.assignment_id.in_(['KEYSET_0', 'KEYSET_1', 'KEYSET_2'])),
+                               Submission, Assignment, User, **filters)
+    assert {row.assignment_id for row in query} == expected
+
+@pytest.mark.parametrize('query', ['cursor=zzz', 'limit=x', 'released=maybe'])
+def test_api_rejects_bad_parameters(query):
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    response = client.get(f'/api/admin/submissions?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,35 @@
+# test_migrate_indexes.py - The hot dashboard queries are index-backed once the migration ran
+import pytest
+
+import migrate_indexes
+from app_working import app, db
+
+@pytest.fixture
+def unindexed_database():
+    """The app_working schema as it was before the indexes were declared"""
+    with app.app_context():
+        indexes = [index for table in db.metadata.sorted_tables for index in table.indexes]
+        for index in indexes:
+            index.drop(db.engine, checkfirst=True)
+        yield indexes
+        for index in indexes:
+            index.create(db.engine, checkfirst=True)
+
+def _full_scans():
+    with db.engine.connect() as connection:
+        return [
+            name for name, statement in migrate_indexes.hot_queries().items()
+            if any(migrate_indexes._is_full_scan(line.strip()) for line in migrate_indexes._plan(connection, statement))
+        ]
+
+def test_hot_queries_scan_without_indexes(unindexed_database):
+    assert _full_scans()
+
+def test_create_indexes_removes_every_full_scan(unindexed_database):
+    assert migrate_indexes.create_indexes() == len(unindexed_database)
+    assert _full_scans() == []
+    assert migrate_indexes.explain() == []
+
+def test_create_indexes_is_idempotent(unindexed_database):
+    migrate_indexes.create_indexes()
+    assert migrate_indexes.create_indexes() == 0
@@ -0,0 +1,86 @@
+# test_scoring_engine.py - Term matching boundaries and stemming
+import pytest
+
+import scoring_engine
+from scoring_engine import BASE_WORDS, AnalyzedAnswer, TermMatcher, stem
+
+def matches(lexicon, answer):
+    return TermMatcher(lexicon).find(AnalyzedAnswer(answer))
+
+@pytest.mark.parametrize('term, answer', [
+    ('via', 'The standard deviation of slack is small'),
+    ('pin', 'The spinning disk holds the database'),
+    ('icc', 'A piccolo sits in the orchestra'),
+    ('timing', 'Check the setup time of the flop'),
+    ('placement', 'Use a buffer in place of the inverter'),
+    ('stacking', 'Pick a metal stack with thick top layers'),
+])
+def test_term_needs_whole_words(term, answer):
+    assert not matches([term], answer)
+
+@pytest.mark.parametrize('term, answer', [
+    ('via', 'Add a redundant via on every net'),
+    ('pin', 'Pins on the macro edge'),
+    ('placement', 'Compare the two placements'),
+    ('legalization', 'Cells are legalized after global placement'),
+    ('IR drop', 'IR drops exceed 5% near the macro'),
+    ('double patterning', 'Metal 1 needs double-patterning'),
+])
+def test_term_matches_inflected_forms(term, answer):
+    assert matches([term], answer) == {term}
+
+@pytest.mark.parametrize('word, derived', [
+    ('time', 'timing'),
+    ('times', 'timing'),
+    ('place', 'placement'),
+    ('placed', 'placement'),
+    ('state', 'station'),
+    ('state', 'statement'),
+    ('station', 'statement'),
+    ('design', 'designation'),
+    ('stack', 'stacking'),
+])
+def test_stem_keeps_derived_terms_apart(word, derived):
+    assert stem(word) != stem(derived)
+
+@pytest.mark.parametrize('words', [
+    ('time', 'times', 'timed'),
+    ('place', 'placed', 'places'),
+    ('placement', 'placements'),
+    ('timing', 'timings'),
+    ('designation', 'designations', 'designated'),
+    ('legalize', 'legalized', 'legalization'),
+    ('route', 'routing', 'routed'),
+])
+def test_stem_merges_inflections(words):
+    assert len({stem(word) for word in words}) == 1
+
+# Why each BASE_WORDS entry exists: the terms it keeps apart
+PROTECTED = {
+    'design': ('design', 'designation'),     # 'design' is a depth keyword; a pin designation is not design work
+    'place': ('placed', 'placement'),        # "placed in place of" must not score as the placement lexicon term
+    'stack': ('stack', 'stacking'),          # layer-assignment 'stack' and 'via stacking' are separate lexicon terms
+    'state': ('statement', 'station'),       # "problem statement" and "station" are neither state nor each other
+}
+
+def test_every_base_word_is_pinned():
+    assert set(PROTECTED) == BASE_WORDS
+
+@pytest.fixture
+def fresh_stems():
+    stem.cache_clear()
+    yield
+    stem.cache_clear()
+
+@pytest.mark.parametrize('base', sorted(PROTECTED))
+def test_base_word_is_what_keeps_its_terms_apart(monkeypatch, fresh_stems, base):
+    word, derived = PROTECTED[base]
+    assert stem(word) != stem(derived)
+
+    monkeypatch.setattr(scoring_engine, 'BASE_WORDS', BASE_WORDS - {base})
+    stem.cache_clear()
+    assert stem(word) == stem(derived)
+
+def test_stem_never_leaves_a_short_derived_stem():
+    assert stem('timing') == 'timing'
+    assert stem('sizing') == 'sizing'
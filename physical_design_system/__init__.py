@@ -0,0 +1,11 @@
+# physical_design_system - Importable name for the modules in physical-design-system/
+"""The deployed app's directory has hyphens, so it cannot be imported by name.
+
+This package points its search path at that directory, which lets the
+root app import the shared modules explicitly, e.g.
+``from physical_design_system.scoring_engine import engine``, without
+putting the directory (and its own app.py) on sys.path.
+"""
+import os
+
+__path__ = [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'physical-design-system')]